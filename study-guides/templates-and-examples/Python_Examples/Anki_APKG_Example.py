@@ -12,13 +12,47 @@ Usage:
     1. Prepare a CSV file with Question,Answer columns
     2. Run this script to generate an .apkg file
     3. Import the .apkg into Anki via File -> Import
+
+Rebuilding a deck:
+    Deck IDs are derived from the deck name and note GUIDs from a key
+    field (the question by default), so re-importing a regenerated .apkg
+    updates the existing deck and notes in place instead of adding
+    duplicates. Fixing a typo in an answer keeps the note (and its review
+    history); changing the key field text makes it a new note.
+
+Syncing a deck (Anki running with AnkiConnect):
+    sync_flashcard_deck() compares the CSV with the deck already in Anki
+    by the same key as the note GUIDs and sends only the changes
+    (addNote, updateNoteFields, deleteNotes), without writing or
+    importing an .apkg. Anki picks the GUIDs of notes added this way, so
+    keep each deck on one path: once a deck is synced, importing a
+    rebuilt .apkg of it would duplicate the synced notes.
+
+Building many decks:
+    create_flashcard_decks_async() writes the .apkg files and imports each
+    one as soon as it is written, several at a time (AsyncAnkiConnectClient),
+    so generation overlaps with Anki's import latency.
+
+Very large decks:
+    write_flashcard_package_streaming() writes CSV rows straight into the
+    package's SQLite collection in chunks, so memory stays flat however
+    many cards the deck has, and reports cards/sec and peak memory.
 """
 
 import genanki
+import asyncio
 import csv
+import hashlib
 import html
-import random
+import itertools
 import os
+import sqlite3
+import tempfile
+import threading
+import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 
 # =============================================================================
 # CONFIGURATION
@@ -29,6 +63,30 @@ import os
 MODEL_ID = 1607392319
 DECK_ID = 2059400110
 
+# CSV column whose text identifies a note across rebuilds (see get_note_guid)
+# Use a dedicated ID column if questions get reworded often; CSVs without
+# this column are keyed on their first (question) column
+GUID_KEY_FIELD = 'Question'
+
+# AnkiConnect endpoint (ANKICONNECT_URL overrides, e.g. for a remote Anki)
+ANKICONNECT_URL = os.environ.get("ANKICONNECT_URL", "http://localhost:8765")
+ANKICONNECT_VERSION = 6
+
+# Most notes per AnkiConnect request when syncing (keeps request bodies bounded)
+SYNC_CHUNK_SIZE = 100
+
+# Tag on synced notes recording their key (see get_sync_tag)
+SYNC_KEY_TAG_PREFIX = "sync-key::"
+
+# Notes per SQLite transaction in write_flashcard_package_streaming
+STREAM_CHUNK_SIZE = 1000
+
+# AsyncAnkiConnectClient defaults
+ASYNC_CONCURRENCY = 4         # Requests in flight at once
+ASYNC_REQUEST_TIMEOUT = 60    # Seconds per request (large imports are slow)
+ASYNC_RETRIES = 3             # Retries after a connection error
+ASYNC_BACKOFF_SECONDS = 0.5   # First retry delay, doubled on each retry
+
 # Card styling
 CARD_CSS = '''
 .card {
@@ -132,19 +190,36 @@ def create_cloze_model():
 # DECK CREATION
 # =============================================================================
 
+def get_deck_id(deck_name):
+    """
+    Stable deck ID derived from the deck name.
+
+    The same name always gives the same ID (in the same 2^30-2^31 range as
+    hand-picked IDs), so a rebuilt deck is imported into the existing one.
+
+    Args:
+        deck_name: Name of the deck (e.g., "Pharmacology::HIV Drugs")
+
+    Returns:
+        int: Deck ID
+    """
+    digest = hashlib.sha1(deck_name.encode('utf-8')).digest()
+    return (1 << 30) + int.from_bytes(digest[:4], 'big') % (1 << 30)
+
+
 def create_deck(deck_name, deck_id=None):
     """
     Create a new Anki deck.
 
     Args:
         deck_name: Name of the deck (e.g., "Pharmacology::HIV Drugs")
-        deck_id: Optional specific deck ID (generates random if None)
+        deck_id: Optional specific deck ID (derived from deck_name if None)
 
     Returns:
         genanki.Deck: Empty deck ready for notes
     """
     if deck_id is None:
-        deck_id = random.randrange(1 << 30, 1 << 31)
+        deck_id = get_deck_id(deck_name)
 
     return genanki.Deck(deck_id, deck_name)
 
@@ -166,7 +241,29 @@ def escape_html(text):
     return html.escape(str(text))
 
 
-def create_note(model, question, answer):
+def get_note_guid(key_text, deck_name=None):
+    """
+    Stable note GUID derived from a key field's text.
+
+    genanki's default GUID hashes every field, so any edit to an answer
+    makes a new note. Hashing only the key field keeps the GUID (and the
+    note's review history in Anki) across answer fixes. The deck name is
+    included so the same question in two decks stays two notes.
+
+    Args:
+        key_text: Text of the key field (whitespace differences are ignored)
+        deck_name: Optional deck the note belongs to
+
+    Returns:
+        str: GUID for genanki.Note
+    """
+    key_text = " ".join(str(key_text).split())
+    if deck_name is None:
+        return genanki.guid_for(key_text)
+    return genanki.guid_for(deck_name, key_text)
+
+
+def create_note(model, question, answer, guid_key=None, deck_name=None):
     """
     Create a single flashcard note.
 
@@ -174,37 +271,70 @@ def create_note(model, question, answer):
         model: genanki.Model to use
         question: Front of card (question text)
         answer: Back of card (answer text)
+        guid_key: Text the note GUID is derived from (default: question)
+        deck_name: Optional deck name mixed into the GUID (see get_note_guid)
 
     Returns:
         genanki.Note: Note ready to add to deck
     """
+    if guid_key is None:
+        guid_key = question
+
     return genanki.Note(
         model=model,
-        fields=[escape_html(question), escape_html(answer)]
+        fields=[escape_html(question), escape_html(answer)],
+        guid=get_note_guid(guid_key, deck_name)
     )
 
 
-def load_notes_from_csv(csv_path, model):
+def get_key_column(header, csv_path, guid_field=None):
     """
-    Load flashcard notes from a CSV file.
+    Index of the CSV column that identifies each note.
 
-    CSV format:
-        Question,Answer
-        "What is X?","Y"
-        ...
+    Args:
+        header: CSV header row
+        csv_path: Path to CSV file (for the error message)
+        guid_field: Header of the key column; None uses GUID_KEY_FIELD if
+                    the CSV has it and the first (question) column otherwise
+
+    Returns:
+        int: Column index
+
+    Raises:
+        ValueError: If an explicitly requested guid_field is not in the header
+    """
+    columns = [column.strip().lower() for column in header]
+    if (guid_field or GUID_KEY_FIELD).lower() in columns:
+        return columns.index((guid_field or GUID_KEY_FIELD).lower())
+    if guid_field is None:
+        return 0  # e.g. Front,Back: key on the question column
+    raise ValueError(f"GUID key column '{guid_field}' not found in {csv_path} "
+                     f"(columns: {', '.join(header)})")
+
+
+def iter_notes_from_csv(csv_path, model, deck_name=None, guid_field=None):
+    """
+    Read flashcard notes from a CSV file one row at a time.
+
+    The first row is a header; the first two columns are the question and
+    answer whatever their names. Each note's GUID is derived from the key
+    column (see get_key_column; matched to the header case-insensitively,
+    so extra columns such as an ID are allowed). Duplicate keys are not
+    checked here (see load_notes_from_csv).
 
     Args:
         csv_path: Path to CSV file
         model: genanki.Model to use for notes
+        deck_name: Optional deck name mixed into the GUIDs
+        guid_field: Header of the column identifying each note
+                    (default: GUID_KEY_FIELD, or the question column)
 
-    Returns:
-        list: List of genanki.Note objects
+    Yields:
+        tuple: (CSV line number, key text, genanki.Note)
     """
-    notes = []
-
     with open(csv_path, 'r', encoding='utf-8') as f:
         reader = csv.reader(f)
-        header = next(reader)  # Skip header row
+        key_idx = get_key_column(next(reader), csv_path, guid_field)
 
         for row in reader:
             if len(row) >= 2:
@@ -212,8 +342,43 @@ def load_notes_from_csv(csv_path, model):
                 answer = row[1].strip()
 
                 if question and answer:  # Skip empty rows
-                    note = create_note(model, question, answer)
-                    notes.append(note)
+                    guid_key = row[key_idx].strip() if key_idx < len(row) else ''
+                    guid_key = guid_key or question
+                    yield reader.line_num, guid_key, create_note(
+                        model, question, answer, guid_key=guid_key, deck_name=deck_name)
+
+
+def load_notes_from_csv(csv_path, model, deck_name=None, guid_field=None):
+    """
+    Load flashcard notes from a CSV file.
+
+    CSV format:
+        Question,Answer
+        "What is X?","Y"
+        ...
+
+    Rows repeating an earlier key (see iter_notes_from_csv) would share
+    its GUID, so only the first is kept and the rest are reported.
+
+    Args:
+        csv_path: Path to CSV file
+        model: genanki.Model to use for notes
+        deck_name: Optional deck name mixed into the GUIDs
+        guid_field: Header of the column identifying each note
+                    (default: GUID_KEY_FIELD, or the question column)
+
+    Returns:
+        list: List of genanki.Note objects
+    """
+    notes = []
+    seen_guids = set()
+
+    for line_number, guid_key, note in iter_notes_from_csv(csv_path, model, deck_name, guid_field):
+        if note.guid in seen_guids:
+            print(f"  ⚠️  Skipped duplicate key on line {line_number}: {guid_key}")
+            continue
+        seen_guids.add(note.guid)
+        notes.append(note)
 
     return notes
 
@@ -258,6 +423,22 @@ def export_deck(deck, output_path, media_files=None, auto_import=None):
 # ANKICONNECT AUTO-IMPORT
 # =============================================================================
 
+@lru_cache(maxsize=None)
+def get_ankiconnect_session():
+    """
+    Shared HTTP session for all AnkiConnect calls.
+
+    The session keeps the connection to Anki alive between calls instead
+    of opening a new one per request (reconnecting if Anki closed it).
+
+    Returns:
+        requests.Session
+    """
+    import requests
+
+    return requests.Session()
+
+
 def invoke_ankiconnect(action, **params):
     """
     Call AnkiConnect API.
@@ -269,16 +450,14 @@ def invoke_ankiconnect(action, **params):
     Returns:
         API result or None on error
     """
-    import requests
-
     payload = {
         "action": action,
-        "version": 6,
+        "version": ANKICONNECT_VERSION,
         "params": params
     }
 
     try:
-        response = requests.post('http://localhost:8765', json=payload, timeout=5)
+        response = get_ankiconnect_session().post(ANKICONNECT_URL, json=payload, timeout=5)
         response_data = response.json()
 
         if response_data.get('error'):
@@ -289,6 +468,31 @@ def invoke_ankiconnect(action, **params):
         return None
 
 
+def invoke_ankiconnect_multi(actions):
+    """
+    Call several AnkiConnect actions in one request ("multi" action).
+
+    Anki runs the actions in order and reports each one separately, so
+    one failing action does not fail the others.
+
+    Args:
+        actions: List of (action name, params dict)
+
+    Returns:
+        list: (result, error) per action, or None if AnkiConnect could not be reached
+    """
+    results = invoke_ankiconnect("multi", actions=[
+        {"action": action, "version": ANKICONNECT_VERSION, "params": params}
+        for action, params in actions
+    ])
+    if results is None:
+        return None
+
+    return [(response.get("result"), response.get("error")) if isinstance(response, dict)
+            else (response, None)
+            for response in results]
+
+
 def is_ankiconnect_available():
     """Check if AnkiConnect is running."""
     try:
@@ -381,30 +585,31 @@ def batch_import_to_anki(apkg_paths):
     """
     Import multiple .apkg files using AnkiConnect.
 
+    All imports are sent as one "multi" request, so N decks cost a single
+    round trip (which also serves as the availability check).
+
     Returns:
         dict: {'success': [...], 'failed': [...]}
     """
     results = {'success': [], 'failed': []}
 
     try:
-        if not is_ankiconnect_available():
+        print(f"  🔄 Batch importing {len(apkg_paths)} decks via AnkiConnect...")
+
+        responses = invoke_ankiconnect_multi([("importPackage", {"path": str(apkg_path)})
+                                              for apkg_path in apkg_paths])
+        if responses is None:
             print("  ⚠️  Batch auto-import skipped: AnkiConnect not available")
             print("     Make sure Anki is running with AnkiConnect installed")
             return results
 
-        print(f"  🔄 Batch importing {len(apkg_paths)} decks via AnkiConnect...")
-
-        for apkg_path in apkg_paths:
-            try:
-                result = invoke_ankiconnect("importPackage", path=str(apkg_path))
-
-                if result is not False:
-                    results['success'].append(apkg_path)
-                else:
-                    results['failed'].append((apkg_path, "Import returned False"))
-
-            except Exception as e:
-                results['failed'].append((apkg_path, str(e)))
+        for apkg_path, (result, error) in zip(apkg_paths, responses):
+            if error:
+                results['failed'].append((apkg_path, error))
+            elif result is not False:
+                results['success'].append(apkg_path)
+            else:
+                results['failed'].append((apkg_path, "Import returned False"))
 
         # Print summary
         print(f"  ✅ Batch import complete: {len(results['success'])}/{len(apkg_paths)} succeeded")
@@ -420,6 +625,528 @@ def batch_import_to_anki(apkg_paths):
         return results
 
 
+# =============================================================================
+# DELTA SYNC
+# =============================================================================
+
+def chunked(items, size=SYNC_CHUNK_SIZE):
+    """Split a list into lists of at most size items."""
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def get_sync_tag(note):
+    """
+    Tag recording a note's key (its GUID, see get_note_guid) in Anki.
+
+    Notes added over AnkiConnect get a GUID chosen by Anki, so the key is
+    kept in a tag instead: "sync-key::" plus a hash of the GUID.
+    """
+    return SYNC_KEY_TAG_PREFIX + hashlib.sha1(note.guid.encode('utf-8')).hexdigest()[:16]
+
+
+def get_question_key(question_field):
+    """
+    Question text with HTML entities decoded and whitespace collapsed.
+
+    Matches notes that have no sync tag yet (e.g. imported from an .apkg)
+    to CSV rows.
+    """
+    return " ".join(html.unescape(question_field).split())
+
+
+def ensure_anki_deck_and_model(deck_name, model):
+    """
+    Create the deck and the note type in Anki if missing, and list the deck's notes.
+
+    Args:
+        deck_name: Name of the deck
+        model: genanki.Model whose name, fields, templates and CSS are used
+
+    Returns:
+        list: Note IDs of the model's notes in the deck (not its subdecks),
+              or {'error': message} if AnkiConnect could not be reached or
+              the deck or note type could not be created
+    """
+    quoted_deck = deck_name.replace('"', '\\"')
+    responses = invoke_ankiconnect_multi([
+        ("createDeck", {"deck": deck_name}),
+        ("modelNames", {}),
+        ("findNotes", {"query": f'"deck:{quoted_deck}" -"deck:{quoted_deck}::*" '
+                                f'"note:{model.name}"'}),
+    ])
+    if responses is None:
+        return {"error": "AnkiConnect not available"}
+
+    for action, (_, error) in zip(("createDeck", "modelNames", "findNotes"), responses):
+        if error:
+            return {"error": f"{action} failed for {deck_name}: {error}"}
+
+    model_names, _ = responses[1]
+    if model.name not in (model_names or []):
+        created = invoke_ankiconnect_multi([("createModel", {
+            "modelName": model.name,
+            "inOrderFields": [field['name'] for field in model.fields],
+            "css": model.css,
+            "cardTemplates": [{"Name": template['name'],
+                               "Front": template['qfmt'],
+                               "Back": template['afmt']}
+                              for template in model.templates],
+        })])
+        error = "AnkiConnect not available" if created is None else created[0][1]
+        if error:
+            return {"error": f"createModel failed for {model.name}: {error}"}
+
+    note_ids, _ = responses[2]
+    return note_ids or []
+
+
+def load_anki_notes(note_ids):
+    """
+    Fields and sync tags of notes in Anki, read in chunks.
+
+    Returns:
+        tuple: ({sync tag: (note ID, fields)} for tagged notes,
+                {question key: (note ID, fields)} for untagged notes,
+                [note IDs repeating a key already seen]),
+               or {'error': message} if a notesInfo request failed
+    """
+    tagged = {}
+    untagged = {}
+    duplicate_ids = []
+    for chunk in chunked(note_ids):
+        responses = invoke_ankiconnect_multi([("notesInfo", {"notes": chunk})])
+        error = "AnkiConnect not available" if responses is None else responses[0][1]
+        if error:
+            return {"error": f"notesInfo failed: {error}"}
+
+        for info in responses[0][0] or []:
+            fields = sorted(info['fields'].values(), key=lambda field: field['order'])
+            values = [field['value'] for field in fields]
+            sync_tags = [tag for tag in info.get('tags', []) if tag.startswith(SYNC_KEY_TAG_PREFIX)]
+            notes_by_key, key = ((tagged, sync_tags[0]) if sync_tags
+                                 else (untagged, get_question_key(values[0])))
+            if key in notes_by_key:
+                duplicate_ids.append(info['noteId'])
+            else:
+                notes_by_key[key] = (info['noteId'], values)
+    return tagged, untagged, duplicate_ids
+
+
+def sync_notes_to_anki(deck_name, model, notes, delete_missing=True):
+    """
+    Bring a deck in Anki in line with a list of notes, sending only the changes.
+
+    Notes are matched by key: the sync tag derived from each note's GUID
+    (so a reworded question keeps its note when the GUID comes from an ID
+    column), or, for notes without one yet, the question text; those get
+    their tag on this sync.
+
+    Args:
+        deck_name: Name of the deck in Anki
+        model: genanki.Model of the notes
+        notes: genanki.Note list (the desired deck contents)
+        delete_missing: Delete notes in Anki that are not in notes
+
+    Returns:
+        dict: {'added', 'updated', 'deleted', 'unchanged': counts,
+               'failed': [(question, error)]}, or {'error': message}
+    """
+    note_ids = ensure_anki_deck_and_model(deck_name, model)
+    if isinstance(note_ids, dict):
+        return note_ids
+
+    anki_notes = load_anki_notes(note_ids)
+    if isinstance(anki_notes, dict):
+        return anki_notes
+    tagged, untagged, duplicate_ids = anki_notes
+    field_names = [field['name'] for field in model.fields]
+
+    to_add = []
+    to_update = []
+    to_tag = []
+    unchanged = 0
+    for note in notes:
+        sync_tag = get_sync_tag(note)
+        existing = tagged.pop(sync_tag, None)
+        if existing is None:
+            existing = untagged.pop(get_question_key(note.fields[0]), None)
+            if existing is not None:
+                to_tag.append((existing[0], sync_tag))
+        if existing is None:
+            to_add.append(note)
+        elif existing[1] != note.fields:
+            to_update.append((existing[0], note))
+        else:
+            unchanged += 1
+    to_delete = []
+    if delete_missing:
+        to_delete = ([note_id for note_id, _ in tagged.values()]
+                     + [note_id for note_id, _ in untagged.values()] + duplicate_ids)
+
+    summary = {'added': 0, 'updated': 0, 'deleted': 0, 'unchanged': unchanged, 'failed': []}
+
+    # One addNote per note: addNotes rejects the whole list if any note is
+    # refused (e.g. a duplicate question), multi fails only that note
+    for chunk in chunked(to_add):
+        responses = invoke_ankiconnect_multi([
+            ("addNote", {"note": {
+                "deckName": deck_name,
+                "modelName": model.name,
+                "fields": dict(zip(field_names, note.fields)),
+                "tags": [get_sync_tag(note)],
+                "options": {"allowDuplicate": False, "duplicateScope": "deck"},
+            }})
+            for note in chunk
+        ])
+        if responses is None:
+            summary['failed'].extend((note.fields[0], "addNote failed") for note in chunk)
+            continue
+        for note, (note_id, error) in zip(chunk, responses):
+            if error or note_id is None:
+                summary['failed'].append((note.fields[0], error or "not added"))
+            else:
+                summary['added'] += 1
+
+    for chunk in chunked(to_update):
+        responses = invoke_ankiconnect_multi([
+            ("updateNoteFields", {"note": {"id": note_id,
+                                           "fields": dict(zip(field_names, note.fields))}})
+            for note_id, note in chunk
+        ])
+        if responses is None:
+            summary['failed'].extend((note.fields[0], "updateNoteFields failed") for _, note in chunk)
+            continue
+        for (_, note), (_, error) in zip(chunk, responses):
+            if error:
+                summary['failed'].append((note.fields[0], error))
+            else:
+                summary['updated'] += 1
+
+    # updateNoteFields, addTags and deleteNotes return null on success, so
+    # their errors are read through multi
+    for chunk in chunked(to_tag):
+        responses = invoke_ankiconnect_multi([("addTags", {"notes": [note_id], "tags": sync_tag})
+                                              for note_id, sync_tag in chunk])
+        if responses is None:
+            summary['failed'].append((f"{len(chunk)} notes", "addTags failed"))
+            continue
+        summary['failed'].extend((f"note {note_id}", error)
+                                 for (note_id, _), (_, error) in zip(chunk, responses) if error)
+
+    for chunk in chunked(to_delete):
+        responses = invoke_ankiconnect_multi([("deleteNotes", {"notes": chunk})])
+        error = "deleteNotes failed" if responses is None else responses[0][1]
+        if error:
+            summary['failed'].append((f"{len(chunk)} notes", error))
+        else:
+            summary['deleted'] += len(chunk)
+
+    return summary
+
+
+# =============================================================================
+# STREAMING PACKAGE BUILD
+# =============================================================================
+
+def reset_peak_rss():
+    """
+    Restart the process's peak memory mark, so get_peak_rss_mb measures from now.
+
+    Uses /proc/self/clear_refs, so only works on Linux.
+
+    Returns:
+        bool: True if the mark was reset
+    """
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')  # 5 = reset the peak RSS (VmHWM)
+        return True
+    except OSError:
+        return False
+
+
+def get_peak_rss_mb():
+    """
+    Peak resident memory in MB: since reset_peak_rss() on Linux, otherwise
+    since the process started.
+
+    Returns:
+        float, or None where the resource module is unavailable (Windows)
+    """
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024  # Kilobytes
+    except OSError:
+        pass
+
+    try:
+        import resource
+    except ImportError:
+        return None
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / (1024 * 1024) if os.uname().sysname == 'Darwin' else peak / 1024
+
+
+def write_flashcard_package_streaming(csv_path, deck_name, output_path,
+                                      guid_field=None, chunk_size=STREAM_CHUNK_SIZE):
+    """
+    Build an .apkg from a CSV of any size without holding its notes in memory.
+
+    write_flashcard_package keeps a genanki.Note per row until the package
+    is written. Here genanki only writes the empty collection (schema,
+    deck and note type); each CSV row then becomes a note that is
+    inserted into the collection and dropped, chunk_size notes per
+    transaction. Duplicate keys are found with a temporary index on the
+    notes' GUIDs (dropped before packaging) instead of a set in memory.
+
+    The resulting package is the same as write_flashcard_package's: same
+    deck ID, note GUIDs and fields.
+
+    Args:
+        csv_path: Path to CSV file with Question,Answer columns
+        deck_name: Name for the Anki deck
+        output_path: Path for output .apkg file
+        guid_field: Header of the column identifying each note
+                    (default: GUID_KEY_FIELD, or the question column)
+        chunk_size: Notes per SQLite transaction
+
+    Returns:
+        dict: {'cards', 'skipped', 'seconds', 'cards_per_second', 'peak_rss_mb',
+               'peak_rss_scope'}; peak_rss_scope is "build" when the peak
+               covers only this build (Linux) and "process" when it is the
+               whole process's peak so far, earlier work included
+    """
+    peak_rss_scope = "build" if reset_peak_rss() else "process"
+    start_time = time.perf_counter()
+    model = create_basic_model()
+    deck = create_deck(deck_name)
+    deck.add_model(model)
+
+    timestamp = time.time()
+    id_gen = itertools.count(int(timestamp * 1000))
+
+    db_handle, db_path = tempfile.mkstemp(suffix='.anki2')
+    os.close(db_handle)
+    cards = 0
+    skipped = 0
+    try:
+        conn = sqlite3.connect(db_path)
+        try:
+            conn.execute('PRAGMA journal_mode = OFF')  # Scratch file: no rollback needed
+            conn.execute('PRAGMA synchronous = OFF')
+            cursor = conn.cursor()
+            genanki.Package(deck).write_to_db(cursor, timestamp, id_gen)
+            cursor.execute('CREATE INDEX ix_stream_notes_guid ON notes (guid)')
+
+            notes = iter_notes_from_csv(csv_path, model, deck_name, guid_field)
+            while True:
+                chunk = list(itertools.islice(notes, chunk_size))
+                if not chunk:
+                    break
+                for line_number, guid_key, note in chunk:
+                    if cursor.execute('SELECT 1 FROM notes WHERE guid = ?',
+                                      (note.guid,)).fetchone():
+                        print(f"  ⚠️  Skipped duplicate key on line {line_number}: "
+                              f"{guid_key}")
+                        skipped += 1
+                        continue
+                    note.write_to_db(cursor, timestamp, deck.deck_id, id_gen)
+                    cards += len(note.cards)
+                conn.commit()
+
+            cursor.execute('DROP INDEX ix_stream_notes_guid')
+            conn.commit()
+        finally:
+            conn.close()
+
+        with zipfile.ZipFile(output_path, 'w') as package:
+            package.write(db_path, 'collection.anki2')
+            package.writestr('media', '{}')
+    finally:
+        os.remove(db_path)
+
+    seconds = time.perf_counter() - start_time
+    stats = {
+        'cards': cards,
+        'skipped': skipped,
+        'seconds': seconds,
+        'cards_per_second': cards / seconds if seconds else 0.0,
+        'peak_rss_mb': get_peak_rss_mb(),
+        'peak_rss_scope': peak_rss_scope,
+    }
+
+    peak_rss = "n/a"
+    if stats['peak_rss_mb'] is not None:
+        peak_rss = f"{stats['peak_rss_mb']:.0f} MB"
+        if peak_rss_scope == "process":
+            peak_rss += " for the whole process"
+    print(f"Deck exported to: {output_path}")
+    print(f"📊 {cards:,} cards in {seconds:.1f}s "
+          f"({stats['cards_per_second']:,.0f} cards/sec, peak RSS {peak_rss})")
+    return stats
+
+
+# =============================================================================
+# ASYNC ANKICONNECT CLIENT
+# =============================================================================
+
+class AsyncAnkiConnectClient:
+    """
+    asyncio AnkiConnect client for running many requests concurrently.
+
+    - At most `concurrency` requests are in flight at once
+    - A request times out if connecting, or any wait for response data,
+      takes longer than `timeout` seconds (the requests timeout)
+    - Connection errors (Anki not started yet, connection reset) are
+      retried up to `retries` times, waiting backoff, 2 x backoff, ...
+      Timeouts and AnkiConnect errors are not retried, since the request
+      may already have been applied
+    - Every call returns a result dict instead of raising
+
+    Requests run on a pool of `concurrency` worker threads, so no async
+    HTTP library is needed. A worker slot is only freed once its request
+    has returned, which is what bounds the requests in flight. Each worker
+    thread has its own requests.Session (sessions are not thread-safe),
+    kept alive between that thread's requests.
+
+    Example:
+        async with AsyncAnkiConnectClient() as client:
+            results = await asyncio.gather(*(client.import_package(path) for path in paths))
+    """
+
+    def __init__(self, url=None, concurrency=ASYNC_CONCURRENCY,
+                 timeout=ASYNC_REQUEST_TIMEOUT, retries=ASYNC_RETRIES,
+                 backoff=ASYNC_BACKOFF_SECONDS):
+        self.url = url or ANKICONNECT_URL
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.executor = ThreadPoolExecutor(max_workers=concurrency,
+                                           thread_name_prefix="ankiconnect")
+        self.thread_state = threading.local()
+        self.sessions = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Stop the worker threads and close their connections."""
+        self.executor.shutdown(wait=True)
+        for session in self.sessions:
+            session.close()
+
+    def _post(self, payload):
+        """Send one request (runs in a worker thread, on that thread's session)."""
+        import requests
+
+        session = getattr(self.thread_state, "session", None)
+        if session is None:
+            session = self.thread_state.session = requests.Session()
+            self.sessions.append(session)
+        response = session.post(self.url, json=payload, timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()
+
+    async def invoke(self, action, **params):
+        """
+        Call one AnkiConnect action.
+
+        Args:
+            action: API action name
+            **params: Action parameters
+
+        Returns:
+            dict: {'action', 'ok', 'result', 'error', 'error_type', 'attempts', 'seconds'}
+                  error_type is None, "anki" (AnkiConnect reported an error),
+                  "connection", "timeout" or "protocol" (bad HTTP status/JSON)
+        """
+        import requests
+
+        payload = {"action": action, "version": ANKICONNECT_VERSION, "params": params}
+        outcome = {"action": action, "ok": False, "result": None, "error": None,
+                   "error_type": None, "attempts": 0}
+        start_time = time.perf_counter()
+
+        while True:
+            outcome["attempts"] += 1
+            try:
+                response_data = await asyncio.get_running_loop().run_in_executor(
+                    self.executor, self._post, payload)
+            except requests.ConnectionError as e:
+                if outcome["attempts"] <= self.retries:
+                    await asyncio.sleep(self.backoff * 2 ** (outcome["attempts"] - 1))
+                    continue
+                outcome.update(error=str(e), error_type="connection")
+            except requests.Timeout:
+                outcome.update(error=f"No response within {self.timeout}s", error_type="timeout")
+            except (requests.RequestException, ValueError) as e:
+                outcome.update(error=str(e), error_type="protocol")
+            else:
+                if response_data.get("error"):
+                    outcome.update(error=response_data["error"], error_type="anki")
+                else:
+                    outcome.update(ok=True, result=response_data.get("result"))
+            break
+
+        outcome["seconds"] = time.perf_counter() - start_time
+        return outcome
+
+    async def import_package(self, apkg_path):
+        """
+        Import one .apkg file.
+
+        Returns:
+            dict: invoke() result plus 'path'; ok is False if Anki reported
+                  the import as failed
+        """
+        outcome = await self.invoke("importPackage", path=os.path.abspath(apkg_path))
+        if outcome["ok"] and outcome["result"] is False:
+            outcome.update(ok=False, error="Import returned False", error_type="anki")
+        outcome["path"] = apkg_path
+        return outcome
+
+
+def print_import_results(results):
+    """Print the summary of per-deck import results (successes first)."""
+    succeeded = [result for result in results if result["ok"]]
+    print(f"  ✅ Import complete: {len(succeeded)}/{len(results)} succeeded")
+    failed = [result for result in results if not result["ok"]]
+    if failed:
+        print("  ⚠️  Failed imports:")
+        for result in failed:
+            print(f"     - {os.path.basename(result['path'])}: {result['error']} "
+                  f"({result['error_type']}, {result['attempts']} attempt(s))")
+
+
+def batch_import_to_anki_async(apkg_paths, concurrency=ASYNC_CONCURRENCY):
+    """
+    Import multiple .apkg files concurrently with AsyncAnkiConnectClient.
+
+    Unlike batch_import_to_anki, each deck gets its own result, with the
+    failure kind and attempt count, and connection errors are retried.
+
+    Returns:
+        list: One result dict per deck, in apkg_paths order (see
+              AsyncAnkiConnectClient.invoke, plus 'path')
+    """
+    async def import_all():
+        async with AsyncAnkiConnectClient(concurrency=concurrency) as client:
+            return await asyncio.gather(*(client.import_package(path) for path in apkg_paths))
+
+    print(f"  🔄 Importing {len(apkg_paths)} decks via AnkiConnect "
+          f"({concurrency} at a time)...")
+    results = asyncio.run(import_all())
+    print_import_results(results)
+    return results
+
+
 # =============================================================================
 # MAIN WORKFLOW
 # =============================================================================
@@ -441,8 +1168,8 @@ def create_flashcard_deck(csv_path, deck_name, output_path, auto_import=None):
     model = create_basic_model()
     deck = create_deck(deck_name)
 
-    # Load notes from CSV
-    notes = load_notes_from_csv(csv_path, model)
+    # Load notes from CSV (GUIDs keyed on GUID_KEY_FIELD within this deck)
+    notes = load_notes_from_csv(csv_path, model, deck_name=deck_name)
 
     # Add notes to deck
     for note in notes:
@@ -454,6 +1181,105 @@ def create_flashcard_deck(csv_path, deck_name, output_path, auto_import=None):
     return len(notes)
 
 
+def write_flashcard_package(csv_path, deck_name, output_path):
+    """
+    Build an .apkg from a CSV without printing or importing it.
+
+    Returns:
+        int: Number of cards written
+    """
+    model = create_basic_model()
+    deck = create_deck(deck_name)
+    for note in load_notes_from_csv(csv_path, model, deck_name=deck_name):
+        deck.add_note(note)
+    genanki.Package(deck).write_to_file(output_path)
+    return len(deck.notes)
+
+
+def create_flashcard_decks_async(decks, concurrency=ASYNC_CONCURRENCY):
+    """
+    Build several decks and import each into Anki as soon as it is written.
+
+    Decks are built in worker threads while earlier decks are still being
+    imported, so .apkg generation overlaps with AnkiConnect latency.
+
+    Args:
+        decks: List of (csv_path, deck_name, output_path)
+        concurrency: Imports in flight at once
+
+    Returns:
+        list: One result dict per deck, in input order: import result (see
+              AsyncAnkiConnectClient.import_package) plus 'deck' and 'cards';
+              a deck that failed to build has error_type "build"
+    """
+    async def build_and_import(client, csv_path, deck_name, output_path):
+        try:
+            cards = await asyncio.to_thread(write_flashcard_package,
+                                            csv_path, deck_name, output_path)
+        except Exception as e:
+            return {"action": None, "ok": False, "result": None, "error": str(e),
+                    "error_type": "build", "attempts": 0, "seconds": 0.0,
+                    "path": output_path, "deck": deck_name, "cards": 0}
+        result = await client.import_package(output_path)
+        result.update(deck=deck_name, cards=cards)
+        return result
+
+    async def run_all():
+        async with AsyncAnkiConnectClient(concurrency=concurrency) as client:
+            return await asyncio.gather(*(build_and_import(client, *deck) for deck in decks))
+
+    print(f"  🔄 Building and importing {len(decks)} decks ({concurrency} imports at a time)...")
+    results = asyncio.run(run_all())
+    print_import_results(results)
+    return results
+
+
+def sync_flashcard_deck(csv_path, deck_name, delete_missing=True, guid_field=None):
+    """
+    Sync a CSV straight into a deck in Anki via AnkiConnect (no .apkg).
+
+    Alternative to create_flashcard_deck + import for decks already in
+    Anki: the deck's notes are read with findNotes/notesInfo, matched to
+    CSV rows by key (see sync_notes_to_anki), and only new, changed and
+    removed notes are sent (addNote, updateNoteFields, deleteNotes), at
+    most SYNC_CHUNK_SIZE notes per request. Notes keep their review history.
+
+    Notes added by a sync get GUIDs from Anki, not get_note_guid, so a
+    synced deck should stay on sync_flashcard_deck: importing a rebuilt
+    .apkg of it (create_flashcard_deck) would add those notes again.
+
+    Args:
+        csv_path: Path to CSV file with Question,Answer columns
+        deck_name: Name of the deck in Anki (created if missing)
+        delete_missing: Delete notes in the deck that are no longer in the CSV
+        guid_field: Header of the column identifying each note
+                    (default: GUID_KEY_FIELD, or the question column)
+
+    Returns:
+        dict: Sync summary (see sync_notes_to_anki), or {'error': message}
+    """
+    model = create_basic_model()
+    notes = load_notes_from_csv(csv_path, model, deck_name=deck_name, guid_field=guid_field)
+
+    print(f"  🔄 Syncing {len(notes)} notes to '{deck_name}' via AnkiConnect...")
+    summary = sync_notes_to_anki(deck_name, model, notes, delete_missing=delete_missing)
+
+    if 'error' in summary:
+        print(f"  ⚠️  Sync skipped: {summary['error']}")
+        if summary['error'] == "AnkiConnect not available":
+            print("     → Make sure Anki is running with AnkiConnect installed")
+        return summary
+
+    print(f"  ✅ Sync complete: {summary['added']} added, {summary['updated']} updated, "
+          f"{summary['deleted']} deleted, {summary['unchanged']} unchanged")
+    if summary['failed']:
+        print("  ⚠️  Failed notes:")
+        for question, error in summary['failed']:
+            print(f"     - {question}: {error}")
+
+    return summary
+
+
 # =============================================================================
 # EXAMPLE USAGE
 # =============================================================================
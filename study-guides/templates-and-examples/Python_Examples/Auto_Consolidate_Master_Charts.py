@@ -11,38 +11,112 @@ Purpose:
 - Creates alphabetical index sheet for quick drug/condition lookup
 
 Usage:
-    python Auto_Consolidate_Master_Charts.py <master_chart_file> <reference_workbook_path>
+    python Auto_Consolidate_Master_Charts.py <master_chart_file>... <reference_workbook_path> [--streaming | --zip-clone] [--workers N] [--force]
+        [--shard-by exam|letter] [--max-shard-mb MB] [--watch [--debounce SECONDS]]
 
 Example:
     python Auto_Consolidate_Master_Charts.py "HIV_Master_Chart.xlsx" "Pharmacology_Master_Reference.xlsx"
 
+Batch example (files, glob patterns or directories):
+    python Auto_Consolidate_Master_Charts.py "Exam 3/" "Pharmacology_Master_Reference.xlsx"
+    python Auto_Consolidate_Master_Charts.py "charts/*_Master_Chart.xlsx" "Pharmacology_Master_Reference.xlsx"
+
+Watch example (runs until Ctrl+C):
+    python Auto_Consolidate_Master_Charts.py "Exam 3/" "Pharmacology_Master_Reference.xlsx" --watch
+
+Sharded example (Exam 3 charts go to Pharmacology_Master_Reference_Shards/..._Exam 3.xlsx):
+    python Auto_Consolidate_Master_Charts.py "Exam 3/" "Pharmacology_Master_Reference.xlsx" --shard-by exam
+
 Features:
 - Preserves formatting (fonts, colors, borders) from source
 - Creates/updates Index sheet with alphabetical drug list
 - Tracks which drugs are in which sheets
 - Non-destructive: keeps existing sheets, adds/updates new ones
+- Incremental Index: a sidecar <reference>.manifest.json caches each sheet's
+  content hash and drug list, so only changed sheets are rescanned
+- Drug lookup index: a sidecar <reference>.drugs.sqlite maps each normalized
+  drug name to every (sheet, row) it appears in, queryable without opening
+  the workbook (see Drug_Inverted_Index.py)
+- Batch mode: many charts share one reference load, Index rebuild and save,
+  with per-topic timings reported; sources are parsed in parallel worker
+  processes (--workers N) and applied in input order
+- Streaming mode (--streaming): reads sources read-only and writes the
+  reference through a write-only workbook, so memory stays bounded by
+  one row instead of the whole reference
+- Sharded mode (--shard-by exam|letter): one workbook per exam (nearest
+  "Exam N" folder above the chart) or letter range (new shard past --max-shard-mb); the reference path holds a
+  small index workbook linking into the shards, and a run rewrites only
+  the shards its topics route to
+- Watch mode (--watch): keeps running with the reference loaded, polls the
+  given directories and consolidates each burst of new/changed charts as
+  one batch with a single atomic save
+- Change detection: charts whose cell values and styles match what is
+  already consolidated are skipped (--force to override)
+- Zip-clone mode (--zip-clone): moves worksheet XML between the .xlsx
+  packages (styles and shared strings remapped) instead of copying cells;
+  untouched reference sheets are never parsed
 """
 
+import argparse
+import copy
+import glob
+import hashlib
+import io
+import json
 import sys
 import os
-from copy import copy
+import posixpath
+import re
+import signal
+import tempfile
+import time
+import zipfile
+import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor
 from openpyxl import load_workbook, Workbook
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
 from openpyxl.utils import get_column_letter
+from Drug_Inverted_Index import update_drug_index
+from Excel_Style_Cache import copy_interned_style, get_fill
+
+
+# =============================================================================
+# INDEX SHEET STYLES (shared by the in-memory and streaming writers)
+# =============================================================================
+
+INDEX_HEADER_FONT = Font(name='Calibri', size=14, bold=True, color='FFFFFF')
+INDEX_HEADER_FILL = PatternFill(start_color='4472C4', end_color='4472C4', fill_type='solid')
+INDEX_HEADER_ALIGNMENT = Alignment(horizontal='center', vertical='center')
+
+INDEX_LETTER_FONT = Font(name='Calibri', size=12, bold=True, color='1976D2')
+INDEX_LETTER_FILL = PatternFill(start_color='E3F2FD', end_color='E3F2FD', fill_type='solid')
+INDEX_LETTER_ALIGNMENT = Alignment(horizontal='center', vertical='center')
 
+INDEX_DRUG_FONT = Font(name='Calibri', size=11)
+INDEX_DRUG_ALIGNMENT = Alignment(horizontal='left', vertical='top', wrap_text=True)
+INDEX_SHEET_FONT = Font(name='Calibri', size=11, color='1565C0')
+INDEX_SHEET_ALIGNMENT = Alignment(horizontal='left', vertical='top')
 
-def copy_cell_style(source_cell, target_cell):
+INDEX_ROW_COLORS = ['E8F5E9', 'FFFFFF']  # Alternating light green and white
+
+# SpreadsheetML namespaces used when reading worksheet parts directly
+SHEET_NS = '{http://schemas.openxmlformats.org/spreadsheetml/2006/main}'
+REL_NS = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}'
+PKG_REL_NS = '{http://schemas.openxmlformats.org/package/2006/relationships}'
+
+
+def copy_cell_style(source_cell, target_cell, style_map=None):
     """
     Copy all style properties from source cell to target cell.
-    Based on best practices from Stack Overflow.
+
+    Pass the same style_map for every cell copied between two workbooks:
+    each distinct source style is then resolved once and reused by
+    reference (see Excel_Style_Cache.py).
     """
-    if source_cell.has_style:
-        target_cell.font = copy(source_cell.font)
-        target_cell.border = copy(source_cell.border)
-        target_cell.fill = copy(source_cell.fill)
-        target_cell.number_format = copy(source_cell.number_format)
-        target_cell.protection = copy(source_cell.protection)
-        target_cell.alignment = copy(source_cell.alignment)
+    if style_map is None:
+        style_map = {}
+    copy_interned_style(source_cell, target_cell, style_map)
 
 
 def copy_worksheet_to_workbook(source_wb, source_sheet_name, target_wb, target_sheet_name):
@@ -84,6 +158,7 @@ def copy_worksheet_to_workbook(source_wb, source_sheet_name, target_wb, target_s
     # Use max_row and max_column for efficiency (best practice)
     max_row = source_sheet.max_row
     max_col = source_sheet.max_column
+    style_map = {}
 
     for row_idx in range(1, max_row + 1):
         for col_idx in range(1, max_col + 1):
@@ -94,7 +169,7 @@ def copy_worksheet_to_workbook(source_wb, source_sheet_name, target_wb, target_s
             target_cell.value = source_cell.value
 
             # Copy style
-            copy_cell_style(source_cell, target_cell)
+            copy_cell_style(source_cell, target_cell, style_map)
 
     # Copy merged cells
     for merged_cell_range in source_sheet.merged_cells.ranges:
@@ -138,7 +213,7 @@ def create_or_update_index_sheet(wb, drug_sheet_mapping):
 
     Args:
         wb: Workbook object
-        drug_sheet_mapping: dict {drug_name: sheet_name}
+        drug_sheet_mapping: dict {drug_name: sheet name(s)}
     """
     # Remove existing Index sheet if present
     if "Index" in wb.sheetnames:
@@ -152,19 +227,12 @@ def create_or_update_index_sheet(wb, drug_sheet_mapping):
     index_sheet.column_dimensions['B'].width = 30  # Sheet location
 
     # Header row
-    header_font = Font(name='Calibri', size=14, bold=True, color='FFFFFF')
-    header_fill = PatternFill(start_color='4472C4', end_color='4472C4', fill_type='solid')
-    header_alignment = Alignment(horizontal='center', vertical='center')
-
-    index_sheet.cell(1, 1).value = "Drug / Condition"
-    index_sheet.cell(1, 1).font = header_font
-    index_sheet.cell(1, 1).fill = header_fill
-    index_sheet.cell(1, 1).alignment = header_alignment
-
-    index_sheet.cell(1, 2).value = "Located In"
-    index_sheet.cell(1, 2).font = header_font
-    index_sheet.cell(1, 2).fill = header_fill
-    index_sheet.cell(1, 2).alignment = header_alignment
+    for col_idx, header_text in enumerate(["Drug / Condition", "Located In"], start=1):
+        header_cell = index_sheet.cell(1, col_idx)
+        header_cell.value = header_text
+        header_cell.font = INDEX_HEADER_FONT
+        header_cell.fill = INDEX_HEADER_FILL
+        header_cell.alignment = INDEX_HEADER_ALIGNMENT
 
     index_sheet.row_dimensions[1].height = 30
     index_sheet.freeze_panes = 'A2'
@@ -175,7 +243,6 @@ def create_or_update_index_sheet(wb, drug_sheet_mapping):
     # Add drugs to index
     current_row = 2
     current_letter = None
-    row_colors = ['E8F5E9', 'FFFFFF']  # Alternating light green and white
     color_idx = 0
 
     for drug_name, sheet_name in sorted_drugs:
@@ -187,28 +254,29 @@ def create_or_update_index_sheet(wb, drug_sheet_mapping):
                                    end_row=current_row, end_column=2)
             letter_cell = index_sheet.cell(current_row, 1)
             letter_cell.value = f"═══ {first_letter} ═══"
-            letter_cell.font = Font(name='Calibri', size=12, bold=True, color='1976D2')
-            letter_cell.alignment = Alignment(horizontal='center', vertical='center')
-            letter_cell.fill = PatternFill(start_color='E3F2FD', end_color='E3F2FD', fill_type='solid')
+            letter_cell.font = INDEX_LETTER_FONT
+            letter_cell.alignment = INDEX_LETTER_ALIGNMENT
+            letter_cell.fill = INDEX_LETTER_FILL
             index_sheet.row_dimensions[current_row].height = 25
             current_row += 1
             current_letter = first_letter
             color_idx = 0  # Reset alternating colors
 
         # Add drug entry
-        bg_color = row_colors[color_idx % 2]
+        bg_color = INDEX_ROW_COLORS[color_idx % 2]
+        row_fill = get_fill(bg_color)
 
         drug_cell = index_sheet.cell(current_row, 1)
         drug_cell.value = drug_name
-        drug_cell.font = Font(name='Calibri', size=11)
-        drug_cell.alignment = Alignment(horizontal='left', vertical='top', wrap_text=True)
-        drug_cell.fill = PatternFill(start_color=bg_color, end_color=bg_color, fill_type='solid')
+        drug_cell.font = INDEX_DRUG_FONT
+        drug_cell.alignment = INDEX_DRUG_ALIGNMENT
+        drug_cell.fill = row_fill
 
         sheet_cell = index_sheet.cell(current_row, 2)
         sheet_cell.value = sheet_name
-        sheet_cell.font = Font(name='Calibri', size=11, color='1565C0')
-        sheet_cell.alignment = Alignment(horizontal='left', vertical='top')
-        sheet_cell.fill = PatternFill(start_color=bg_color, end_color=bg_color, fill_type='solid')
+        sheet_cell.font = INDEX_SHEET_FONT
+        sheet_cell.alignment = INDEX_SHEET_ALIGNMENT
+        sheet_cell.fill = row_fill
 
         current_row += 1
         color_idx += 1
@@ -216,113 +284,2213 @@ def create_or_update_index_sheet(wb, drug_sheet_mapping):
     return index_sheet
 
 
-def consolidate_master_chart(master_chart_path, reference_workbook_path):
+# =============================================================================
+# SHEET MANIFEST (INCREMENTAL INDEX REBUILD)
+# =============================================================================
+
+MANIFEST_VERSION = 2  # 2: entries carry the row of each drug
+
+
+def get_manifest_path(reference_workbook_path):
     """
-    Consolidate a master chart file into the reference workbook.
+    Sidecar manifest path for a reference workbook.
+
+    Example: "Pharmacology_Master_Reference.xlsx" → "Pharmacology_Master_Reference.manifest.json"
+    """
+    return os.path.splitext(reference_workbook_path)[0] + ".manifest.json"
+
+
+def get_cell_style_key(cell, style_cache):
+    """
+    Return a deterministic description of a cell's style.
+
+    Style ids are only meaningful inside one workbook, so the description is
+    built from the style objects themselves and cached per style id.
+
+    Args:
+        cell: Cell or ReadOnlyCell
+        style_cache: dict reused for all cells of the same workbook
+
+    Returns:
+        str: Style description (identical for identical styles in any workbook)
+    """
+    style_array = cell.style_array if hasattr(cell, "style_array") else cell._style
+    style_ids = tuple(style_array)
+    style_key = style_cache.get(style_ids)
+    if style_key is None:
+        style_key = repr((cell.font, cell.fill, cell.border, cell.alignment,
+                          cell.protection, cell.number_format))
+        style_cache[style_ids] = style_key
+    return style_key
+
+
+def update_sheet_hash(hasher, row_idx, col_idx, cell, style_cache):
+    """Feed one cell (position, value, style) into a sheet content hash."""
+    if cell.value is None and not cell.has_style:
+        return  # Blank, unstyled cells do not affect content
+    style_key = get_cell_style_key(cell, style_cache) if cell.has_style else ""
+    hasher.update(f"{row_idx},{col_idx}|{cell.value!r}|{style_key}\n".encode("utf-8"))
+
+
+def compute_sheet_hash(sheet):
+    """
+    Hash a worksheet's cell values and styles (not file metadata such as mtime).
+
+    Args:
+        sheet: Worksheet object
+
+    Returns:
+        str: Hex digest, identical for sheets with the same content
+    """
+    hasher = hashlib.sha1()
+    style_cache = {}
+    for row_idx, row in enumerate(sheet.iter_rows(), start=1):
+        for col_idx, cell in enumerate(row, start=1):
+            update_sheet_hash(hasher, row_idx, col_idx, cell, style_cache)
+    return hasher.hexdigest()
+
+
+def scan_worksheet(sheet):
+    """
+    Compute a sheet's manifest entry (content hash and drug list) in one pass.
+
+    Works on normal and read-only worksheets.
+
+    Returns:
+        dict: {'hash': see compute_sheet_hash,
+               'drugs': column B names, same rule as extract_drug_names_from_sheet,
+               'rows': row number of each drug}
+    """
+    drug_names = []
+    drug_rows = []
+    hasher = hashlib.sha1()
+    style_cache = {}
+    for row_idx, row in enumerate(sheet.iter_rows(), start=1):
+        for col_idx, cell in enumerate(row, start=1):
+            update_sheet_hash(hasher, row_idx, col_idx, cell, style_cache)
+
+        if row_idx > 1 and len(row) > 1 and row[1].value:
+            drug_name = str(row[1].value).strip()
+            if drug_name:
+                drug_names.append(drug_name)
+                drug_rows.append(row_idx)
+
+    return {"hash": hasher.hexdigest(), "drugs": drug_names, "rows": drug_rows}
+
+
+def get_file_digest(path):
+    """SHA-1 of a file's bytes (a cheap first check before comparing content hashes)."""
+    hasher = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def get_file_fingerprint(path):
+    """Return (size, mtime_ns) used to detect edits made outside this script."""
+    stat = os.stat(path)
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def load_manifest(reference_workbook_path, verbose=True):
+    """
+    Load cached per-sheet entries for a reference workbook.
+
+    Entries are only trusted if the reference file is exactly the one the
+    manifest was written for; if it was edited elsewhere (e.g. in Excel)
+    every sheet is rescanned.
 
     Args:
-        master_chart_path: Path to individual master chart file (e.g., HIV_Master_Chart.xlsx)
         reference_workbook_path: Path to consolidated reference workbook
+        verbose: Report when the reference was changed outside this script
 
     Returns:
-        dict: Summary of consolidation
+        dict: {sheet_name: {'hash': str, 'drugs': [...], 'rows': [...],
+               'source_digest': str (topic sheets only)}}
+              (empty if untrusted or written by an older version)
     """
-    print(f"📁 Reading master chart: {master_chart_path}")
+    manifest_path = get_manifest_path(reference_workbook_path)
+    if not os.path.exists(manifest_path) or not os.path.exists(reference_workbook_path):
+        return {}
 
-    # Load source workbook
-    if not os.path.exists(master_chart_path):
-        return {"error": f"Source file not found: {master_chart_path}"}
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
 
-    source_wb = load_workbook(master_chart_path)
+    if manifest.get("version") != MANIFEST_VERSION:
+        return {}
+
+    if manifest.get("reference_fingerprint") != get_file_fingerprint(reference_workbook_path):
+        if verbose:
+            print("⚠️  Reference changed since last consolidation; rescanning all sheets")
+        return {}
+
+    return manifest.get("sheets", {})
+
+
+def save_manifest(reference_workbook_path, sheet_entries):
+    """
+    Write the manifest for a freshly saved reference workbook.
+
+    Args:
+        reference_workbook_path: Path to consolidated reference workbook
+        sheet_entries: dict {sheet_name: {'hash': str, 'drugs': [...], 'rows': [...]}}
+    """
+    manifest = {
+        "version": MANIFEST_VERSION,
+        "reference_fingerprint": get_file_fingerprint(reference_workbook_path),
+        "sheets": sheet_entries,
+    }
+
+    manifest_path = get_manifest_path(reference_workbook_path)
+    tmp_path = manifest_path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=1)
+    os.replace(tmp_path, manifest_path)
 
-    # Determine topic name from filename
-    # Example: "HIV_Master_Chart.xlsx" → "HIV Drugs"
-    basename = os.path.basename(master_chart_path)
-    topic_name = basename.replace("_Master_Chart.xlsx", "").replace("_", " ")
 
-    # Load or create reference workbook
+def get_drug_sheet_mapping(sheet_entries):
+    """
+    Map each drug to the sheets it appears in, in sheet order.
+
+    A drug listed in several topics keeps all of them
+    (e.g. {"Ceftriaxone (Rocephin)": "Pharyngitis, Meningitis"}).
+
+    Args:
+        sheet_entries: dict {sheet_name: manifest entry}
+
+    Returns:
+        dict: {drug_name: comma-separated sheet names}
+    """
+    drug_sheets = {}
+    for sheet_name, entry in sheet_entries.items():
+        for drug in entry["drugs"]:
+            sheets = drug_sheets.setdefault(drug, [])
+            if sheet_name not in sheets:
+                sheets.append(sheet_name)
+    return {drug: ", ".join(sheets) for drug, sheets in drug_sheets.items()}
+
+
+def save_reference_indexes(reference_workbook_path, sheet_entries):
+    """Write the manifest and bring the drug lookup index up to date (see Drug_Inverted_Index.py)."""
+    save_manifest(reference_workbook_path, sheet_entries)
+    updated = update_drug_index(reference_workbook_path, sheet_entries)
+    print(f"🔎 Drug index: {updated} sheet(s) updated")
+
+
+def build_drug_sheet_mapping(ref_wb, cached_entries, fresh_entries):
+    """
+    Build the drug → sheet mapping, rescanning only sheets without a valid entry.
+
+    Args:
+        ref_wb: Reference workbook (Index sheet is ignored)
+        cached_entries: Entries from load_manifest (trusted, unchanged sheets)
+        fresh_entries: Entries for sheets copied in this run
+
+    Returns:
+        tuple: (drug_sheet_mapping, sheet_entries, rescanned_count)
+    """
+    sheet_entries = {}
+    rescanned = 0
+
+    for sheet_name in ref_wb.sheetnames:
+        if sheet_name == "Index":
+            continue
+
+        entry = fresh_entries.get(sheet_name) or cached_entries.get(sheet_name)
+        if entry is None:
+            entry = scan_worksheet(ref_wb[sheet_name])
+            rescanned += 1
+
+        sheet_entries[sheet_name] = entry
+
+    return get_drug_sheet_mapping(sheet_entries), sheet_entries, rescanned
+
+
+# =============================================================================
+# STREAMING (CONSTANT-MEMORY) CONSOLIDATION
+# =============================================================================
+
+def resolve_workbook_rel_target(target):
+    """Turn a workbook relationship target (absolute or relative to xl/) into a part path."""
+    if target.startswith("/"):
+        return target.lstrip("/")
+    return posixpath.normpath(posixpath.join("xl", target))
+
+
+def get_worksheet_part_paths(archive):
+    """
+    Map sheet names to their worksheet XML parts inside an .xlsx package.
+
+    Args:
+        archive: zipfile.ZipFile opened on the .xlsx file
+
+    Returns:
+        dict: {sheet_name: part_path} (e.g. {"Master Chart": "xl/worksheets/sheet1.xml"})
+    """
+    workbook_xml = ET.fromstring(archive.read("xl/workbook.xml"))
+    rels_xml = ET.fromstring(archive.read("xl/_rels/workbook.xml.rels"))
+
+    targets = {}
+    for rel in rels_xml.iter(f"{PKG_REL_NS}Relationship"):
+        targets[rel.get("Id")] = resolve_workbook_rel_target(rel.get("Target"))
+
+    part_paths = {}
+    for sheet in workbook_xml.iter(f"{SHEET_NS}sheet"):
+        part_paths[sheet.get("name")] = targets.get(sheet.get(f"{REL_NS}id"))
+
+    return part_paths
+
+
+def read_sheet_layout(xlsx_path, sheet_name):
+    """
+    Read column widths, row heights, merged ranges and freeze panes for a sheet.
+
+    Read-only worksheets do not expose layout information, so the worksheet
+    XML is parsed directly. Rows are discarded as soon as their attributes
+    are read, so memory does not grow with cell count.
+
+    Args:
+        xlsx_path: Path to .xlsx file
+        sheet_name: Name of sheet to inspect
+
+    Returns:
+        dict: {'column_widths': {letter: width}, 'row_heights': {row: height},
+               'merged_ranges': [ref, ...], 'freeze_panes': ref or None}
+    """
+    layout = {
+        "column_widths": {},
+        "row_heights": {},
+        "merged_ranges": [],
+        "freeze_panes": None,
+    }
+
+    with zipfile.ZipFile(xlsx_path) as archive:
+        part_path = get_worksheet_part_paths(archive).get(sheet_name)
+        if part_path is None:
+            return layout
+
+        with archive.open(part_path) as source:
+            sheet_data = None
+            for event, elem in ET.iterparse(source, events=("start", "end")):
+                tag = elem.tag
+
+                if event == "start":
+                    if tag == f"{SHEET_NS}sheetData":
+                        sheet_data = elem
+                    elif tag == f"{SHEET_NS}row" and elem.get("ht"):
+                        layout["row_heights"][int(elem.get("r"))] = float(elem.get("ht"))
+                    continue
+
+                if tag == f"{SHEET_NS}row":
+                    # Drop the finished row so the parse stays constant-memory
+                    elem.clear()
+                    if sheet_data is not None:
+                        sheet_data.remove(elem)
+                elif tag == f"{SHEET_NS}col" and elem.get("width"):
+                    for col_idx in range(int(elem.get("min")), int(elem.get("max")) + 1):
+                        layout["column_widths"][get_column_letter(col_idx)] = float(elem.get("width"))
+                elif tag == f"{SHEET_NS}mergeCell":
+                    layout["merged_ranges"].append(elem.get("ref"))
+                elif tag == f"{SHEET_NS}pane":
+                    if elem.get("state") in ("frozen", "frozenSplit") and elem.get("topLeftCell"):
+                        layout["freeze_panes"] = elem.get("topLeftCell")
+
+    return layout
+
+
+def stream_worksheet(source_path, source_wb, source_sheet_name, target_wb, target_sheet_name):
+    """
+    Stream a worksheet row by row from a read-only workbook into a write-only one.
+
+    Values and cell styles are carried per cell; column widths, row heights,
+    merged ranges and freeze panes are applied before the first row is written
+    (write-only sheets need them up front).
+
+    Args:
+        source_path: Path of the source .xlsx (used to read layout)
+        source_wb: Source workbook opened with read_only=True
+        source_sheet_name: Name of sheet to copy from source
+        target_wb: Target workbook created with write_only=True
+        target_sheet_name: Name for sheet in target workbook
+
+    Returns:
+        dict: Manifest entry {'hash': content hash (see compute_sheet_hash),
+              'drugs': column B names, same rule as extract_drug_names_from_sheet,
+              'rows': row number of each drug}
+    """
+    source_sheet = source_wb[source_sheet_name]
+    target_sheet = target_wb.create_sheet(target_sheet_name)
+
+    layout = read_sheet_layout(source_path, source_sheet_name)
+    for col_letter, width in layout["column_widths"].items():
+        target_sheet.column_dimensions[col_letter].width = width
+    for row_num, height in layout["row_heights"].items():
+        target_sheet.row_dimensions[row_num].height = height
+    for merged_range in layout["merged_ranges"]:
+        target_sheet.merged_cells.add(merged_range)
+    if layout["freeze_panes"]:
+        target_sheet.freeze_panes = layout["freeze_panes"]
+
+    drug_names = []
+    drug_rows = []
+    hasher = hashlib.sha1()
+    style_cache = {}
+    style_map = {}
+    for row_idx, source_row in enumerate(source_sheet.iter_rows(), start=1):
+        target_row = []
+        for col_idx, source_cell in enumerate(source_row, start=1):
+            update_sheet_hash(hasher, row_idx, col_idx, source_cell, style_cache)
+            target_cell = WriteOnlyCell(target_sheet, value=source_cell.value)
+            copy_cell_style(source_cell, target_cell, style_map)
+            target_row.append(target_cell)
+        target_sheet.append(target_row)
+
+        # Column B typically contains "Drug Name (Brand)" in master charts
+        if row_idx > 1 and len(source_row) > 1 and source_row[1].value:
+            drug_name = str(source_row[1].value).strip()
+            if drug_name:
+                drug_names.append(drug_name)
+                drug_rows.append(row_idx)
+
+    return {"hash": hasher.hexdigest(), "drugs": drug_names, "rows": drug_rows}
+
+
+def stream_index_sheet(wb, drug_sheet_mapping):
+    """
+    Write the Index sheet into a write-only workbook.
+
+    Produces the same layout as create_or_update_index_sheet, row by row.
+
+    Args:
+        wb: Workbook created with write_only=True
+        drug_sheet_mapping: dict {drug_name: sheet name(s)}
+    """
+    sorted_drugs = sorted(drug_sheet_mapping.items())
+
+    # Create Index sheet as first sheet
+    index_sheet = wb.create_sheet("Index", 0)
+    index_sheet.column_dimensions['A'].width = 40  # Drug name
+    index_sheet.column_dimensions['B'].width = 30  # Sheet location
+    index_sheet.row_dimensions[1].height = 30
+    index_sheet.freeze_panes = 'A2'
+
+    # Row heights and merges must be known before rows are streamed
+    current_row = 2
+    current_letter = None
+    for drug_name, _ in sorted_drugs:
+        first_letter = drug_name[0].upper()
+        if first_letter != current_letter:
+            index_sheet.merged_cells.add(f"A{current_row}:B{current_row}")
+            index_sheet.row_dimensions[current_row].height = 25
+            current_row += 1
+            current_letter = first_letter
+        current_row += 1
+
+    header_row = []
+    for header_text in ["Drug / Condition", "Located In"]:
+        header_cell = WriteOnlyCell(index_sheet, value=header_text)
+        header_cell.font = INDEX_HEADER_FONT
+        header_cell.fill = INDEX_HEADER_FILL
+        header_cell.alignment = INDEX_HEADER_ALIGNMENT
+        header_row.append(header_cell)
+    index_sheet.append(header_row)
+
+    current_letter = None
+    color_idx = 0
+    for drug_name, sheet_name in sorted_drugs:
+        first_letter = drug_name[0].upper()
+        if first_letter != current_letter:
+            letter_cell = WriteOnlyCell(index_sheet, value=f"═══ {first_letter} ═══")
+            letter_cell.font = INDEX_LETTER_FONT
+            letter_cell.alignment = INDEX_LETTER_ALIGNMENT
+            letter_cell.fill = INDEX_LETTER_FILL
+            index_sheet.append([letter_cell])
+            current_letter = first_letter
+            color_idx = 0  # Reset alternating colors
+
+        bg_color = INDEX_ROW_COLORS[color_idx % 2]
+        row_fill = get_fill(bg_color)
+
+        drug_cell = WriteOnlyCell(index_sheet, value=drug_name)
+        drug_cell.font = INDEX_DRUG_FONT
+        drug_cell.alignment = INDEX_DRUG_ALIGNMENT
+        drug_cell.fill = row_fill
+
+        sheet_cell = WriteOnlyCell(index_sheet, value=sheet_name)
+        sheet_cell.font = INDEX_SHEET_FONT
+        sheet_cell.alignment = INDEX_SHEET_ALIGNMENT
+        sheet_cell.fill = row_fill
+
+        index_sheet.append([drug_cell, sheet_cell])
+        color_idx += 1
+
+    return index_sheet
+
+
+def save_workbook_atomic(wb, output_path):
+    """
+    Save workbook to a temporary file next to output_path, then rename it into place.
+
+    The streaming writer reads the old reference while writing the new one,
+    so it cannot write to the same path directly. The rename also means an
+    interrupted run never leaves a half-written reference behind.
+    """
+    replace_file_atomic(output_path, wb.save)
+
+
+def replace_file_atomic(output_path, write_func):
+    """
+    Call write_func(tmp_path) on a temporary file next to output_path, then
+    rename the result over output_path.
+    """
+    output_dir = os.path.dirname(os.path.abspath(output_path))
+    fd, tmp_path = tempfile.mkstemp(suffix=".xlsx", dir=output_dir)
+    os.close(fd)
+    try:
+        write_func(tmp_path)
+        # mkstemp creates the file private (0600); keep the usual permissions
+        if os.path.exists(output_path):
+            os.chmod(tmp_path, os.stat(output_path).st_mode & 0o777)
+        else:
+            umask = os.umask(0)
+            os.umask(umask)
+            os.chmod(tmp_path, 0o666 & ~umask)
+        os.replace(tmp_path, output_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def consolidate_master_charts_streaming(master_chart_paths, reference_workbook_path):
+    """
+    Consolidate master charts into the reference workbook in constant memory.
+
+    Sources (the master charts and the existing reference) are opened
+    read-only and every sheet is streamed row by row into a new write-only
+    reference, which then replaces the old file. The Index is rebuilt from
+    drug names collected while streaming, so no sheet is read twice.
+
+    Args:
+        master_chart_paths: Paths to master chart files (e.g., HIV_Master_Chart.xlsx)
+        reference_workbook_path: Path to consolidated reference workbook
+
+    Returns:
+        dict: Summary of consolidation (same keys as consolidate_master_charts)
+    """
+    start_time = time.perf_counter()
+    topics, errors = plan_topics(master_chart_paths)
+    if not topics:
+        return {"error": "; ".join(errors) or "No master charts to consolidate"}
+
+    out_wb = Workbook(write_only=True)
+    sheet_entries = {}
+    timings = {}
+
+    # Stream existing reference sheets (except Index and the topics being replaced)
+    step_start = time.perf_counter()
     if os.path.exists(reference_workbook_path):
-        print(f"📂 Loading existing reference: {reference_workbook_path}")
-        ref_wb = load_workbook(reference_workbook_path)
+        print(f"📂 Streaming existing reference: {reference_workbook_path}")
+        ref_wb = load_workbook(reference_workbook_path, read_only=True)
+        try:
+            for sheet_name in ref_wb.sheetnames:
+                if sheet_name == "Index" or sheet_name in topics:
+                    continue
+                entry = stream_worksheet(reference_workbook_path, ref_wb, sheet_name,
+                                         out_wb, sheet_name)
+                sheet_entries[sheet_name] = entry
+        finally:
+            ref_wb.close()
     else:
         print(f"📝 Creating new reference: {reference_workbook_path}")
-        ref_wb = Workbook()
-        # Remove default sheet
-        if "Sheet" in ref_wb.sheetnames:
-            del ref_wb["Sheet"]
+    timings["load_reference"] = time.perf_counter() - step_start
+
+    # Stream each new topic sheet
+    topic_results = []
+    for topic_name, master_chart_path in topics.items():
+        topic_start = time.perf_counter()
+        print(f"📁 Reading master chart (streaming): {master_chart_path}")
+        source_wb = load_workbook(master_chart_path, read_only=True)
+        try:
+            source_sheet_name = get_source_sheet_name(source_wb)
+            print(f"📋 Streaming sheet '{source_sheet_name}' to reference as '{topic_name}'")
+            entry = stream_worksheet(master_chart_path, source_wb, source_sheet_name,
+                                     out_wb, topic_name)
+        finally:
+            source_wb.close()
+        entry["source_digest"] = get_file_digest(master_chart_path)
+
+        drugs = entry["drugs"]
+        sheet_entries[topic_name] = entry
+        print(f"✓ Extracted {len(drugs)} drugs from {topic_name}")
+
+        topic_results.append({
+            "topic": topic_name,
+            "source": master_chart_path,
+            "drugs_added": len(drugs),
+            "seconds": time.perf_counter() - topic_start,
+        })
+
+    step_start = time.perf_counter()
+    drug_sheet_mapping = get_drug_sheet_mapping(sheet_entries)
+    print(f"📇 Creating/updating Index sheet with {len(drug_sheet_mapping)} total drugs")
+    stream_index_sheet(out_wb, drug_sheet_mapping)
+    timings["index"] = time.perf_counter() - step_start
 
-    # Copy master chart sheet to reference workbook
-    # Assume source has sheet named "Master Chart" or first sheet
-    if "Master Chart" in source_wb.sheetnames:
-        source_sheet_name = "Master Chart"
+    step_start = time.perf_counter()
+    print(f"💾 Saving reference: {reference_workbook_path}")
+    save_workbook_atomic(out_wb, reference_workbook_path)
+    save_reference_indexes(reference_workbook_path, sheet_entries)
+    timings["save"] = time.perf_counter() - step_start
+    timings["total"] = time.perf_counter() - start_time
+
+    return {
+        "topics": topic_results,
+        "errors": errors,
+        "total_drugs_in_reference": len(drug_sheet_mapping),
+        "reference_path": reference_workbook_path,
+        "timings": timings,
+    }
+
+
+# =============================================================================
+# ZIP-LEVEL WORKSHEET CLONING (FAST PATH)
+# =============================================================================
+
+MC_IGNORABLE = '{http://schemas.openxmlformats.org/markup-compatibility/2006}Ignorable'
+CONTENT_TYPES_NS = '{http://schemas.openxmlformats.org/package/2006/content-types}'
+WORKSHEET_CONTENT_TYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml'
+SHARED_STRINGS_CONTENT_TYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sharedStrings+xml'
+REL_TYPE_PREFIX = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships/'
+BUILTIN_NUM_FMT_MAX = 164  # numFmtId below this are Excel built-ins
+
+
+class ZipCloneUnsupported(Exception):
+    """A package uses features the zip-level cloner does not carry; use the cell copier."""
+
+
+def parse_part(xml_bytes):
+    """
+    Parse an XML part, keeping its namespace prefixes for serialisation.
+
+    mc:Ignorable is dropped because it names prefixes that ElementTree may
+    not re-declare; it is optional and only lists ignorable extensions.
+    """
+    for _, (prefix, uri) in ET.iterparse(io.BytesIO(xml_bytes), events=("start-ns",)):
+        # Default namespaces are restored per part in serialize_part
+        if prefix and not re.match(r"ns\d+$", prefix):
+            ET.register_namespace(prefix, uri)
+    root = ET.fromstring(xml_bytes)
+    root.attrib.pop(MC_IGNORABLE, None)
+    return root
+
+
+def serialize_part(root):
+    """Serialise an XML part with its root namespace as the default, as Office writes it."""
+    # ElementTree keeps one global default namespace, so set it per part
+    ET.register_namespace("", root.tag[1:].split("}")[0])
+    return (b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            + ET.tostring(root, encoding="utf-8"))
+
+
+class XlsxPackage:
+    """
+    Parts of an .xlsx package that sheet cloning touches.
+
+    Workbook, relationships, content types, styles and shared strings are
+    parsed; every other part is copied through unchanged when written.
+    """
+
+    def __init__(self, source):
+        self.source = source  # Path or BytesIO
+        with zipfile.ZipFile(source) as archive:
+            self.part_names = archive.namelist()
+        self.updated_parts = {}
+        self.removed_parts = set()
+
+        self.content_types = parse_part(self.read_part("[Content_Types].xml"))
+        self.workbook = parse_part(self.read_part("xl/workbook.xml"))
+        self.workbook_rels = parse_part(self.read_part("xl/_rels/workbook.xml.rels"))
+
+        styles_path = self.get_rel_target("styles")
+        if styles_path is None:
+            raise ZipCloneUnsupported("package has no styles part")
+        self.styles_path = styles_path
+        self.styles = parse_part(self.read_part(styles_path))
+
+        self.shared_strings_path = self.get_rel_target("sharedStrings")
+        self.shared_strings = None
+        if self.shared_strings_path is not None:
+            self.shared_strings = parse_part(self.read_part(self.shared_strings_path))
+
+        defined_names = self.workbook.find(f"{SHEET_NS}definedNames")
+        if defined_names is not None and any(name.get("localSheetId") is not None
+                                             for name in defined_names):
+            raise ZipCloneUnsupported("sheet-scoped defined names")
+
+    def read_part(self, part_name):
+        if part_name in self.updated_parts:
+            return self.updated_parts[part_name]
+        with zipfile.ZipFile(self.source) as archive:
+            return archive.read(part_name)
+
+    def get_rel_target(self, rel_type):
+        """Resolve the part path of the first workbook relationship of a type."""
+        for rel in self.workbook_rels:
+            if rel.get("Type") == REL_TYPE_PREFIX + rel_type:
+                return resolve_workbook_rel_target(rel.get("Target"))
+        return None
+
+    def get_sheets(self):
+        """Return [(sheet_name, part_path)] in workbook order."""
+        targets = {rel.get("Id"): resolve_workbook_rel_target(rel.get("Target"))
+                   for rel in self.workbook_rels}
+        return [(sheet.get("name"), targets[sheet.get(f"{REL_NS}id")])
+                for sheet in self.workbook.find(f"{SHEET_NS}sheets")]
+
+    def remove_sheet(self, sheet_name):
+        """Remove a sheet, its relationship, its part and the part's own rels."""
+        sheets = self.workbook.find(f"{SHEET_NS}sheets")
+        for sheet in list(sheets):
+            if sheet.get("name") != sheet_name:
+                continue
+            rel_id = sheet.get(f"{REL_NS}id")
+            sheets.remove(sheet)
+            for rel in list(self.workbook_rels):
+                if rel.get("Id") == rel_id:
+                    part_path = resolve_workbook_rel_target(rel.get("Target"))
+                    self.workbook_rels.remove(rel)
+                    self._remove_part(part_path)
+                    part_dir, part_file = posixpath.split(part_path)
+                    self._remove_part(f"{part_dir}/_rels/{part_file}.rels")
+
+    def add_sheet(self, sheet_name, sheet_xml, position=None):
+        """Add a worksheet part and register it in workbook, rels and content types."""
+        existing_parts = set(self.part_names) | set(self.updated_parts)
+        part_number = 1
+        while f"xl/worksheets/sheet{part_number}.xml" in existing_parts:
+            part_number += 1
+        part_path = f"xl/worksheets/sheet{part_number}.xml"
+        self.updated_parts[part_path] = sheet_xml
+        self.removed_parts.discard(part_path)
+
+        rel_id = self._add_workbook_rel("worksheet", f"worksheets/sheet{part_number}.xml")
+        self._add_content_type(part_path, WORKSHEET_CONTENT_TYPE)
+
+        sheets = self.workbook.find(f"{SHEET_NS}sheets")
+        sheet_ids = [int(sheet.get("sheetId")) for sheet in sheets]
+        sheet = ET.Element(f"{SHEET_NS}sheet", {
+            "name": sheet_name,
+            "sheetId": str(max(sheet_ids, default=0) + 1),
+            f"{REL_NS}id": rel_id,
+        })
+        sheets.insert(len(sheets) if position is None else position, sheet)
+
+    def get_or_create_shared_strings(self):
+        """Return the shared strings root, creating the part if the package has none."""
+        if self.shared_strings is None:
+            self.shared_strings_path = "xl/sharedStrings.xml"
+            self.shared_strings = ET.Element(f"{SHEET_NS}sst", {"count": "0", "uniqueCount": "0"})
+            self._add_workbook_rel("sharedStrings", "sharedStrings.xml")
+            self._add_content_type("xl/sharedStrings.xml", SHARED_STRINGS_CONTENT_TYPE)
+        return self.shared_strings
+
+    def write(self, output_path):
+        """Write the package, copying unchanged parts straight from the source zip."""
+        # First sheet is the one shown on open (the Index)
+        book_views = self.workbook.find(f"{SHEET_NS}bookViews")
+        if book_views is not None:
+            for view in book_views:
+                view.set("activeTab", "0")
+                view.attrib.pop("firstSheet", None)
+
+        self.updated_parts["[Content_Types].xml"] = serialize_part(self.content_types)
+        self.updated_parts["xl/workbook.xml"] = serialize_part(self.workbook)
+        self.updated_parts["xl/_rels/workbook.xml.rels"] = serialize_part(self.workbook_rels)
+        self.updated_parts[self.styles_path] = serialize_part(self.styles)
+        if self.shared_strings is not None:
+            self.updated_parts[self.shared_strings_path] = serialize_part(self.shared_strings)
+
+        with zipfile.ZipFile(self.source) as source_archive, \
+                zipfile.ZipFile(output_path, "w", zipfile.ZIP_DEFLATED) as out_archive:
+            out_archive.writestr("[Content_Types].xml", self.updated_parts["[Content_Types].xml"])
+            for part_name in self.part_names:
+                if part_name in self.removed_parts or part_name in self.updated_parts:
+                    continue
+                out_archive.writestr(part_name, source_archive.read(part_name))
+            for part_name, data in self.updated_parts.items():
+                if part_name != "[Content_Types].xml" and part_name not in self.removed_parts:
+                    out_archive.writestr(part_name, data)
+
+    def _remove_part(self, part_path):
+        if part_path in self.part_names or part_path in self.updated_parts:
+            self.removed_parts.add(part_path)
+            self.updated_parts.pop(part_path, None)
+            for override in list(self.content_types):
+                if override.get("PartName") == "/" + part_path:
+                    self.content_types.remove(override)
+
+    def _add_workbook_rel(self, rel_type, target):
+        rel_ids = {rel.get("Id") for rel in self.workbook_rels}
+        rel_number = len(rel_ids) + 1
+        while f"rId{rel_number}" in rel_ids:
+            rel_number += 1
+        rel_id = f"rId{rel_number}"
+        ET.SubElement(self.workbook_rels, f"{PKG_REL_NS}Relationship", {
+            "Id": rel_id, "Type": REL_TYPE_PREFIX + rel_type, "Target": target,
+        })
+        return rel_id
+
+    def _add_content_type(self, part_path, content_type):
+        ET.SubElement(self.content_types, f"{CONTENT_TYPES_NS}Override", {
+            "PartName": "/" + part_path, "ContentType": content_type,
+        })
+
+
+class StyleRemapper:
+    """
+    Map cell style indices (cellXfs) from a source package into a target package.
+
+    Fonts, fills, borders, number formats and xfs are appended to the target
+    stylesheet only when no identical entry exists, once per source index.
+    """
+
+    def __init__(self, source_styles, target_styles):
+        self.source_styles = source_styles
+        self.target_styles = target_styles
+        self.xf_map = {}
+        self._pools = {}
+
+    def map_xf(self, source_index):
+        target_index = self.xf_map.get(source_index)
+        if target_index is not None:
+            return target_index
+
+        source_xf = list(self.source_styles.find(f"{SHEET_NS}cellXfs"))[source_index]
+        target_xf = copy.deepcopy(source_xf)
+        for attr, tag in (("fontId", "fonts"), ("fillId", "fills"), ("borderId", "borders")):
+            source_items = list(self.source_styles.find(f"{SHEET_NS}{tag}"))
+            source_item = source_items[int(source_xf.get(attr, 0))]
+            target_xf.set(attr, str(self._intern(tag, source_item)))
+
+        num_fmt_id = int(source_xf.get("numFmtId", 0))
+        if num_fmt_id >= BUILTIN_NUM_FMT_MAX:
+            target_xf.set("numFmtId", str(self._intern_num_fmt(num_fmt_id)))
+
+        # Named cell styles are not carried; formatting is fully described by the xf
+        target_xf.set("xfId", "0")
+
+        target_index = self._intern("cellXfs", target_xf)
+        self.xf_map[source_index] = target_index
+        return target_index
+
+    def _get_pool(self, tag):
+        pool = self._pools.get(tag)
+        if pool is None:
+            container = self.target_styles.find(f"{SHEET_NS}{tag}")
+            if container is None:
+                raise ZipCloneUnsupported(f"target stylesheet has no <{tag}>")
+            pool = (container, {ET.tostring(item): idx for idx, item in enumerate(container)})
+            self._pools[tag] = pool
+        return pool
+
+    def _intern(self, tag, item):
+        container, index_by_xml = self._get_pool(tag)
+        key = ET.tostring(item)
+        index = index_by_xml.get(key)
+        if index is None:
+            index = len(container)
+            container.append(copy.deepcopy(item))
+            container.set("count", str(len(container)))
+            index_by_xml[key] = index
+        return index
+
+    def _intern_num_fmt(self, source_id):
+        source_formats = self.source_styles.find(f"{SHEET_NS}numFmts")
+        format_code = next(num_fmt.get("formatCode") for num_fmt in source_formats
+                           if int(num_fmt.get("numFmtId")) == source_id)
+
+        target_formats = self.target_styles.find(f"{SHEET_NS}numFmts")
+        if target_formats is None:
+            target_formats = ET.Element(f"{SHEET_NS}numFmts", {"count": "0"})
+            self.target_styles.insert(0, target_formats)  # numFmts is the first child
+        for num_fmt in target_formats:
+            if num_fmt.get("formatCode") == format_code:
+                return int(num_fmt.get("numFmtId"))
+
+        target_id = max([BUILTIN_NUM_FMT_MAX - 1] +
+                        [int(num_fmt.get("numFmtId")) for num_fmt in target_formats]) + 1
+        ET.SubElement(target_formats, f"{SHEET_NS}numFmt",
+                      {"numFmtId": str(target_id), "formatCode": format_code})
+        target_formats.set("count", str(len(target_formats)))
+        return target_id
+
+
+class SharedStringRemapper:
+    """Map shared string indices from a source package into a target package."""
+
+    def __init__(self, source_package, target_package):
+        source_sst = source_package.shared_strings
+        self.source_items = list(source_sst) if source_sst is not None else []
+        self.target_package = target_package
+        self.index_map = {}
+        self._index_by_xml = None
+
+    def map_index(self, source_index):
+        target_index = self.index_map.get(source_index)
+        if target_index is not None:
+            return target_index
+
+        target_sst = self.target_package.get_or_create_shared_strings()
+        if self._index_by_xml is None:
+            self._index_by_xml = {ET.tostring(item): idx for idx, item in enumerate(target_sst)}
+
+        item = self.source_items[source_index]
+        key = ET.tostring(item)
+        target_index = self._index_by_xml.get(key)
+        if target_index is None:
+            target_index = len(target_sst)
+            target_sst.append(copy.deepcopy(item))
+            target_sst.set("uniqueCount", str(len(target_sst)))
+            target_sst.set("count", str(len(target_sst)))
+            self._index_by_xml[key] = target_index
+
+        self.index_map[source_index] = target_index
+        return target_index
+
+
+def clone_worksheet_xml(source_package, source_sheet_name, target_package):
+    """
+    Rewrite a worksheet part from one package so it is valid in another.
+
+    Cell, row and column style indices and shared string indices are
+    remapped; everything else (merged ranges, column widths, row heights,
+    freeze panes, formulas) travels with the XML unchanged.
+
+    Raises:
+        ZipCloneUnsupported: sheet needs relationships (hyperlinks, comments,
+            drawings, tables) or differential styles (conditional formatting)
+    """
+    part_path = dict(source_package.get_sheets())[source_sheet_name]
+    sheet_root = parse_part(source_package.read_part(part_path))
+
+    if sheet_root.find(f"{SHEET_NS}conditionalFormatting") is not None:
+        raise ZipCloneUnsupported(f"'{source_sheet_name}' uses conditional formatting")
+
+    style_remapper = StyleRemapper(source_package.styles, target_package.styles)
+    string_remapper = SharedStringRemapper(source_package, target_package)
+
+    for elem in sheet_root.iter():
+        if any(attr.startswith(REL_NS) for attr in elem.attrib):
+            raise ZipCloneUnsupported(f"'{source_sheet_name}' has related parts")
+
+        tag = elem.tag
+        if tag == f"{SHEET_NS}c":
+            if elem.get("s"):
+                elem.set("s", str(style_remapper.map_xf(int(elem.get("s")))))
+            if elem.get("t") == "s":
+                value = elem.find(f"{SHEET_NS}v")
+                value.text = str(string_remapper.map_index(int(value.text)))
+        elif tag == f"{SHEET_NS}row" and elem.get("s"):
+            elem.set("s", str(style_remapper.map_xf(int(elem.get("s")))))
+        elif tag == f"{SHEET_NS}col" and elem.get("style"):
+            elem.set("style", str(style_remapper.map_xf(int(elem.get("style")))))
+        elif tag == f"{SHEET_NS}sheetView":
+            elem.attrib.pop("tabSelected", None)  # Only the Index tab starts selected
+
+    return serialize_part(sheet_root)
+
+
+def consolidate_master_charts_zip(master_chart_paths, reference_workbook_path):
+    """
+    Consolidate master charts by moving worksheet XML between .xlsx packages.
+
+    Only the incoming topic sheets are parsed (once, read-only, for the
+    manifest entry) and rewritten; every other sheet in the reference is
+    copied as compressed-then-recompressed bytes without being parsed. The
+    Index is generated with openpyxl into a small package and cloned in the
+    same way.
+
+    Raises:
+        ZipCloneUnsupported: caller should fall back to the cell copier
+
+    Returns:
+        dict: Summary of consolidation (same keys as consolidate_master_charts)
+    """
+    start_time = time.perf_counter()
+    topics, errors = plan_topics(master_chart_paths)
+    if not topics:
+        return {"error": "; ".join(errors) or "No master charts to consolidate"}
+
+    timings = {}
+
+    step_start = time.perf_counter()
+    cached_entries = load_manifest(reference_workbook_path)
+    ref_package = None
+    if os.path.exists(reference_workbook_path):
+        print(f"📂 Opening reference package: {reference_workbook_path}")
+        ref_package = XlsxPackage(reference_workbook_path)
     else:
-        source_sheet_name = source_wb.sheetnames[0]
+        print(f"📝 Creating new reference: {reference_workbook_path}")
+    timings["load_reference"] = time.perf_counter() - step_start
+
+    # Scan incoming topics for their manifest entries
+    topic_results = []
+    fresh_entries = {}
+    source_sheets = {}
+    for topic_name, master_chart_path in topics.items():
+        topic_start = time.perf_counter()
+        print(f"📁 Reading master chart: {master_chart_path}")
+        source_wb = load_workbook(master_chart_path, read_only=True)
+        try:
+            source_sheet_name = get_source_sheet_name(source_wb)
+            fresh_entries[topic_name] = scan_worksheet(source_wb[source_sheet_name])
+        finally:
+            source_wb.close()
+        fresh_entries[topic_name]["source_digest"] = get_file_digest(master_chart_path)
+        source_sheets[topic_name] = source_sheet_name
+
+        drugs = fresh_entries[topic_name]["drugs"]
+        print(f"✓ Extracted {len(drugs)} drugs from {topic_name}")
+        topic_results.append({
+            "topic": topic_name,
+            "source": master_chart_path,
+            "drugs_added": len(drugs),
+            "seconds": time.perf_counter() - topic_start,
+        })
+
+    # Drug lists for kept reference sheets: manifest first, rescan the rest
+    step_start = time.perf_counter()
+    kept_sheets = []
+    if ref_package is not None:
+        kept_sheets = [name for name, _ in ref_package.get_sheets()
+                       if name != "Index" and name not in topics]
+    missing = [name for name in kept_sheets if name not in cached_entries]
+    if missing:
+        ref_wb = load_workbook(reference_workbook_path, read_only=True)
+        try:
+            for sheet_name in missing:
+                cached_entries[sheet_name] = scan_worksheet(ref_wb[sheet_name])
+        finally:
+            ref_wb.close()
+    print(f"♻️  Index: {len(kept_sheets) - len(missing)} sheets from manifest, "
+          f"{len(missing)} rescanned")
+
+    sheet_entries = {name: cached_entries[name] for name in kept_sheets}
+    sheet_entries.update(fresh_entries)
+    drug_sheet_mapping = get_drug_sheet_mapping(sheet_entries)
 
-    print(f"📋 Copying sheet '{source_sheet_name}' to reference as '{topic_name}'")
-    copy_worksheet_to_workbook(source_wb, source_sheet_name, ref_wb, topic_name)
+    print(f"📇 Creating/updating Index sheet with {len(drug_sheet_mapping)} total drugs")
+    index_wb = Workbook(write_only=True)
+    stream_index_sheet(index_wb, drug_sheet_mapping)
+    index_buffer = io.BytesIO()
+    index_wb.save(index_buffer)
+    index_package = XlsxPackage(index_buffer)
+    timings["index"] = time.perf_counter() - step_start
+
+    # Assemble: the Index package is the base for a brand-new reference
+    if ref_package is None:
+        target_package = index_package
+    else:
+        target_package = ref_package
+        for sheet_name in ["Index"] + list(topics):
+            target_package.remove_sheet(sheet_name)
+        target_package.add_sheet(
+            "Index", clone_worksheet_xml(index_package, "Index", target_package), position=0)
+
+    for topic_name, master_chart_path in topics.items():
+        clone_start = time.perf_counter()
+        print(f"📋 Cloning sheet '{source_sheets[topic_name]}' to reference as '{topic_name}'")
+        source_package = XlsxPackage(master_chart_path)
+        target_package.add_sheet(
+            topic_name, clone_worksheet_xml(source_package, source_sheets[topic_name], target_package))
+        for topic_result in topic_results:
+            if topic_result["topic"] == topic_name:
+                topic_result["seconds"] += time.perf_counter() - clone_start
+
+    step_start = time.perf_counter()
+    print(f"💾 Saving reference: {reference_workbook_path}")
+    replace_file_atomic(reference_workbook_path, target_package.write)
+    save_reference_indexes(reference_workbook_path, sheet_entries)
+    timings["save"] = time.perf_counter() - step_start
+    timings["total"] = time.perf_counter() - start_time
 
-    # Extract drug names from the copied sheet
-    drugs = extract_drug_names_from_sheet(ref_wb[topic_name])
-    print(f"✓ Extracted {len(drugs)} drugs from {topic_name}")
+    return {
+        "topics": topic_results,
+        "errors": errors,
+        "total_drugs_in_reference": len(drug_sheet_mapping),
+        "reference_path": reference_workbook_path,
+        "timings": timings,
+    }
 
-    # Build complete drug-sheet mapping from all sheets (except Index)
-    drug_sheet_mapping = {}
-    for sheet_name in ref_wb.sheetnames:
-        if sheet_name == "Index":
+
+# =============================================================================
+# PARALLEL SOURCE PARSING
+# =============================================================================
+
+def snapshot_master_chart(master_chart_path):
+    """
+    Parse a master chart into a compact, picklable snapshot (process pool worker).
+
+    Each distinct cell style is stored once in 'styles' and cells refer to
+    it by position, so the snapshot stays small and cheap to send back to
+    the parent process.
+
+    Args:
+        master_chart_path: Path to master chart file
+
+    Returns:
+        dict: {'sheet_name': str,
+               'rows': [[(col_idx, value, style_idx or None), ...], ...],
+               'styles': [(font, border, fill, number_format, protection, alignment), ...],
+               'layout': see read_sheet_layout,
+               'entry': manifest entry {'hash', 'drugs', 'rows', 'source_digest'},
+               'seconds': parse time}
+    """
+    start_time = time.perf_counter()
+    source_wb = load_workbook(master_chart_path, read_only=True)
+    try:
+        source_sheet_name = get_source_sheet_name(source_wb)
+        source_sheet = source_wb[source_sheet_name]
+
+        rows = []
+        styles = []
+        style_index = {}
+        drug_names = []
+        drug_rows = []
+        hasher = hashlib.sha1()
+        style_cache = {}
+        for row_idx, source_row in enumerate(source_sheet.iter_rows(), start=1):
+            row_cells = []
+            for col_idx, source_cell in enumerate(source_row, start=1):
+                update_sheet_hash(hasher, row_idx, col_idx, source_cell, style_cache)
+                if source_cell.value is None and not source_cell.has_style:
+                    continue
+
+                style_idx = None
+                if source_cell.has_style:
+                    style_ids = tuple(source_cell.style_array)
+                    style_idx = style_index.get(style_ids)
+                    if style_idx is None:
+                        style_idx = len(styles)
+                        style_index[style_ids] = style_idx
+                        styles.append((
+                            copy.copy(source_cell.font),
+                            copy.copy(source_cell.border),
+                            copy.copy(source_cell.fill),
+                            source_cell.number_format,
+                            copy.copy(source_cell.protection),
+                            copy.copy(source_cell.alignment),
+                        ))
+                row_cells.append((col_idx, source_cell.value, style_idx))
+            rows.append(row_cells)
+
+            # Column B typically contains "Drug Name (Brand)" in master charts
+            if row_idx > 1 and len(source_row) > 1 and source_row[1].value:
+                drug_name = str(source_row[1].value).strip()
+                if drug_name:
+                    drug_names.append(drug_name)
+                    drug_rows.append(row_idx)
+    finally:
+        source_wb.close()
+
+    return {
+        "sheet_name": source_sheet_name,
+        "rows": rows,
+        "styles": styles,
+        "layout": read_sheet_layout(master_chart_path, source_sheet_name),
+        "entry": {"hash": hasher.hexdigest(), "drugs": drug_names, "rows": drug_rows,
+                  "source_digest": get_file_digest(master_chart_path)},
+        "seconds": time.perf_counter() - start_time,
+    }
+
+
+def apply_sheet_snapshot(snapshot, target_wb, target_sheet_name):
+    """
+    Write a sheet snapshot into the target workbook, replacing any existing sheet.
+
+    Produces the same sheet as copy_worksheet_to_workbook. Each snapshot
+    style is assigned once; later cells reuse the resulting style slot.
+
+    Args:
+        snapshot: Result of snapshot_master_chart
+        target_wb: Target workbook
+        target_sheet_name: Name for sheet in target workbook
+
+    Returns:
+        target_sheet: The created sheet
+    """
+    if target_sheet_name in target_wb.sheetnames:
+        del target_wb[target_sheet_name]
+    target_sheet = target_wb.create_sheet(target_sheet_name)
+
+    layout = snapshot["layout"]
+    for col_letter, width in layout["column_widths"].items():
+        target_sheet.column_dimensions[col_letter].width = width
+    for row_num, height in layout["row_heights"].items():
+        target_sheet.row_dimensions[row_num].height = height
+
+    styles = snapshot["styles"]
+    style_arrays = [None] * len(styles)
+    for row_idx, row_cells in enumerate(snapshot["rows"], start=1):
+        for col_idx, value, style_idx in row_cells:
+            target_cell = target_sheet.cell(row_idx, col_idx, value)
+            if style_idx is None:
+                continue
+
+            style_array = style_arrays[style_idx]
+            if style_array is not None:
+                target_cell._style = copy.copy(style_array)
+                continue
+
+            font, border, fill, number_format, protection, alignment = styles[style_idx]
+            target_cell.font = font
+            target_cell.border = border
+            target_cell.fill = fill
+            target_cell.number_format = number_format
+            target_cell.protection = protection
+            target_cell.alignment = alignment
+            style_arrays[style_idx] = copy.copy(target_cell._style)
+
+    for merged_range in layout["merged_ranges"]:
+        target_sheet.merge_cells(merged_range)
+    if layout["freeze_panes"]:
+        target_sheet.freeze_panes = layout["freeze_panes"]
+
+    return target_sheet
+
+
+def get_default_worker_count(topic_count):
+    """One worker per topic, capped at the number of CPUs."""
+    return max(1, min(topic_count, os.cpu_count() or 1))
+
+
+# =============================================================================
+# CONSOLIDATION
+# =============================================================================
+
+def get_topic_name(master_chart_path):
+    """
+    Determine topic (sheet) name from a master chart filename.
+
+    Example: "HIV_Master_Chart.xlsx" → "HIV"
+    """
+    basename = os.path.basename(master_chart_path)
+    return basename.replace("_Master_Chart.xlsx", "").replace("_", " ")
+
+
+def get_source_sheet_name(source_wb):
+    """Return the sheet to copy: "Master Chart" if present, otherwise the first sheet."""
+    if "Master Chart" in source_wb.sheetnames:
+        return "Master Chart"
+    return source_wb.sheetnames[0]
+
+
+def resolve_master_chart_paths(patterns):
+    """
+    Expand command-line arguments into master chart paths.
+
+    Each argument may be a file path, a glob pattern (e.g. "charts/*_Master_Chart.xlsx")
+    or a directory (all *_Master_Chart.xlsx files inside it). Office lock files
+    (~$*.xlsx) are skipped and duplicates are dropped, preserving order.
+
+    Args:
+        patterns: list of paths, glob patterns or directories
+
+    Returns:
+        list: Master chart paths
+    """
+    paths = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            matches = sorted(glob.glob(os.path.join(pattern, "*_Master_Chart.xlsx")))
+        elif glob.has_magic(pattern):
+            matches = sorted(glob.glob(pattern))
+        else:
+            matches = [pattern]  # Plain path; missing files are reported later
+
+        for path in matches:
+            if os.path.basename(path).startswith("~$"):
+                continue
+            if path not in paths:
+                paths.append(path)
+
+    return paths
+
+
+def plan_topics(master_chart_paths):
+    """
+    Map each master chart to its topic sheet, dropping missing files.
+
+    If two charts resolve to the same topic, the later one wins.
+
+    Returns:
+        tuple: ({topic_name: master_chart_path}, [error messages])
+    """
+    topics = {}
+    errors = []
+    for master_chart_path in master_chart_paths:
+        if not os.path.exists(master_chart_path):
+            errors.append(f"Source file not found: {master_chart_path}")
             continue
-        sheet_drugs = extract_drug_names_from_sheet(ref_wb[sheet_name])
-        for drug in sheet_drugs:
-            drug_sheet_mapping[drug] = sheet_name
+        topic_name = get_topic_name(master_chart_path)
+        topics.pop(topic_name, None)  # Later chart replaces earlier one
+        topics[topic_name] = master_chart_path
+    return topics, errors
+
+
+def split_unchanged_charts(master_chart_paths, reference_workbook_path):
+    """
+    Separate master charts whose content is already in the reference.
+
+    A chart is unchanged when its topic sheet's manifest entry matches it:
+    first by file digest (no parsing), then by content hash (values and
+    styles, read-only scan), so a chart that was only re-saved still counts
+    as unchanged. File modification times are never used.
+
+    Args:
+        master_chart_paths: Paths to master chart files
+        reference_workbook_path: Path to consolidated reference workbook
+
+    Returns:
+        tuple: (changed_paths, [{'topic', 'source', 'drugs'}] for unchanged charts)
+    """
+    cached_entries = load_manifest(reference_workbook_path, verbose=False)
+    if not cached_entries:
+        return list(master_chart_paths), []
+
+    changed_paths = []
+    unchanged = []
+    learned_digests = False
+    for master_chart_path in master_chart_paths:
+        entry = cached_entries.get(get_topic_name(master_chart_path))
+        if entry is None or not os.path.exists(master_chart_path):
+            changed_paths.append(master_chart_path)
+            continue
+
+        source_digest = get_file_digest(master_chart_path)
+        if entry.get("source_digest") != source_digest:
+            source_wb = load_workbook(master_chart_path, read_only=True)
+            try:
+                content_hash = scan_worksheet(source_wb[get_source_sheet_name(source_wb)])["hash"]
+            finally:
+                source_wb.close()
+            if content_hash != entry["hash"]:
+                changed_paths.append(master_chart_path)
+                continue
+            entry["source_digest"] = source_digest  # Skip the scan next time
+            learned_digests = True
+
+        unchanged.append({
+            "topic": get_topic_name(master_chart_path),
+            "source": master_chart_path,
+            "drugs": len(entry["drugs"]),
+        })
+
+    if learned_digests and not changed_paths:
+        save_manifest(reference_workbook_path, cached_entries)
+
+    return changed_paths, unchanged
+
+
+def get_no_change_result(reference_workbook_path, unchanged, start_time):
+    """Result for a run where every master chart was already consolidated."""
+    sheet_entries = load_manifest(reference_workbook_path, verbose=False)
+    return {
+        "topics": [],
+        "unchanged": unchanged,
+        "no_change": True,
+        "errors": [],
+        "total_drugs_in_reference": len(get_drug_sheet_mapping(sheet_entries)),
+        "reference_path": reference_workbook_path,
+        "timings": {"load_reference": 0.0, "index": 0.0, "save": 0.0,
+                    "total": time.perf_counter() - start_time},
+    }
+
+
+def consolidate_master_charts(master_chart_paths, reference_workbook_path, streaming=False,
+                              zip_clone=False, workers=None, force=False):
+    """
+    Consolidate several master charts into the reference workbook in one pass.
+
+    The reference is loaded once, every topic is copied, the Index is rebuilt
+    once and the workbook is saved once, instead of one full load/save cycle
+    per chart.
+
+    Source charts are parsed into snapshots by a process pool while the
+    reference loads; snapshots are applied in command-line order, so the
+    result does not depend on which worker finishes first. A chart that
+    cannot be parsed is reported in 'errors' and the others still go in.
+
+    Charts whose content is already in the reference are skipped (see
+    split_unchanged_charts); if none changed, the reference is not even
+    opened.
+
+    Args:
+        master_chart_paths: Paths to master chart files (e.g., HIV_Master_Chart.xlsx)
+        reference_workbook_path: Path to consolidated reference workbook
+        streaming: Use the constant-memory streaming path
+                   (see consolidate_master_charts_streaming)
+        zip_clone: Move worksheet XML between packages instead of copying
+                   cells (see consolidate_master_charts_zip); falls back to
+                   the cell copier for sheets it cannot carry
+        workers: Parser processes (default: one per topic, up to the CPU
+                 count); 1 parses in this process
+        force: Consolidate every chart even if its content is unchanged
+
+    Returns:
+        dict: {'topics': [{'topic', 'source', 'drugs_added', 'seconds'}],
+               'unchanged': [{'topic', 'source', 'drugs'}], 'no_change': bool,
+               'errors': [...], 'total_drugs_in_reference': int,
+               'reference_path': str,
+               'timings': {'load_reference', 'index', 'save', 'total'}}
+              or {'error': message} if no chart could be consolidated
+    """
+    start_time = time.perf_counter()
+    unchanged = []
+    if not force:
+        master_chart_paths, unchanged = split_unchanged_charts(master_chart_paths,
+                                                               reference_workbook_path)
+        for topic_result in unchanged:
+            print(f"✓ No change: {topic_result['source']} (use --force to consolidate anyway)")
+        if not master_chart_paths:
+            return get_no_change_result(reference_workbook_path, unchanged, start_time)
+
+    result = consolidate_changed_charts(master_chart_paths, reference_workbook_path,
+                                        streaming=streaming, zip_clone=zip_clone,
+                                        workers=workers)
+    if "error" not in result:
+        result["unchanged"] = unchanged
+        result["no_change"] = False
+    return result
+
+
+def consolidate_changed_charts(master_chart_paths, reference_workbook_path, streaming=False,
+                               zip_clone=False, workers=None):
+    """Run the selected consolidation path (see consolidate_master_charts)."""
+    if streaming:
+        return consolidate_master_charts_streaming(master_chart_paths, reference_workbook_path)
+
+    if zip_clone:
+        try:
+            return consolidate_master_charts_zip(master_chart_paths, reference_workbook_path)
+        except ZipCloneUnsupported as e:
+            print(f"⚠️  Zip-level cloning not possible ({e}); copying cell by cell")
+
+    return consolidate_master_charts_in_memory(master_chart_paths, reference_workbook_path,
+                                               workers=workers)
+
+
+def consolidate_master_charts_in_memory(master_chart_paths, reference_workbook_path,
+                                        workers=None):
+    """
+    Consolidate master charts with the reference loaded as a normal workbook.
+
+    Args:
+        master_chart_paths: Paths to master chart files
+        reference_workbook_path: Path to consolidated reference workbook
+        workers: Parser processes (see consolidate_master_charts)
+
+    Returns:
+        dict: Summary of consolidation (see consolidate_master_charts)
+    """
+    start_time = time.perf_counter()
+    topics, errors = plan_topics(master_chart_paths)
+    if not topics:
+        return {"error": "; ".join(errors) or "No master charts to consolidate"}
+
+    timings = {}
+    if workers is None:
+        workers = get_default_worker_count(len(topics))
+
+    executor = None
+    futures = {}
+    if workers > 1:
+        print(f"⚙️  Parsing {len(topics)} master charts with {workers} workers")
+        executor = ProcessPoolExecutor(max_workers=workers)
+        for topic_name, master_chart_path in topics.items():
+            futures[topic_name] = executor.submit(snapshot_master_chart, master_chart_path)
+
+    try:
+        # Load or create reference workbook (workers keep parsing meanwhile)
+        step_start = time.perf_counter()
+        cached_entries = load_manifest(reference_workbook_path)
+        if os.path.exists(reference_workbook_path):
+            print(f"📂 Loading existing reference: {reference_workbook_path}")
+            ref_wb = load_workbook(reference_workbook_path)
+        else:
+            print(f"📝 Creating new reference: {reference_workbook_path}")
+            ref_wb = Workbook()
+            # Remove default sheet
+            if "Sheet" in ref_wb.sheetnames:
+                del ref_wb["Sheet"]
+        timings["load_reference"] = time.perf_counter() - step_start
+
+        # Copy each master chart sheet to reference workbook, in input order
+        topic_results = []
+        fresh_entries = {}
+        for topic_name, master_chart_path in topics.items():
+            print(f"📁 Reading master chart: {master_chart_path}")
+            try:
+                if executor is not None:
+                    snapshot = futures[topic_name].result()
+                else:
+                    snapshot = snapshot_master_chart(master_chart_path)
+            except Exception as e:
+                errors.append(f"Could not read {master_chart_path}: {e}")
+                continue
+
+            apply_start = time.perf_counter()
+            print(f"📋 Copying sheet '{snapshot['sheet_name']}' to reference as '{topic_name}'")
+            apply_sheet_snapshot(snapshot, ref_wb, topic_name)
+
+            fresh_entries[topic_name] = snapshot["entry"]
+            drugs = snapshot["entry"]["drugs"]
+            print(f"✓ Extracted {len(drugs)} drugs from {topic_name}")
+
+            topic_results.append({
+                "topic": topic_name,
+                "source": master_chart_path,
+                "drugs_added": len(drugs),
+                "seconds": snapshot["seconds"] + time.perf_counter() - apply_start,
+            })
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    if not topic_results:
+        return {"error": "; ".join(errors)}
+
+    # Build complete drug-sheet mapping from all sheets (except Index),
+    # reusing manifest entries for sheets that did not change
+    step_start = time.perf_counter()
+    drug_sheet_mapping, sheet_entries, rescanned = build_drug_sheet_mapping(
+        ref_wb, cached_entries, fresh_entries)
+    reused = len(sheet_entries) - len(fresh_entries) - rescanned
+    print(f"♻️  Index: {reused} sheets from manifest, {rescanned} rescanned")
 
     # Create/update Index sheet
     print(f"📇 Creating/updating Index sheet with {len(drug_sheet_mapping)} total drugs")
     create_or_update_index_sheet(ref_wb, drug_sheet_mapping)
+    timings["index"] = time.perf_counter() - step_start
 
     # Save reference workbook
+    step_start = time.perf_counter()
     print(f"💾 Saving reference: {reference_workbook_path}")
     ref_wb.save(reference_workbook_path)
+    save_reference_indexes(reference_workbook_path, sheet_entries)
+    timings["save"] = time.perf_counter() - step_start
+    timings["total"] = time.perf_counter() - start_time
 
     return {
-        "topic": topic_name,
-        "drugs_added": len(drugs),
+        "topics": topic_results,
+        "errors": errors,
         "total_drugs_in_reference": len(drug_sheet_mapping),
-        "reference_path": reference_workbook_path
+        "reference_path": reference_workbook_path,
+        "timings": timings,
+    }
+
+
+def consolidate_master_chart(master_chart_path, reference_workbook_path, streaming=False,
+                             zip_clone=False, force=False):
+    """
+    Consolidate a master chart file into the reference workbook.
+
+    Args:
+        master_chart_path: Path to individual master chart file (e.g., HIV_Master_Chart.xlsx)
+        reference_workbook_path: Path to consolidated reference workbook
+        streaming: Use the constant-memory streaming path
+        zip_clone: Use the zip-level worksheet cloning fast path
+        force: Consolidate even if the chart is unchanged
+
+    Returns:
+        dict: Summary of consolidation ('no_change' is True if the chart
+              was already consolidated and nothing was written)
+    """
+    result = consolidate_master_charts([master_chart_path], reference_workbook_path,
+                                       streaming=streaming, zip_clone=zip_clone, force=force)
+    if "error" in result:
+        return result
+
+    if result["no_change"]:
+        topic_result = result["unchanged"][0]
+        return {
+            "topic": topic_result["topic"],
+            "drugs_added": 0,
+            "total_drugs_in_reference": result["total_drugs_in_reference"],
+            "reference_path": result["reference_path"],
+            "no_change": True
+        }
+
+    topic_result = result["topics"][0]
+    return {
+        "topic": topic_result["topic"],
+        "drugs_added": topic_result["drugs_added"],
+        "total_drugs_in_reference": result["total_drugs_in_reference"],
+        "reference_path": result["reference_path"],
+        "no_change": False
+    }
+
+
+# =============================================================================
+# SHARDED REFERENCE
+# =============================================================================
+
+DEFAULT_MAX_SHARD_MB = 20
+EXAM_FOLDER_PATTERN = re.compile(r'^Exam\s*\d+\b', re.IGNORECASE)
+
+
+def get_shard_map_path(index_workbook_path):
+    """
+    Sidecar shard map path for a sharded reference.
+
+    Example: "Pharmacology_Master_Reference.xlsx" → "Pharmacology_Master_Reference.shards.json"
+    """
+    return os.path.splitext(index_workbook_path)[0] + ".shards.json"
+
+
+def get_shard_dir(index_workbook_path):
+    """
+    Directory holding the shard workbooks of a sharded reference.
+
+    Example: "Pharmacology_Master_Reference.xlsx" → "Pharmacology_Master_Reference_Shards/"
+    """
+    return os.path.splitext(index_workbook_path)[0] + "_Shards"
+
+
+def load_shard_map(index_workbook_path):
+    """
+    Load the topic → shard routing of a sharded reference.
+
+    Returns:
+        dict: {'shard_by': 'exam' | 'letter', 'max_shard_mb': float,
+               'shards': {shard_name: {'file': str, 'key': str, 'topics': [...]}}}
+              or None if the reference is not sharded
+    """
+    shard_map_path = get_shard_map_path(index_workbook_path)
+    if not os.path.exists(shard_map_path):
+        return None
+    with open(shard_map_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_shard_map(index_workbook_path, shard_map):
+    """Write the shard map (temporary file, then rename)."""
+    shard_map_path = get_shard_map_path(index_workbook_path)
+    tmp_path = shard_map_path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(shard_map, f, ensure_ascii=False, indent=1)
+    os.replace(tmp_path, shard_map_path)
+
+
+def get_shard_key(master_chart_path, shard_by):
+    """
+    Routing key for a master chart.
+
+    In exam mode the key is the nearest enclosing folder named "Exam N", so
+    charts under Exam N/Extract/Claude Study Tools/ still route by exam; a
+    chart outside any exam folder is keyed by its own folder.
+
+    Examples:
+        exam:   "Exam 3/Extract/Claude Study Tools/HIV_Master_Chart.xlsx" → "Exam 3"
+        exam:   "charts/HIV_Master_Chart.xlsx" → "charts" (no exam folder)
+        letter: "Exam 3/HIV_Master_Chart.xlsx" → "H" (topic's first letter)
+    """
+    if shard_by == "exam":
+        chart_dir = os.path.dirname(os.path.abspath(master_chart_path))
+        folder = chart_dir
+        while True:
+            if EXAM_FOLDER_PATTERN.match(os.path.basename(folder)):
+                return os.path.basename(folder)
+            parent = os.path.dirname(folder)
+            if parent == folder:
+                return os.path.basename(chart_dir)
+            folder = parent
+    first_char = get_topic_name(master_chart_path)[:1].upper()
+    return first_char if first_char.isalpha() else "#"
+
+
+def get_shard_path(index_workbook_path, shard_map, shard_name):
+    """Absolute-or-relative path of a shard workbook, next to the index workbook."""
+    return os.path.join(os.path.dirname(index_workbook_path), shard_map["shards"][shard_name]["file"])
+
+
+def route_topic_to_shard(index_workbook_path, shard_map, topic_name, master_chart_path):
+    """
+    Pick the shard for a topic, adding a new shard to shard_map if needed.
+
+    A topic stays in the shard it was first placed in. A new topic goes to
+    the newest shard for its key (exam mode: same exam; letter mode: the
+    shard whose letter range it falls in) unless that shard has reached
+    max_shard_mb, in which case a new shard is started. Sizes are read from
+    disk when routing, so a batch can take a shard somewhat past the limit.
+
+    Returns:
+        str: Shard name
+    """
+    shards = shard_map["shards"]
+    for shard_name, shard in shards.items():
+        if topic_name in shard["topics"]:
+            return shard_name
+
+    key = get_shard_key(master_chart_path, shard_map["shard_by"])
+    if shard_map["shard_by"] == "exam":
+        candidates = [name for name, shard in shards.items() if shard["key"] == key]
+    else:
+        # Letter ranges: the shard with the greatest start letter not after this one
+        starts = [shard["key"] for shard in shards.values() if shard["key"] <= key]
+        candidates = [name for name, shard in shards.items()
+                      if starts and shard["key"] == max(starts)]
+
+    max_bytes = shard_map["max_shard_mb"] * 1024 * 1024
+    if candidates:
+        shard_name = candidates[-1]
+        shard_path = get_shard_path(index_workbook_path, shard_map, shard_name)
+        if not os.path.exists(shard_path) or os.path.getsize(shard_path) < max_bytes:
+            shards[shard_name]["topics"].append(topic_name)
+            return shard_name
+
+    # Start a new shard; repeated keys get a numbered suffix, e.g. "Exam 3 (2)"
+    shard_name = key
+    suffix = 2
+    while shard_name in shards:
+        shard_name = f"{key} ({suffix})"
+        suffix += 1
+    base_name = os.path.splitext(os.path.basename(index_workbook_path))[0]
+    safe_name = re.sub(r'[^\w\- ()]+', '_', shard_name)
+    shards[shard_name] = {
+        "file": os.path.join(os.path.basename(get_shard_dir(index_workbook_path)),
+                             f"{base_name}_{safe_name}.xlsx"),
+        "key": key,
+        "topics": [topic_name],
     }
+    return shard_name
+
+
+def get_shard_entries(shard_path):
+    """
+    Manifest entries of a shard, rescanning read-only if the manifest is stale.
+
+    Returns:
+        dict: {sheet_name: manifest entry} (Index sheet excluded)
+    """
+    sheet_entries = load_manifest(shard_path, verbose=False)
+    if sheet_entries or not os.path.exists(shard_path):
+        return sheet_entries
+
+    shard_wb = load_workbook(shard_path, read_only=True)
+    try:
+        for sheet_name in shard_wb.sheetnames:
+            if sheet_name != "Index":
+                sheet_entries[sheet_name] = scan_worksheet(shard_wb[sheet_name])
+    finally:
+        shard_wb.close()
+    return sheet_entries
+
+
+def collect_shard_locations(index_workbook_path, shard_map):
+    """
+    Gather drug locations and per-shard statistics from the shards' manifests.
+
+    Returns:
+        tuple: ({drug: [(shard_file, topic), ...]},
+                [(shard_name, shard_file, topics, drug_count, size_mb), ...])
+    """
+    drug_locations = {}  # drug → [(shard file, topic), ...]
+    shard_rows = []
+    for shard_name, shard in sorted(shard_map["shards"].items(),
+                                    key=lambda item: (item[1]["key"], item[0])):
+        shard_path = get_shard_path(index_workbook_path, shard_map, shard_name)
+        sheet_entries = get_shard_entries(shard_path)
+        drug_count = 0
+        for topic_name, entry in sheet_entries.items():
+            drug_count += len(entry["drugs"])
+            for drug in entry["drugs"]:
+                locations = drug_locations.setdefault(drug, [])
+                if (shard["file"], topic_name) not in locations:
+                    locations.append((shard["file"], topic_name))
+        size_mb = os.path.getsize(shard_path) / (1024 * 1024) if os.path.exists(shard_path) else 0
+        shard_rows.append((shard_name, shard["file"], ", ".join(sheet_entries), drug_count, size_mb))
+
+    return drug_locations, shard_rows
+
+
+def write_shard_index_workbook(index_workbook_path, drug_locations, shard_rows):
+    """
+    Write the top-level index workbook of a sharded reference.
+
+    Built from the shards' manifests (see collect_shard_locations), so no
+    shard workbook is opened:
+    - Index: every drug with the topic(s) it is in; the topic cell links
+      to the sheet inside its shard workbook
+    - Shards: one row per shard with its topics, drug count and file link
+    """
+    drug_sheet_mapping = {drug: ", ".join(topic for _, topic in locations)
+                          for drug, locations in drug_locations.items()}
+
+    wb = Workbook()
+    del wb["Sheet"]
+    index_sheet = create_or_update_index_sheet(wb, drug_sheet_mapping)
+    for row in index_sheet.iter_rows(min_row=2, max_col=2):
+        drug_cell, location_cell = row
+        locations = drug_locations.get(drug_cell.value)
+        if locations:
+            # Link to the first location; the cell text lists all of them
+            shard_file, topic_name = locations[0]
+            location_cell.hyperlink = shard_file.replace(os.sep, "/")
+            location_cell.hyperlink.location = f"'{topic_name}'!A1"
+
+    shards_sheet = wb.create_sheet("Shards")
+    shards_sheet.column_dimensions['A'].width = 20
+    shards_sheet.column_dimensions['B'].width = 50
+    shards_sheet.column_dimensions['C'].width = 60
+    shards_sheet.column_dimensions['D'].width = 10
+    shards_sheet.column_dimensions['E'].width = 10
+    for col_idx, header_text in enumerate(["Shard", "Workbook", "Topics", "Drugs", "Size (MB)"],
+                                          start=1):
+        header_cell = shards_sheet.cell(1, col_idx, header_text)
+        header_cell.font = INDEX_HEADER_FONT
+        header_cell.fill = INDEX_HEADER_FILL
+        header_cell.alignment = INDEX_HEADER_ALIGNMENT
+    shards_sheet.freeze_panes = 'A2'
+
+    for row_idx, (shard_name, shard_file, topics, drug_count, size_mb) in enumerate(shard_rows, start=2):
+        shards_sheet.cell(row_idx, 1, shard_name).font = INDEX_DRUG_FONT
+        file_cell = shards_sheet.cell(row_idx, 2, shard_file)
+        file_cell.font = INDEX_SHEET_FONT
+        file_cell.hyperlink = shard_file.replace(os.sep, "/")
+        shards_sheet.cell(row_idx, 3, topics).alignment = INDEX_DRUG_ALIGNMENT
+        shards_sheet.cell(row_idx, 4, drug_count)
+        shards_sheet.cell(row_idx, 5, round(size_mb, 2))
+
+    save_workbook_atomic(wb, index_workbook_path)
+
+
+def consolidate_master_charts_sharded(master_chart_paths, index_workbook_path, shard_by=None,
+                                      max_shard_mb=None, **options):
+    """
+    Consolidate master charts into a sharded reference.
+
+    Each topic is routed to one shard workbook (see route_topic_to_shard);
+    every shard is a complete reference of its own (Index sheet, manifest,
+    drug index) consolidated with consolidate_master_charts, so only shards
+    that receive a changed topic are rewritten. index_workbook_path becomes
+    a small workbook that links into the shards.
+
+    Args:
+        master_chart_paths: Paths to master chart files
+        index_workbook_path: Path to the top-level index workbook
+        shard_by: 'exam' or 'letter' (required the first time; then read
+                  from the shard map)
+        max_shard_mb: Start a new shard once a shard reaches this size
+        **options: Passed to consolidate_master_charts (streaming, zip_clone,
+                   workers, force)
+
+    Returns:
+        dict: Summary of consolidation (keys of consolidate_master_charts,
+              plus 'shards_written': [shard names])
+    """
+    start_time = time.perf_counter()
+    shard_map = load_shard_map(index_workbook_path)
+    if shard_map is None:
+        if shard_by is None:
+            return {"error": f"{index_workbook_path} is not sharded (choose --shard-by exam or letter)"}
+        if os.path.exists(index_workbook_path):
+            return {"error": f"{index_workbook_path} already exists as an unsharded reference"}
+        shard_map = {"shard_by": shard_by, "max_shard_mb": DEFAULT_MAX_SHARD_MB, "shards": {}}
+    elif shard_by is not None and shard_by != shard_map["shard_by"]:
+        return {"error": f"{index_workbook_path} is sharded by {shard_map['shard_by']}, not {shard_by}"}
+    if max_shard_mb is not None:
+        shard_map["max_shard_mb"] = max_shard_mb
+
+    topics, errors = plan_topics(master_chart_paths)
+    if not topics:
+        return {"error": "; ".join(errors) or "No master charts to consolidate"}
+
+    routed_topics = {topic_name for shard in shard_map["shards"].values()
+                     for topic_name in shard["topics"]}
+    shard_paths = {}  # shard name → [master chart paths], in input order
+    for topic_name, master_chart_path in topics.items():
+        shard_name = route_topic_to_shard(index_workbook_path, shard_map, topic_name,
+                                          master_chart_path)
+        shard_paths.setdefault(shard_name, []).append(master_chart_path)
+
+    os.makedirs(get_shard_dir(index_workbook_path), exist_ok=True)
+    result = {"topics": [], "unchanged": [], "errors": errors, "shards_written": [],
+              "reference_path": index_workbook_path,
+              "timings": {"load_reference": 0.0, "index": 0.0, "save": 0.0}}
+    for shard_name, paths in shard_paths.items():
+        shard_path = get_shard_path(index_workbook_path, shard_map, shard_name)
+        print(f"🗂️  Shard '{shard_name}': {shard_path}")
+        shard_result = consolidate_master_charts(paths, shard_path, **options)
+        if "error" in shard_result:
+            shard_result = {"error": shard_result["error"], "topics": [], "unchanged": []}
+
+        # Keep routing for new topics only if they made it into the shard
+        consolidated = {topic_result["topic"] for topic_result
+                        in shard_result["topics"] + shard_result["unchanged"]}
+        shard = shard_map["shards"][shard_name]
+        shard["topics"] = [topic_name for topic_name in shard["topics"]
+                           if topic_name in routed_topics or topic_name in consolidated]
+
+        if "error" in shard_result:
+            result["errors"].append(f"Shard '{shard_name}': {shard_result['error']}")
+            continue
+        result["topics"].extend(shard_result["topics"])
+        result["unchanged"].extend(shard_result["unchanged"])
+        result["errors"].extend(shard_result["errors"])
+        if not shard_result["no_change"]:
+            result["shards_written"].append(shard_name)
+            for step in ("load_reference", "index", "save"):
+                result["timings"][step] += shard_result["timings"][step]
+
+    # Drop shards that were never written or received no topic
+    for shard_name, shard in list(shard_map["shards"].items()):
+        shard_path = get_shard_path(index_workbook_path, shard_map, shard_name)
+        if not os.path.exists(shard_path) or not shard["topics"]:
+            del shard_map["shards"][shard_name]
+
+    if not result["topics"] and not result["unchanged"]:
+        return {"error": "; ".join(result["errors"])}
+
+    save_shard_map(index_workbook_path, shard_map)
+    result["no_change"] = not result["shards_written"] and os.path.exists(index_workbook_path)
+
+    step_start = time.perf_counter()
+    drug_locations, shard_rows = collect_shard_locations(index_workbook_path, shard_map)
+    result["total_drugs_in_reference"] = len(drug_locations)
+    if not result["no_change"]:
+        print(f"📇 Writing shard index: {index_workbook_path}")
+        write_shard_index_workbook(index_workbook_path, drug_locations, shard_rows)
+    result["timings"]["index"] += time.perf_counter() - step_start
+    result["timings"]["total"] = time.perf_counter() - start_time
+    return result
+
+
+# =============================================================================
+# WATCH MODE
+# =============================================================================
+
+DEFAULT_DEBOUNCE_SECONDS = 2.0
+WATCH_POLL_SECONDS = 0.5
+
+
+class WarmReference:
+    """
+    A reference workbook kept loaded between batches of master charts.
+
+    Each batch only parses the charts that changed, updates their sheets
+    in memory, rebuilds the Index and saves atomically. If the file on disk
+    is changed by someone else (e.g. edited in Excel), it is reloaded
+    before the next batch.
+    """
+
+    def __init__(self, reference_workbook_path):
+        self.reference_workbook_path = reference_workbook_path
+        self.load()
+
+    def load(self):
+        """Load (or create) the reference workbook and its manifest entries."""
+        if os.path.exists(self.reference_workbook_path):
+            print(f"📂 Loading existing reference: {self.reference_workbook_path}")
+            self.wb = load_workbook(self.reference_workbook_path)
+            cached_entries = load_manifest(self.reference_workbook_path)
+            _, self.sheet_entries, rescanned = build_drug_sheet_mapping(self.wb, cached_entries, {})
+            if rescanned:
+                print(f"♻️  Index: {rescanned} sheets rescanned")
+            self.fingerprint = get_file_fingerprint(self.reference_workbook_path)
+        else:
+            print(f"📝 Creating new reference: {self.reference_workbook_path}")
+            self.wb = Workbook()
+            del self.wb["Sheet"]
+            self.sheet_entries = {}
+            self.fingerprint = None
+
+    def is_stale(self):
+        """True if the reference file changed since this process last loaded or saved it."""
+        if not os.path.exists(self.reference_workbook_path):
+            return self.fingerprint is not None
+        return get_file_fingerprint(self.reference_workbook_path) != self.fingerprint
+
+    def consolidate(self, master_chart_paths):
+        """
+        Apply a batch of master charts and save once.
+
+        Returns:
+            dict: Summary of consolidation (see consolidate_master_charts)
+        """
+        start_time = time.perf_counter()
+        if self.is_stale():
+            print("⚠️  Reference changed on disk; reloading")
+            self.load()
+
+        topics, errors = plan_topics(master_chart_paths)
+        topic_results = []
+        unchanged = []
+        fresh_entries = {}
+        learned_digests = False
+        for topic_name, master_chart_path in topics.items():
+            entry = self.sheet_entries.get(topic_name)
+            try:
+                if entry and entry.get("source_digest") == get_file_digest(master_chart_path):
+                    snapshot = None
+                else:
+                    snapshot = snapshot_master_chart(master_chart_path)
+            except Exception as e:
+                errors.append(f"Could not read {master_chart_path}: {e}")
+                continue
+
+            if snapshot is None or (entry and entry["hash"] == snapshot["entry"]["hash"]):
+                if snapshot is not None:
+                    # Re-saved without content changes; skip the parse next time
+                    entry["source_digest"] = snapshot["entry"]["source_digest"]
+                    learned_digests = True
+                print(f"✓ No change: {master_chart_path}")
+                unchanged.append({"topic": topic_name, "source": master_chart_path,
+                                  "drugs": len(entry["drugs"])})
+                continue
+
+            apply_start = time.perf_counter()
+            print(f"📋 Copying sheet '{snapshot['sheet_name']}' to reference as '{topic_name}'")
+            apply_sheet_snapshot(snapshot, self.wb, topic_name)
+            fresh_entries[topic_name] = snapshot["entry"]
+            drugs = snapshot["entry"]["drugs"]
+            print(f"✓ Extracted {len(drugs)} drugs from {topic_name}")
+            topic_results.append({
+                "topic": topic_name,
+                "source": master_chart_path,
+                "drugs_added": len(drugs),
+                "seconds": snapshot["seconds"] + time.perf_counter() - apply_start,
+            })
+
+        timings = {"load_reference": 0.0, "index": 0.0, "save": 0.0}
+        if fresh_entries:
+            step_start = time.perf_counter()
+            drug_sheet_mapping, self.sheet_entries, _ = build_drug_sheet_mapping(
+                self.wb, self.sheet_entries, fresh_entries)
+            print(f"📇 Creating/updating Index sheet with {len(drug_sheet_mapping)} total drugs")
+            create_or_update_index_sheet(self.wb, drug_sheet_mapping)
+            timings["index"] = time.perf_counter() - step_start
+
+            step_start = time.perf_counter()
+            print(f"💾 Saving reference: {self.reference_workbook_path}")
+            save_workbook_atomic(self.wb, self.reference_workbook_path)
+            save_reference_indexes(self.reference_workbook_path, self.sheet_entries)
+            self.fingerprint = get_file_fingerprint(self.reference_workbook_path)
+            timings["save"] = time.perf_counter() - step_start
+        elif learned_digests:
+            save_manifest(self.reference_workbook_path, self.sheet_entries)
+        timings["total"] = time.perf_counter() - start_time
+
+        return {
+            "topics": topic_results,
+            "unchanged": unchanged,
+            "no_change": not fresh_entries,
+            "errors": errors,
+            "total_drugs_in_reference": len(get_drug_sheet_mapping(self.sheet_entries)),
+            "reference_path": self.reference_workbook_path,
+            "timings": timings,
+        }
+
+
+def get_chart_signatures(patterns):
+    """Return {master_chart_path: (size, mtime_ns)} for charts matching the watch patterns."""
+    signatures = {}
+    for master_chart_path in resolve_master_chart_paths(patterns):
+        try:
+            signatures[master_chart_path] = tuple(get_file_fingerprint(master_chart_path))
+        except OSError:
+            continue  # Deleted between listing and stat
+    return signatures
+
+
+def watch_master_charts(patterns, reference_workbook_path, debounce_seconds=DEFAULT_DEBOUNCE_SECONDS):
+    """
+    Consolidate master charts continuously as they appear or change.
+
+    The reference stays loaded (see WarmReference). Charts are polled by
+    size and modification time; once nothing has changed for
+    debounce_seconds, the pending charts are consolidated as one batch and
+    saved once. Charts already present at startup form the first batch
+    (unchanged ones are skipped by digest). Stops on Ctrl+C or SIGTERM
+    after flushing any pending batch.
+
+    Args:
+        patterns: Directories, glob patterns or files to watch
+        reference_workbook_path: Path to consolidated reference workbook
+        debounce_seconds: Quiet period before a batch is consolidated
+    """
+    def stop_watching(signum, frame):
+        raise KeyboardInterrupt
+
+    signal.signal(signal.SIGTERM, stop_watching)
+
+    reference = WarmReference(reference_workbook_path)
+    known_signatures = {}
+    pending = []
+    last_change = None
+
+    def collect_changes():
+        nonlocal known_signatures, last_change
+        signatures = get_chart_signatures(patterns)
+        for master_chart_path, signature in signatures.items():
+            if known_signatures.get(master_chart_path) != signature:
+                if master_chart_path not in pending:
+                    pending.append(master_chart_path)
+                last_change = time.monotonic()
+        known_signatures = signatures
+
+    print(f"👀 Watching {', '.join(patterns)} (Ctrl+C to stop)")
+    try:
+        while True:
+            collect_changes()
+            if pending and time.monotonic() - last_change >= debounce_seconds:
+                flush_watch_batch(reference, pending)
+                pending = []
+
+            time.sleep(WATCH_POLL_SECONDS)
+    except KeyboardInterrupt:
+        collect_changes()  # Charts written since the last poll
+        if pending:
+            flush_watch_batch(reference, pending)
+        print("👋 Stopped watching")
+
+
+def flush_watch_batch(reference, master_chart_paths):
+    """Consolidate one batch in watch mode and report it."""
+    print("")
+    print(f"🔄 {len(master_chart_paths)} master chart(s) changed")
+    result = reference.consolidate(master_chart_paths)
+    if result["topics"]:
+        print_batch_report(result)
+    for error in result["errors"]:
+        print(f"⚠️  Skipped: {error}")
+    print(f"✅ Reference has {result['total_drugs_in_reference']} drugs "
+          f"({result['timings']['total']:.2f}s)")
+
+
+def print_batch_report(result):
+    """Print per-topic drug counts and timings for a batch consolidation."""
+    print(f"{'Topic':<30} {'Drugs':>6} {'Seconds':>9}")
+    print(f"{'-' * 30} {'-' * 6} {'-' * 9}")
+    for topic_result in result["topics"]:
+        print(f"{topic_result['topic'][:30]:<30} {topic_result['drugs_added']:>6} "
+              f"{topic_result['seconds']:>9.2f}")
+    for topic_result in result.get("unchanged", []):
+        print(f"{topic_result['topic'][:30]:<30} {topic_result['drugs']:>6} {'unchanged':>9}")
+    print("")
+
+    timings = result["timings"]
+    print(f"Load reference: {timings['load_reference']:.2f}s")
+    print(f"Index rebuild:  {timings['index']:.2f}s")
+    print(f"Save:           {timings['save']:.2f}s")
+    print(f"Total:          {timings['total']:.2f}s")
 
 
 def main():
     """Main entry point for script."""
-    if len(sys.argv) != 3:
-        print("Usage: python Auto_Consolidate_Master_Charts.py <master_chart_file> <reference_workbook>")
+    parser = argparse.ArgumentParser(
+        description="Consolidate master charts into one reference workbook.",
+        epilog='Example: python Auto_Consolidate_Master_Charts.py '
+               '"HIV_Master_Chart.xlsx" "Pharmacology_Master_Reference.xlsx"'
+    )
+    parser.add_argument("master_charts", nargs="+",
+                        help="Master chart files, glob patterns, or directories")
+    parser.add_argument("reference_workbook",
+                        help="Consolidated reference workbook (created if missing)")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--streaming", action="store_true",
+                      help="Constant-memory mode (read-only sources, write-only output)")
+    mode.add_argument("--zip-clone", action="store_true",
+                      help="Fast path: move worksheet XML between packages "
+                           "(falls back to cell copying when needed)")
+    parser.add_argument("--shard-by", choices=["exam", "letter"], default=None,
+                        help="Split the reference into one workbook per exam folder or "
+                             "letter range; reference_workbook becomes a linked index")
+    parser.add_argument("--max-shard-mb", type=float, default=None,
+                        help=f"Start a new shard once a shard reaches this size "
+                             f"(default: {DEFAULT_MAX_SHARD_MB})")
+    parser.add_argument("--watch", action="store_true",
+                        help="Keep running: consolidate charts as they appear or change "
+                             "in the given directories/patterns")
+    parser.add_argument("--debounce", type=float, default=DEFAULT_DEBOUNCE_SECONDS,
+                        help=f"Watch mode: seconds without changes before a batch is saved "
+                             f"(default: {DEFAULT_DEBOUNCE_SECONDS})")
+    parser.add_argument("--force", action="store_true",
+                        help="Consolidate charts even if their content is unchanged")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Processes used to parse master charts "
+                             "(default: one per chart, up to the CPU count)")
+    args = parser.parse_args()
+
+    if args.watch:
+        if args.streaming or args.zip_clone or args.shard_by or \
+                load_shard_map(args.reference_workbook) is not None:
+            print("❌ ERROR: --watch keeps an unsharded reference in memory; "
+                  "it cannot be combined with --streaming, --zip-clone or sharding")
+            sys.exit(1)
+        print("═══════════════════════════════════════")
+        print("  AUTO-CONSOLIDATE MASTER CHARTS (WATCH)")
+        print("═══════════════════════════════════════")
         print("")
-        print("Example:")
-        print('  python Auto_Consolidate_Master_Charts.py "HIV_Master_Chart.xlsx" "Pharmacology_Master_Reference.xlsx"')
-        sys.exit(1)
+        watch_master_charts(args.master_charts, args.reference_workbook,
+                            debounce_seconds=args.debounce)
+        return
 
-    master_chart_path = sys.argv[1]
-    reference_workbook_path = sys.argv[2]
+    master_chart_paths = resolve_master_chart_paths(args.master_charts)
+    if not master_chart_paths:
+        print(f"❌ ERROR: No master charts matched: {', '.join(args.master_charts)}")
+        sys.exit(1)
 
     print("═══════════════════════════════════════")
     print("  AUTO-CONSOLIDATE MASTER CHARTS")
     print("═══════════════════════════════════════")
     print("")
 
-    result = consolidate_master_chart(master_chart_path, reference_workbook_path)
+    options = {"streaming": args.streaming, "zip_clone": args.zip_clone,
+               "workers": args.workers, "force": args.force}
+    if args.shard_by or load_shard_map(args.reference_workbook) is not None:
+        result = consolidate_master_charts_sharded(master_chart_paths, args.reference_workbook,
+                                                   shard_by=args.shard_by,
+                                                   max_shard_mb=args.max_shard_mb, **options)
+    else:
+        result = consolidate_master_charts(master_chart_paths, args.reference_workbook, **options)
 
     if "error" in result:
         print(f"❌ ERROR: {result['error']}")
         sys.exit(1)
 
+    if result["no_change"]:
+        print("")
+        print(f"✅ No change: reference already up to date "
+              f"({result['timings']['total'] * 1000:.0f} ms)")
+        return
+
     print("")
     print("═══════════════════════════════════════")
     print("  CONSOLIDATION COMPLETE")
     print("═══════════════════════════════════════")
-    print(f"Topic: {result['topic']}")
-    print(f"Drugs added: {result['drugs_added']}")
+    print_batch_report(result)
+    print("")
+    print(f"Topics consolidated: {len(result['topics'])}")
+    if "shards_written" in result:
+        print(f"Shards rewritten: {', '.join(result['shards_written']) or 'none'}")
     print(f"Total drugs in reference: {result['total_drugs_in_reference']}")
     print(f"Reference file: {result['reference_path']}")
     print("")
-    print("✅ Master chart consolidated successfully!")
+
+    for error in result["errors"]:
+        print(f"⚠️  Skipped: {error}")
+
+    if result["errors"]:
+        print("⚠️  Some master charts were skipped")
+        sys.exit(1)
+
+    print("✅ Master charts consolidated successfully!")
 
 
 if __name__ == '__main__':
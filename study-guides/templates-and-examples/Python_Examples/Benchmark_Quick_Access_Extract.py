@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+BENCHMARK - QUICK ACCESS EXTRACTORS
+
+Excel: compares the previous extract_drugs_from_excel (read-only workbook with
+sheet.cell() random access) with the single-pass iter_rows(values_only=True)
+version in Generate_Quick_Access_Index.py on a generated drug sheet.
+
+Random access in a read-only worksheet re-reads the sheet XML from the top
+for every cell, so the previous extractor is quadratic in the row count
+(about 100s for 1,000 rows). It is therefore timed on a smaller sheet by
+default and its 10,000-row time is estimated from that; pass the same
+number twice to time both on the full sheet.
+
+Both extractors must return the same drug list on the shared sheet size.
+
+Word: compares the python-docx extractor (full Document object model) with
+the streaming OOXML reader on a generated LO guide of about 200 pages
+(100 Heading 2 sections, each with paragraphs and a 40-row drug table).
+Both must return the same entity list.
+
+Usage:
+    python Benchmark_Quick_Access_Extract.py [rows] [legacy_rows]
+
+Example:
+    python Benchmark_Quick_Access_Extract.py 10000 1000
+"""
+
+import os
+import re
+import sys
+import tempfile
+import time
+from docx import Document
+from openpyxl import Workbook, load_workbook
+
+from Generate_Quick_Access_Index import (extract_drugs_from_excel, extract_drugs_from_word,
+                                         extract_drugs_from_word_document)
+
+HEADERS = ['Drug Class', 'Drug Name (Brand)', 'Route', 'Mechanism',
+           'Uses', 'Adverse Effects', 'Contraindications', 'Special Considerations']
+
+# Generated Word guide: sections × (heading + paragraphs + table rows) ≈ 200 pages
+WORD_SECTIONS = 100
+WORD_PARAGRAPHS_PER_SECTION = 5
+WORD_TABLE_ROWS = 40
+
+
+# =============================================================================
+# PREVIOUS (RANDOM-ACCESS) IMPLEMENTATION, KEPT FOR COMPARISON
+# =============================================================================
+
+def legacy_extract_drugs_from_excel(file_path):
+    """extract_drugs_from_excel before the single-pass rewrite"""
+    drugs = []
+    wb = load_workbook(file_path, read_only=True, data_only=True)
+
+    for sheet_name in wb.sheetnames:
+        if sheet_name in ["Index", "High-Yield & Pearls", "Summary"]:
+            continue
+
+        sheet = wb[sheet_name]
+
+        drug_col_idx = None
+        for row_idx in range(1, min(4, sheet.max_row + 1)):
+            for col_idx in range(1, min(10, sheet.max_column + 1)):
+                cell_value = sheet.cell(row_idx, col_idx).value
+                if cell_value and "drug" in str(cell_value).lower():
+                    drug_col_idx = col_idx
+                    header_row = row_idx
+                    break
+            if drug_col_idx:
+                break
+
+        if drug_col_idx:
+            for row_idx in range(header_row + 1, sheet.max_row + 1):
+                cell_value = sheet.cell(row_idx, drug_col_idx).value
+                if cell_value:
+                    drug_name = str(cell_value).strip()
+                    drug_name = re.sub(r'\s*\([^)]+\)\s*$', '', drug_name)
+                    if drug_name and len(drug_name) > 1:
+                        drugs.append(drug_name)
+
+    wb.close()
+    return drugs
+
+
+# =============================================================================
+# MEASUREMENT HELPERS
+# =============================================================================
+
+def build_drug_sheet(rows, path):
+    """Write a master-chart-shaped sheet with one drug per row."""
+    wb = Workbook()
+    sheet = wb.active
+    sheet.title = "Master Chart"
+    sheet.append(HEADERS)
+    for row_idx in range(rows):
+        sheet.append([f"Class {row_idx % 20}", f"Drug{row_idx:05d} (Brand{row_idx})", "PO",
+                      "Inhibits enzyme", "Infection", "Nausea, headache",
+                      "Hypersensitivity", "Monitor renal function"])
+    wb.save(path)
+
+
+def build_word_guide(path):
+    """Write an LO study guide with a Heading 2, notes and a drug table per section."""
+    doc = Document()
+    for section_idx in range(WORD_SECTIONS):
+        doc.add_heading(f"Learning Objective {section_idx + 1}: Drug class {section_idx}", 2)
+        for paragraph_idx in range(WORD_PARAGRAPHS_PER_SECTION):
+            doc.add_paragraph(f"Key point {paragraph_idx}: mechanism, dosing and monitoring "
+                              "notes for this class of drugs. " * 3)
+        table = doc.add_table(rows=WORD_TABLE_ROWS + 1, cols=6)
+        for col_idx, header in enumerate(HEADERS[1:7]):
+            table.cell(0, col_idx).text = header
+        for row_idx in range(1, WORD_TABLE_ROWS + 1):
+            cells = table.rows[row_idx].cells
+            cells[0].text = f"Drug{section_idx:03d}{row_idx:02d} (Brand)"
+            for col_idx in range(1, 6):
+                cells[col_idx].text = f"Detail {col_idx} for row {row_idx}"
+    doc.save(path)
+
+
+def time_extractor(extract_func, path):
+    """Return (drugs, seconds) for one extraction."""
+    start_time = time.perf_counter()
+    drugs = extract_func(path)
+    return drugs, time.perf_counter() - start_time
+
+
+def benchmark_excel(rows, legacy_rows, work_dir):
+    """Print the Excel extractor comparison table."""
+    full_path = os.path.join(work_dir, "full.xlsx")
+    build_drug_sheet(rows, full_path)
+    drugs, single_pass_seconds = time_extractor(extract_drugs_from_excel, full_path)
+    assert len(drugs) == rows, f"expected {rows} drugs, got {len(drugs)}"
+
+    legacy_path = full_path
+    if legacy_rows != rows:
+        legacy_path = os.path.join(work_dir, "legacy.xlsx")
+        build_drug_sheet(legacy_rows, legacy_path)
+    legacy_drugs, legacy_seconds = time_extractor(legacy_extract_drugs_from_excel, legacy_path)
+    sample_drugs, sample_seconds = time_extractor(extract_drugs_from_excel, legacy_path)
+    assert legacy_drugs == sample_drugs, "Excel extractors disagree"
+
+    print(f"📊 Drug sheet: {rows:,} rows × {len(HEADERS)} columns "
+          f"(previous extractor: {legacy_rows:,} rows)")
+    print(f"{'Extractor':<32} {'Rows':>8} {'Seconds':>10}")
+    print(f"{'-' * 32} {'-' * 8} {'-' * 10}")
+    print(f"{'Random access (previous)':<32} {legacy_rows:>8,} {legacy_seconds:>10.2f}")
+    print(f"{'Single pass':<32} {legacy_rows:>8,} {sample_seconds:>10.2f}")
+    print(f"{'Single pass':<32} {rows:>8,} {single_pass_seconds:>10.2f}")
+    if legacy_rows != rows:
+        estimated = legacy_seconds * (rows / legacy_rows) ** 2
+        print(f"{'Random access (est., quadratic)':<32} {rows:>8,} {estimated:>10.0f}")
+    print(f"✓ Both extractors returned the same {len(legacy_drugs):,} drugs")
+
+
+def benchmark_word(work_dir):
+    """Print the Word extractor comparison table."""
+    guide_path = os.path.join(work_dir, "guide.docx")
+    build_word_guide(guide_path)
+
+    document_drugs, document_seconds = time_extractor(extract_drugs_from_word_document, guide_path)
+    streaming_drugs, streaming_seconds = time_extractor(extract_drugs_from_word, guide_path)
+    assert document_drugs == streaming_drugs, "Word extractors disagree"
+
+    size_mb = os.path.getsize(guide_path) / (1024 * 1024)
+    print(f"📝 Word guide: {WORD_SECTIONS} sections, "
+          f"{WORD_SECTIONS * WORD_TABLE_ROWS:,} table rows ({size_mb:.1f} MB)")
+    print(f"{'Extractor':<32} {'Seconds':>10} {'Speedup':>10}")
+    print(f"{'-' * 32} {'-' * 10} {'-' * 10}")
+    print(f"{'python-docx Document':<32} {document_seconds:>10.2f} {'1.0x':>10}")
+    print(f"{'Streaming OOXML reader':<32} {streaming_seconds:>10.2f} "
+          f"{f'{document_seconds / streaming_seconds:.1f}x':>10}")
+    print(f"✓ Both extractors returned the same {len(streaming_drugs):,} entities")
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    legacy_rows = int(sys.argv[2]) if len(sys.argv) > 2 else min(rows, 1000)
+
+    print("═══════════════════════════════════════")
+    print("  BENCHMARK - QUICK ACCESS EXTRACTORS")
+    print("═══════════════════════════════════════")
+    print("")
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        benchmark_excel(rows, legacy_rows, work_dir)
+        print("")
+        benchmark_word(work_dir)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+BENCHMARK - INTERNED STYLE CACHE
+
+Compares per-cell style construction (the previous behaviour) with the
+interned styles from Excel_Style_Cache.py on a 5,000-row master chart:
+
+1. Generating the chart (set_cell_style in Excel_Master_Chart_Example.py)
+2. Copying the chart into a reference workbook (copy_worksheet_to_workbook
+   in Auto_Consolidate_Master_Charts.py)
+
+Reports style objects constructed, build/copy time and save time.
+
+Usage:
+    python Benchmark_Style_Cache.py [rows]
+"""
+
+import os
+import sys
+import tempfile
+import time
+from collections import Counter
+from copy import copy
+from openpyxl import Workbook
+from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
+
+import Auto_Consolidate_Master_Charts as consolidate
+import Excel_Master_Chart_Example as master_chart
+
+STYLE_CLASSES = (Font, PatternFill, Alignment, Border, Side)
+
+HEADERS = ['Drug Class', 'Drug Name (Brand)', 'Route', 'Mechanism',
+           'Uses', 'Adverse Effects', 'Contraindications', 'Special Considerations']
+
+
+# =============================================================================
+# PREVIOUS (UNCACHED) IMPLEMENTATIONS, KEPT FOR COMPARISON
+# =============================================================================
+
+def legacy_set_cell_style(cell, text, bold=False, bg_color=None):
+    """set_cell_style before interning: new style objects for every cell"""
+    cell.value = text
+    cell.font = Font(name='Calibri', size=10, bold=bold, color='000000')
+    cell.alignment = Alignment(horizontal='left', vertical='top', wrap_text=True)
+
+    if bg_color:
+        cell.fill = PatternFill(start_color=bg_color, end_color=bg_color, fill_type='solid')
+
+    cell.border = Border(
+        left=Side(style='thin', color='FFFFFF'),
+        right=Side(style='thin', color='FFFFFF'),
+        top=Side(style='thin', color='FFFFFF'),
+        bottom=Side(style='thin', color='FFFFFF')
+    )
+
+
+def legacy_copy_cell_style(source_cell, target_cell, style_map=None):
+    """copy_cell_style before interning: six copy() calls per cell"""
+    if source_cell.has_style:
+        target_cell.font = copy(source_cell.font)
+        target_cell.border = copy(source_cell.border)
+        target_cell.fill = copy(source_cell.fill)
+        target_cell.number_format = copy(source_cell.number_format)
+        target_cell.protection = copy(source_cell.protection)
+        target_cell.alignment = copy(source_cell.alignment)
+
+
+# =============================================================================
+# MEASUREMENT HELPERS
+# =============================================================================
+
+class StyleConstructionCounter:
+    """Count style objects constructed (including copies) while active"""
+
+    def __enter__(self):
+        self.counts = Counter()
+        self._originals = {}
+        for style_class in STYLE_CLASSES:
+            self._patch(style_class)
+        return self
+
+    def _patch(self, style_class):
+        original_init = style_class.__init__
+        original_copy = style_class.__copy__
+        counts = self.counts
+
+        def counting_init(instance, *args, **kwargs):
+            counts[style_class.__name__] += 1
+            original_init(instance, *args, **kwargs)
+
+        def counting_copy(instance):
+            counts[style_class.__name__] += 1
+            return original_copy(instance)
+
+        self._originals[style_class] = (original_init, original_copy)
+        style_class.__init__ = counting_init
+        style_class.__copy__ = counting_copy
+
+    def __exit__(self, *exc_info):
+        for style_class, (original_init, original_copy) in self._originals.items():
+            style_class.__init__ = original_init
+            style_class.__copy__ = original_copy
+
+    @property
+    def total(self):
+        return sum(self.counts.values())
+
+
+def build_chart(rows, style_func):
+    """Build a master chart workbook in memory using style_func per cell"""
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "Master Chart"
+
+    for col_idx, header in enumerate(HEADERS, start=1):
+        style_func(ws.cell(1, col_idx), header, bold=True, bg_color=master_chart.MAIN_TITLE_COLOR)
+
+    for row_idx in range(rows):
+        colors = master_chart.get_color_set(row_idx // 50)
+        values = (f'Class {row_idx // 50}', f'Drug{row_idx:05d} (Brand{row_idx})', 'Oral',
+                  'Nucleoside analog → chain termination', 'HIV', 'Nephrotoxicity',
+                  'CrCl <50', 'Monitor renal function')
+        for col_idx, value in enumerate(values, start=1):
+            style_func(ws.cell(row_idx + 2, col_idx), value,
+                       bold=(col_idx == 1), bg_color=colors['main'])
+
+    return wb
+
+
+def timed_save(wb, path):
+    start = time.perf_counter()
+    wb.save(path)
+    return time.perf_counter() - start
+
+
+def run_case(label, rows, set_style_func, copy_style_func, work_dir):
+    """Build, save, copy into a reference and save again; return measurements"""
+    with StyleConstructionCounter() as build_counter:
+        start = time.perf_counter()
+        chart_wb = build_chart(rows, set_style_func)
+        build_seconds = time.perf_counter() - start
+    chart_save = timed_save(chart_wb, os.path.join(work_dir, f"{label}_chart.xlsx"))
+
+    original_copy_cell_style = consolidate.copy_cell_style
+    consolidate.copy_cell_style = copy_style_func
+    try:
+        ref_wb = Workbook()
+        del ref_wb["Sheet"]
+        with StyleConstructionCounter() as copy_counter:
+            start = time.perf_counter()
+            consolidate.copy_worksheet_to_workbook(chart_wb, "Master Chart", ref_wb, "HIV")
+            copy_seconds = time.perf_counter() - start
+    finally:
+        consolidate.copy_cell_style = original_copy_cell_style
+    ref_save = timed_save(ref_wb, os.path.join(work_dir, f"{label}_reference.xlsx"))
+
+    return {
+        "build_objects": build_counter.total,
+        "build_seconds": build_seconds,
+        "chart_save": chart_save,
+        "copy_objects": copy_counter.total,
+        "copy_seconds": copy_seconds,
+        "reference_save": ref_save,
+    }
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+
+    print("═══════════════════════════════════════")
+    print("  BENCHMARK - INTERNED STYLE CACHE")
+    print("═══════════════════════════════════════")
+    print(f"Master chart: {rows:,} rows × {len(HEADERS)} columns")
+    print("")
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        legacy = run_case("legacy", rows, legacy_set_cell_style,
+                          legacy_copy_cell_style, work_dir)
+        interned = run_case("interned", rows, master_chart.set_cell_style,
+                            consolidate.copy_cell_style, work_dir)
+
+    metrics = [
+        ("Style objects (generate)", "build_objects", "{:,}"),
+        ("Generate time (s)", "build_seconds", "{:.2f}"),
+        ("Chart save time (s)", "chart_save", "{:.2f}"),
+        ("Style objects (copy)", "copy_objects", "{:,}"),
+        ("Copy time (s)", "copy_seconds", "{:.2f}"),
+        ("Reference save time (s)", "reference_save", "{:.2f}"),
+    ]
+
+    print(f"{'Metric':<26} {'Per-cell':>12} {'Interned':>12}")
+    print(f"{'-' * 26} {'-' * 12} {'-' * 12}")
+    for label, key, fmt in metrics:
+        print(f"{label:<26} {fmt.format(legacy[key]):>12} {fmt.format(interned[key]):>12}")
+
+
+if __name__ == '__main__':
+    main()
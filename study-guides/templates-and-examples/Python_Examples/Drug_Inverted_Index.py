@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+DRUG INVERTED INDEX
+Persistent lookup of every place a drug appears in the consolidated reference
+
+Auto_Consolidate_Master_Charts.py keeps a SQLite sidecar next to the
+reference workbook that maps a normalized drug key to every (sheet, row)
+occurrence. Lookups read only the sidecar, never the .xlsx, so they return
+in milliseconds however large the reference grows.
+
+Normalization: brand suffix stripped, whitespace collapsed, case-folded
+    "Tenofovir (Viread)" → "tenofovir"
+
+The index is updated per sheet: only sheets whose content hash changed since
+the last consolidation are rewritten, and sheets no longer in the reference
+are dropped.
+
+A sharded reference (--shard-by) has one index per shard workbook; lookups on
+the top-level index workbook follow its <reference>.shards.json map and
+search every shard's index.
+
+Usage:
+    python Drug_Inverted_Index.py <reference_workbook_path> <drug_name> [--prefix]
+
+Example:
+    python Drug_Inverted_Index.py "Pharmacology_Master_Reference.xlsx" "tenofovir"
+    python Drug_Inverted_Index.py "Pharmacology_Master_Reference.xlsx" "ceph" --prefix
+"""
+
+import argparse
+import json
+import os
+import re
+import sqlite3
+import sys
+import time
+
+SCHEMA_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sheets (
+    name TEXT PRIMARY KEY,
+    hash TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS occurrences (
+    drug_key TEXT NOT NULL,
+    drug_name TEXT NOT NULL,
+    sheet TEXT NOT NULL,
+    row INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS occurrences_by_key ON occurrences (drug_key);
+CREATE INDEX IF NOT EXISTS occurrences_by_sheet ON occurrences (sheet);
+"""
+
+
+def get_index_path(reference_workbook_path):
+    """
+    Sidecar index path for a reference workbook.
+
+    Example: "Pharmacology_Master_Reference.xlsx" → "Pharmacology_Master_Reference.drugs.sqlite"
+    """
+    return os.path.splitext(reference_workbook_path)[0] + ".drugs.sqlite"
+
+
+def get_reference_indexes(reference_workbook_path):
+    """
+    Index files to search for a reference, following its shard map if it is sharded.
+
+    Returns:
+        list: [(workbook, index_path)]; workbook is the shard file (relative to
+              the reference's folder) for a sharded reference, otherwise
+              the reference's own file name
+    """
+    index_path = get_index_path(reference_workbook_path)
+    if os.path.exists(index_path):
+        return [(os.path.basename(reference_workbook_path), index_path)]
+
+    # Same sidecar name as get_shard_map_path in Auto_Consolidate_Master_Charts.py
+    shard_map_path = os.path.splitext(reference_workbook_path)[0] + ".shards.json"
+    if not os.path.exists(shard_map_path):
+        return []
+    with open(shard_map_path, 'r', encoding='utf-8') as f:
+        shard_map = json.load(f)
+
+    reference_dir = os.path.dirname(reference_workbook_path)
+    indexes = []
+    for shard in shard_map["shards"].values():
+        shard_index_path = get_index_path(os.path.join(reference_dir, shard["file"]))
+        if os.path.exists(shard_index_path):
+            indexes.append((shard["file"], shard_index_path))
+    return indexes
+
+
+def normalize_drug_key(drug_name):
+    """
+    Normalize a drug name for lookup.
+
+    Example: "  Tenofovir  DF (Viread) " → "tenofovir df"
+    """
+    name = re.sub(r'\s*\([^)]+\)\s*$', '', str(drug_name).strip())
+    return " ".join(name.split()).casefold()
+
+
+def open_index(index_path):
+    """Open (creating if needed) the index database; an outdated schema is rebuilt."""
+    conn = sqlite3.connect(index_path)
+    if conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+        conn.executescript("DROP TABLE IF EXISTS sheets; DROP TABLE IF EXISTS occurrences;")
+        conn.executescript(SCHEMA)
+        conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        conn.commit()
+    return conn
+
+
+def update_drug_index(reference_workbook_path, sheet_entries):
+    """
+    Bring the index in line with the reference's sheets, rewriting changed sheets only.
+
+    Args:
+        reference_workbook_path: Path to consolidated reference workbook
+        sheet_entries: dict {sheet_name: {'hash': str, 'drugs': [...], 'rows': [...]}}
+                       (manifest entries; 'rows' gives the row of each drug)
+
+    Returns:
+        int: Number of sheets rewritten in the index
+    """
+    conn = open_index(get_index_path(reference_workbook_path))
+    try:
+        with conn:
+            indexed_hashes = dict(conn.execute("SELECT name, hash FROM sheets"))
+
+            for sheet_name in indexed_hashes:
+                if sheet_name not in sheet_entries:
+                    conn.execute("DELETE FROM occurrences WHERE sheet = ?", (sheet_name,))
+                    conn.execute("DELETE FROM sheets WHERE name = ?", (sheet_name,))
+
+            rewritten = 0
+            for sheet_name, entry in sheet_entries.items():
+                if indexed_hashes.get(sheet_name) == entry["hash"]:
+                    continue
+                conn.execute("DELETE FROM occurrences WHERE sheet = ?", (sheet_name,))
+                conn.executemany(
+                    "INSERT INTO occurrences (drug_key, drug_name, sheet, row) VALUES (?, ?, ?, ?)",
+                    [(normalize_drug_key(drug), drug, sheet_name, row)
+                     for drug, row in zip(entry["drugs"], entry["rows"])])
+                conn.execute("INSERT OR REPLACE INTO sheets (name, hash) VALUES (?, ?)",
+                             (sheet_name, entry["hash"]))
+                rewritten += 1
+    finally:
+        conn.close()
+
+    return rewritten
+
+
+def lookup_drug(reference_workbook_path, drug_name, prefix=False):
+    """
+    Find every occurrence of a drug in the reference.
+
+    Args:
+        reference_workbook_path: Path to consolidated reference workbook
+        drug_name: Drug to look up (brand suffix and case are ignored)
+        prefix: Match every drug whose normalized name starts with drug_name
+
+    Returns:
+        list: [{'drug', 'sheet', 'row', 'workbook'}] sorted by drug, sheet
+              and row ('workbook' is the shard file for a sharded reference),
+              or {'error': message} if the reference has no index yet
+    """
+    indexes = get_reference_indexes(reference_workbook_path)
+    if not indexes:
+        return {"error": f"No drug index for {reference_workbook_path} "
+                         "(run Auto_Consolidate_Master_Charts.py first)"}
+
+    key = normalize_drug_key(drug_name)
+    occurrences = []
+    for workbook, index_path in indexes:
+        conn = sqlite3.connect(index_path)
+        try:
+            if prefix:
+                # Range scan on the key index; U+10FFFF sorts after any real suffix
+                rows = conn.execute(
+                    "SELECT drug_key, drug_name, sheet, row FROM occurrences "
+                    "WHERE drug_key >= ? AND drug_key < ?", (key, key + "\U0010ffff"))
+            else:
+                rows = conn.execute(
+                    "SELECT drug_key, drug_name, sheet, row FROM occurrences "
+                    "WHERE drug_key = ?", (key,))
+            occurrences.extend((drug_key, sheet, row, drug, workbook)
+                               for drug_key, drug, sheet, row in rows)
+        finally:
+            conn.close()
+
+    occurrences.sort()
+    return [{"drug": drug, "sheet": sheet, "row": row, "workbook": workbook}
+            for _, sheet, row, drug, workbook in occurrences]
+
+
+def main():
+    """Main entry point for script."""
+    parser = argparse.ArgumentParser(
+        description="Look up where a drug appears in the consolidated reference.",
+        epilog='Example: python Drug_Inverted_Index.py '
+               '"Pharmacology_Master_Reference.xlsx" "tenofovir"'
+    )
+    parser.add_argument("reference_workbook", help="Consolidated reference workbook")
+    parser.add_argument("drug", help="Drug name (brand suffix and case are ignored)")
+    parser.add_argument("--prefix", action="store_true",
+                        help="Match all drugs starting with the given name")
+    args = parser.parse_args()
+
+    start_time = time.perf_counter()
+    result = lookup_drug(args.reference_workbook, args.drug, prefix=args.prefix)
+    elapsed_ms = (time.perf_counter() - start_time) * 1000
+
+    if isinstance(result, dict):
+        print(f"❌ ERROR: {result['error']}")
+        sys.exit(1)
+
+    if not result:
+        print(f"No matches for '{args.drug}' ({elapsed_ms:.1f} ms)")
+        sys.exit(1)
+
+    reference_name = os.path.basename(args.reference_workbook)
+    for occurrence in result:
+        line = f"{occurrence['drug']:<40} {occurrence['sheet']:<30} row {occurrence['row']}"
+        if occurrence['workbook'] != reference_name:  # Sharded reference
+            line += f"  ({occurrence['workbook']})"
+        print(line)
+    print(f"\n{len(result)} occurrence(s) in {elapsed_ms:.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -26,8 +26,8 @@ Example: Hypersensitivity Reactions Type I-IV
 """
 
 from openpyxl import Workbook
-from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
-from openpyxl.utils import get_column_letter
+from openpyxl.styles import Font
+from Excel_Style_Cache import apply_interned_style
 
 # =============================================================================
 # COLOR SCHEME - 3-Shade System (See Excel_Color_Reference.txt)
@@ -115,26 +115,16 @@ def get_color_set(index):
 
 def apply_cell_style(cell, text='', bold=False, font_size=10, bg_color=None,
                      border=True, alignment='left', wrap=True, font_color='000000'):
-    """Apply comprehensive cell styling"""
+    """Apply comprehensive cell styling (styles are interned, see Excel_Style_Cache.py)"""
     cell.value = text
-    cell.font = Font(name='Calibri', size=font_size, bold=bold, color=font_color)
-    cell.alignment = Alignment(
-        horizontal=alignment,
-        vertical='top',
-        wrap_text=wrap
+    apply_interned_style(
+        cell,
+        font=('Calibri', font_size, bold, font_color),
+        alignment=(alignment, 'top', wrap),
+        fill=bg_color or None,
+        border=('thin', 'FFFFFF') if border else None,  # White borders
     )
 
-    if bg_color:
-        cell.fill = PatternFill(start_color=bg_color, end_color=bg_color, fill_type='solid')
-
-    if border:
-        cell.border = Border(
-            left=Side(style='thin', color='FFFFFF'),
-            right=Side(style='thin', color='FFFFFF'),
-            top=Side(style='thin', color='FFFFFF'),
-            bottom=Side(style='thin', color='FFFFFF')
-        )
-
 def create_comparison_header(ws, title, row, span_cols=5, table_index=0):
     """Create merged title row for a comparison table
 
@@ -16,6 +16,7 @@ Structure:
 from openpyxl import Workbook
 from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
 from openpyxl.utils import get_column_letter
+from Excel_Style_Cache import apply_interned_style
 
 # =============================================================================
 # COLOR SCHEME - SOFT PASTELS WITH BLACK TEXT
@@ -107,21 +108,16 @@ def get_color_set(index):
 
 def apply_cell_style(cell, text='', bold=False, font_size=10, bg_color=None,
                      border=True, alignment='left', wrap=True):
-    """Apply comprehensive cell styling"""
+    """Apply comprehensive cell styling (styles are interned, see Excel_Style_Cache.py)"""
     cell.value = text
-    cell.font = Font(name='Calibri', size=font_size, bold=bold, color='000000')
-    cell.alignment = Alignment(
-        horizontal=alignment,
-        vertical='top',
-        wrap_text=wrap
+    apply_interned_style(
+        cell,
+        font=('Calibri', font_size, bold, '000000'),
+        alignment=(alignment, 'top', wrap),
+        fill=bg_color or None,
+        border=('thin', 'FFFFFF') if border else None,  # Same as thin_border
     )
 
-    if bg_color:
-        cell.fill = PatternFill(start_color=bg_color, end_color=bg_color, fill_type='solid')
-
-    if border:
-        cell.border = thin_border
-
 def create_header_row(ws, headers, row=1):
     """Create formatted header row"""
     for col_idx, header in enumerate(headers, start=1):
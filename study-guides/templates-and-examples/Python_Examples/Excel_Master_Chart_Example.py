@@ -15,6 +15,7 @@ Structure:
 
 from openpyxl import Workbook
 from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
+from Excel_Style_Cache import apply_interned_style
 
 # =============================================================================
 # COLOR SCHEME - 3-Shade System (See Excel_Color_Reference.txt)
@@ -94,20 +95,14 @@ def get_color_set(index):
 # =============================================================================
 
 def set_cell_style(cell, text, bold=False, bg_color=None):
-    """Apply cell styling"""
+    """Apply cell styling (styles are interned, see Excel_Style_Cache.py)"""
     cell.value = text
-    cell.font = Font(name='Calibri', size=10, bold=bold, color='000000')
-    cell.alignment = Alignment(horizontal='left', vertical='top', wrap_text=True)
-
-    if bg_color:
-        cell.fill = PatternFill(start_color=bg_color, end_color=bg_color, fill_type='solid')
-
-    # White borders
-    cell.border = Border(
-        left=Side(style='thin', color='FFFFFF'),
-        right=Side(style='thin', color='FFFFFF'),
-        top=Side(style='thin', color='FFFFFF'),
-        bottom=Side(style='thin', color='FFFFFF')
+    apply_interned_style(
+        cell,
+        font=('Calibri', 10, bold, '000000'),
+        alignment=('left', 'top', True),
+        fill=bg_color or None,
+        border=('thin', 'FFFFFF'),  # White borders
     )
 
 # =============================================================================
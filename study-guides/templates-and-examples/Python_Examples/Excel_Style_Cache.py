@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+EXCEL STYLE CACHE
+Interned openpyxl styles shared by the Excel generators and consolidation
+
+Building a new Font/PatternFill/Alignment/Border for every cell is the most
+expensive part of writing a chart: openpyxl hashes each style object to
+deduplicate it on assignment. This module creates each distinct style once
+and reuses it by reference.
+
+Two levels of reuse:
+- Style objects: get_font/get_fill/get_alignment/get_border return one
+  shared instance per distinct style tuple (style objects are immutable
+  once created, so sharing is safe)
+- Cell styles: apply_interned_style remembers the workbook's internal style
+  slot for a style tuple, so repeat cells skip object hashing entirely.
+  copy_interned_style does the same for cells copied between workbooks,
+  keyed by the source cell's style id
+
+Usage:
+    from Excel_Style_Cache import apply_interned_style
+
+    apply_interned_style(cell, font=('Calibri', 10, True, '000000'),
+                         fill='D9E2F3', alignment=('left', 'top', True),
+                         border=('thin', 'FFFFFF'))
+
+Benchmark:
+    python Benchmark_Style_Cache.py
+"""
+
+import weakref
+from copy import copy
+from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
+
+# =============================================================================
+# SHARED STYLE OBJECTS
+# =============================================================================
+
+_STYLE_OBJECTS = {}
+
+# Workbook → {style tuple: internal style array}; entries vanish with the workbook
+_CELL_STYLES = weakref.WeakKeyDictionary()
+
+
+def get_font(name='Calibri', size=10, bold=False, color='000000', italic=False):
+    """Return the shared Font for these settings"""
+    key = ('font', name, size, bold, color, italic)
+    font = _STYLE_OBJECTS.get(key)
+    if font is None:
+        font = Font(name=name, size=size, bold=bold, color=color, italic=italic)
+        _STYLE_OBJECTS[key] = font
+    return font
+
+
+def get_fill(color):
+    """Return the shared solid PatternFill for a hex color"""
+    key = ('fill', color)
+    fill = _STYLE_OBJECTS.get(key)
+    if fill is None:
+        fill = PatternFill(start_color=color, end_color=color, fill_type='solid')
+        _STYLE_OBJECTS[key] = fill
+    return fill
+
+
+def get_alignment(horizontal='left', vertical='top', wrap_text=True):
+    """Return the shared Alignment for these settings"""
+    key = ('alignment', horizontal, vertical, wrap_text)
+    alignment = _STYLE_OBJECTS.get(key)
+    if alignment is None:
+        alignment = Alignment(horizontal=horizontal, vertical=vertical, wrap_text=wrap_text)
+        _STYLE_OBJECTS[key] = alignment
+    return alignment
+
+
+def get_border(style='thin', color='FFFFFF'):
+    """Return the shared four-sided Border (white thin borders by default)"""
+    key = ('border', style, color)
+    border = _STYLE_OBJECTS.get(key)
+    if border is None:
+        side = Side(style=style, color=color)
+        border = Border(left=side, right=side, top=side, bottom=side)
+        _STYLE_OBJECTS[key] = border
+    return border
+
+
+def style_object_count():
+    """Number of distinct style objects created through this module"""
+    return len(_STYLE_OBJECTS)
+
+
+# =============================================================================
+# CELL STYLE INTERNING
+# =============================================================================
+
+def apply_interned_style(cell, font=None, fill=None, alignment=None, border=None):
+    """
+    Style a cell from style tuples, reusing the workbook's style slot.
+
+    Args:
+        cell: openpyxl Cell (normal or write-only)
+        font: (name, size, bold, color) or (name, size, bold, color, italic)
+        fill: Hex background color
+        alignment: (horizontal, vertical, wrap_text)
+        border: (style, color)
+
+    Arguments left as None keep the cell's current value for that property,
+    exactly like not assigning it.
+    """
+    workbook_styles = _CELL_STYLES.setdefault(cell.parent.parent, {})
+    # The starting style is part of the key: None arguments keep it
+    start_style = tuple(cell._style) if cell._style is not None else None
+    key = (start_style, font, fill, alignment, border)
+
+    style_array = workbook_styles.get(key)
+    if style_array is not None:
+        cell._style = copy(style_array)
+        return
+
+    if font is not None:
+        cell.font = get_font(*font)
+    if fill is not None:
+        cell.fill = get_fill(fill)
+    if alignment is not None:
+        cell.alignment = get_alignment(*alignment)
+    if border is not None:
+        cell.border = get_border(*border)
+
+    workbook_styles[key] = copy(cell._style)
+
+
+def copy_interned_style(source_cell, target_cell, style_map):
+    """
+    Copy a cell's style into another workbook, once per distinct source style.
+
+    Args:
+        source_cell: Cell or ReadOnlyCell to copy from
+        target_cell: Cell in the target workbook
+        style_map: dict reused for every cell copied between the same two
+                   workbooks ({source style id tuple: target style array})
+    """
+    if not source_cell.has_style:
+        return
+
+    source_array = (source_cell.style_array if hasattr(source_cell, "style_array")
+                    else source_cell._style)
+    source_key = tuple(source_array)
+
+    target_array = style_map.get(source_key)
+    if target_array is not None:
+        target_cell._style = copy(target_array)
+        return
+
+    # First cell with this source style: copy (unwraps openpyxl's StyleProxy)
+    target_cell.font = copy(source_cell.font)
+    target_cell.border = copy(source_cell.border)
+    target_cell.fill = copy(source_cell.fill)
+    target_cell.number_format = copy(source_cell.number_format)
+    target_cell.protection = copy(source_cell.protection)
+    target_cell.alignment = copy(source_cell.alignment)
+    style_map[source_key] = copy(target_cell._style)
@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+FUZZY ENTITY LOOKUP
+Typo-tolerant search of the Quick Access entities
+
+QUICK_ACCESS.md only supports exact Ctrl+F, so "emtricitabene" or
+"dolutegravire" find nothing. Generate_Quick_Access_Index.py also writes
+QUICK_ACCESS.fuzzy.sqlite, a trigram index of every entity name, and this
+script returns the nearest entities and their files.
+
+How matching works:
+- Names are case-folded with whitespace collapsed, then split into
+  overlapping 3-letter grams, padded so short names still have grams
+  ("dolu" → "  d", " do", "dol", "olu", "lu ")
+- A match may be at most a quarter of the query's length away in edits
+  (at least 1), which bounds both its length and how many grams it must
+  share with the query (one edit changes at most 3 grams)
+- Candidates are the entities within that length window sharing the most
+  grams with the query; the gram table is keyed by (gram, length), so
+  only postings inside the window are read
+- Candidates are ranked by edit distance (Levenshtein), then trigram
+  similarity (shared / combined grams)
+
+Only the gram table (indexed) is read, never QUICK_ACCESS.md, so lookups
+take a few milliseconds even for a 10,000-entity vocabulary.
+
+Usage:
+    python Fuzzy_Entity_Lookup.py <study_guides_directory> <name> [--limit N]
+
+Example:
+    python Fuzzy_Entity_Lookup.py "Pharmacology/Exam 3/Claude Study Tools/" "emtricitabene"
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import time
+from collections import Counter
+
+INDEX_FILENAME = "QUICK_ACCESS.fuzzy.sqlite"
+
+SCHEMA = """
+CREATE TABLE entities (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    key TEXT NOT NULL,
+    gram_count INTEGER NOT NULL,
+    files TEXT NOT NULL
+);
+CREATE TABLE trigrams (
+    gram TEXT NOT NULL,
+    length INTEGER NOT NULL,
+    entity_id INTEGER NOT NULL,
+    PRIMARY KEY (gram, length, entity_id)
+) WITHOUT ROWID;
+"""
+
+# Entities re-ranked by edit distance after the trigram pass
+CANDIDATE_LIMIT = 50
+
+# Matches may differ from the query by at most this share of its length
+MAX_TYPO_RATIO = 0.25
+
+
+def get_index_path(directory):
+    """Fuzzy lookup index path for a study guides directory."""
+    return os.path.join(directory, INDEX_FILENAME)
+
+
+def normalize_entity_key(name):
+    """
+    Normalize an entity name for matching.
+
+    Example: "  Tenofovir  DF " → "tenofovir df"
+    """
+    return " ".join(str(name).split()).casefold()
+
+
+def get_trigrams(key):
+    """
+    Distinct 3-letter grams of a normalized key (two leading spaces, one trailing).
+
+    Example: "dolu" → {"  d", " do", "dol", "olu", "lu "}
+    """
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def get_edit_distance(a, b, max_distance=None):
+    """
+    Levenshtein distance between two strings.
+
+    With max_distance, gives up early and returns max_distance + 1 as soon
+    as the distance is known to exceed it.
+    """
+    if max_distance is not None and abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+    if len(a) < len(b):
+        a, b = b, a
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, start=1):
+        current = [i]
+        for j, char_b in enumerate(b, start=1):
+            current.append(min(previous[j] + 1,
+                               current[j - 1] + 1,
+                               previous[j - 1] + (char_a != char_b)))
+        if max_distance is not None and min(current) > max_distance:
+            return max_distance + 1
+        previous = current
+    return previous[-1]
+
+
+def build_fuzzy_index(entity_files_map, index_path):
+    """
+    Write the trigram index for a Quick Access entity map (replaces any old index).
+
+    Args:
+        entity_files_map: dict {entity_name: [files]}
+        index_path: Path of the SQLite index to write
+
+    Returns:
+        int: Number of entities indexed
+    """
+    tmp_path = index_path + ".tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+
+    conn = sqlite3.connect(tmp_path)
+    try:
+        with conn:
+            conn.executescript(SCHEMA)
+            entity_rows = []
+            trigram_rows = []
+            for entity_id, (entity, files) in enumerate(sorted(entity_files_map.items()), start=1):
+                key = normalize_entity_key(entity)
+                grams = get_trigrams(key)
+                entity_rows.append((entity_id, entity, key, len(grams), json.dumps(files)))
+                trigram_rows.extend((gram, len(key), entity_id) for gram in grams)
+            conn.executemany("INSERT INTO entities VALUES (?, ?, ?, ?, ?)", entity_rows)
+            conn.executemany("INSERT INTO trigrams VALUES (?, ?, ?)", trigram_rows)
+    finally:
+        conn.close()
+
+    os.replace(tmp_path, index_path)
+    return len(entity_rows)
+
+
+def lookup_entity(directory, name, limit=5):
+    """
+    Find the entities nearest to a (possibly misspelled) name.
+
+    Args:
+        directory: Study guides directory (containing QUICK_ACCESS.fuzzy.sqlite)
+        name: Name to look up
+        limit: Maximum number of matches
+
+    Returns:
+        list: [{'entity', 'files', 'distance', 'similarity'}] nearest first,
+              or {'error': message} if the directory has no index yet
+    """
+    index_path = get_index_path(directory)
+    if not os.path.exists(index_path):
+        return {"error": f"No fuzzy lookup index in {directory} "
+                         "(run Generate_Quick_Access_Index.py first)"}
+
+    key = normalize_entity_key(name)
+    if not key:
+        return []
+    grams = sorted(get_trigrams(key))
+    max_distance = max(1, round(len(key) * MAX_TYPO_RATIO))
+    min_shared = len(grams) - 3 * max_distance
+
+    conn = sqlite3.connect(index_path)
+    try:
+        placeholders = ", ".join("?" * len(grams))
+        shared_counts = Counter(entity_id for entity_id, in conn.execute(
+            f"SELECT entity_id FROM trigrams WHERE gram IN ({placeholders}) "
+            "AND length BETWEEN ? AND ?",
+            (*grams, len(key) - max_distance, len(key) + max_distance)))
+
+        candidates = {entity_id: shared for entity_id, shared
+                      in shared_counts.most_common(CANDIDATE_LIMIT) if shared >= min_shared}
+        placeholders = ", ".join("?" * len(candidates))
+        rows = conn.execute(
+            f"SELECT id, name, key, gram_count, files FROM entities WHERE id IN ({placeholders})",
+            list(candidates)).fetchall()
+    finally:
+        conn.close()
+
+    matches = []
+    for entity_id, entity, entity_key, gram_count, files in rows:
+        distance = get_edit_distance(key, entity_key, max_distance)
+        if distance <= max_distance:
+            shared = candidates[entity_id]
+            matches.append({"entity": entity, "files": json.loads(files), "distance": distance,
+                            "similarity": shared / (len(grams) + gram_count - shared)})
+    matches.sort(key=lambda match: (match["distance"], -match["similarity"], match["entity"]))
+    return matches[:limit]
+
+
+def main():
+    """Main entry point for script."""
+    parser = argparse.ArgumentParser(
+        description="Typo-tolerant lookup of Quick Access entities.",
+        epilog='Example: python Fuzzy_Entity_Lookup.py '
+               '"Pharmacology/Exam 3/Claude Study Tools/" "emtricitabene"'
+    )
+    parser.add_argument("study_guides_directory", help="Directory containing QUICK_ACCESS.md")
+    parser.add_argument("name", help="Drug/condition name (misspellings allowed)")
+    parser.add_argument("--limit", type=int, default=5, help="Maximum matches (default: 5)")
+    args = parser.parse_args()
+
+    start_time = time.perf_counter()
+    result = lookup_entity(args.study_guides_directory, args.name, limit=args.limit)
+    elapsed_ms = (time.perf_counter() - start_time) * 1000
+
+    if isinstance(result, dict):
+        print(f"❌ ERROR: {result['error']}")
+        sys.exit(1)
+
+    if not result:
+        print(f"No matches for '{args.name}' ({elapsed_ms:.1f} ms)")
+        sys.exit(1)
+
+    for match in result:
+        marker = "✓" if match["distance"] == 0 else f"~{match['distance']}"
+        print(f"{marker:>4}  {match['entity']:<40} → {', '.join(match['files'])}")
+    print(f"\n{len(result)} match(es) in {elapsed_ms:.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -12,28 +12,119 @@ Purpose:
 - Maps each entity to its source file(s)
 
 Usage:
-    python Generate_Quick_Access_Index.py <study_guides_directory>
+    python Generate_Quick_Access_Index.py <study_guides_directory> [--workers N] [--no-cache]
+                                          [--recursive] [--include PATTERN] [--exclude PATTERN]
 
 Example:
     python Generate_Quick_Access_Index.py "Pharmacology/Exam 3/Claude Study Tools/"
+    python Generate_Quick_Access_Index.py "Pharmacology/" --recursive --exclude "Archive"
 
 Output:
     QUICK_ACCESS.md in the specified directory
+    QUICK_ACCESS.json (same index as JSON: {letter: {entity: [files]}})
+    QUICK_ACCESS.html (self-contained page with instant prefix search)
+    QUICK_ACCESS.sections.json (rendered letter sections, reused on re-runs)
+    QUICK_ACCESS.cache.json (extracted entities per file, reused on re-runs)
+    QUICK_ACCESS.fuzzy.sqlite (trigram index for Fuzzy_Entity_Lookup.py)
 
 Features:
 - Alphabetical organization with letter section headers
+- Incremental output: only letter sections whose entities changed are
+  re-rendered and patched into the existing files (earlier sections are
+  left alone on disk), and nothing is rewritten if no section changed
 - Links to source files
 - Multiple files per entity (if entity appears in multiple guides)
 - Auto-updates when new files added
 - Fast visual scanning
+- Parallel parsing: files are extracted in worker processes (--workers N)
+- Incremental: unchanged files are read from the extraction cache, so a
+  re-run only parses new or changed guides
+- Recursive scanning (--recursive) with include/exclude glob patterns;
+  files are listed by their path relative to the scanned directory and
+  Office lock files (~$*) are skipped
+- Word guides are streamed straight from the .docx zip (lxml iterparse on
+  word/document.xml) instead of building a python-docx document model
+- Manifest pre-filter: workbooks with only Index/Summary/High-Yield sheets
+  are skipped from xl/workbook.xml alone, and Word guides whose styles
+  define no Heading 2/3 are streamed for tables only
+- Flashcard CSVs are read with the csv module (multi-line fields stay
+  whole) and matched against the Excel drug vocabulary with an
+  Aho-Corasick automaton, one linear pass per file
+
+Full-text search over the same files (any word, not just entity names):
+    python Study_Guide_Search_Index.py <study_guides_directory> "HLA-B*5701"
+
+Typo-tolerant entity lookup:
+    python Fuzzy_Entity_Lookup.py <study_guides_directory> "emtricitabene"
 """
 
+import argparse
+import csv
+import fnmatch
+import hashlib
+import html
+import json
 import sys
 import os
+import posixpath
 import re
+import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from pathlib import Path
+from urllib.parse import quote
 from openpyxl import load_workbook
 from docx import Document
+from lxml import etree
+
+from Fuzzy_Entity_Lookup import build_fuzzy_index, get_index_path as get_fuzzy_index_path
+
+
+# Header search window for extract_drugs_from_excel
+EXCEL_HEADER_ROWS = 3
+EXCEL_HEADER_COLUMNS = 9
+
+BRAND_SUFFIX_PATTERN = re.compile(r'\s*\([^)]+\)\s*$')
+
+# Sheets that are never drug lists
+EXCEL_SKIPPED_SHEETS = {"Index", "High-Yield & Pearls", "Summary"}
+
+WORD_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+SPREADSHEET_NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+PACKAGE_RELS_NS = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+OFFICE_DOCUMENT_REL = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument"
+STYLES_REL = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles"
+
+# Heading styles indexed from Word guides (styles.xml stores built-in names in lower case)
+HEADING_STYLE_NAMES = {"Heading 2", "Heading 3", "heading 2", "heading 3"}
+
+# Fallback for flashcards when no Excel vocabulary is available
+ANKI_QUESTION_PATTERN = re.compile(
+    r'(?:mechanism|class|use|effect).*?(?:of|for)\s+([A-Z][a-z]+(?:[a-z]+)?)')
+
+HEADING_PREFIX_PATTERN = re.compile(r'^(Drug|Condition|Learning Objective \d+):\s*')
+
+# Run children with a fixed text equivalent (w:br handled separately)
+RUN_TEXT_CHARACTERS = {
+    WORD_NS + "tab": "\t",
+    WORD_NS + "ptab": "\t",
+    WORD_NS + "cr": "\n",
+    WORD_NS + "noBreakHyphen": "-",
+}
+
+# Text content of a w:p in document order: w:t text nodes as strings, other
+# text-bearing run children as elements (same run selection as python-docx)
+PARAGRAPH_TEXT_NODES = etree.XPath(
+    "(w:r | w:hyperlink/w:r)/w:t/text()"
+    " | (w:r | w:hyperlink/w:r)/*[self::w:br or self::w:tab or self::w:ptab"
+    " or self::w:cr or self::w:noBreakHyphen]",
+    namespaces={"w": WORD_NS[1:-1]}, smart_strings=False)
+
+# Whether a w:tbl has any horizontally/vertically merged or offset cells
+TABLE_HAS_MERGES = etree.XPath(
+    "boolean(w:tr/w:tc/w:tcPr[w:gridSpan or w:vMerge] or w:tr/w:trPr/w:gridBefore)",
+    namespaces={"w": WORD_NS[1:-1]})
 
 
 def extract_drugs_from_excel(file_path):
@@ -41,6 +132,16 @@ def extract_drugs_from_excel(file_path):
     Extract drug names from Excel study guide.
     Looks for Drug Name column (typically column B).
 
+    Each sheet is read in a single pass of iter_rows(values_only=True):
+    the first cell containing "drug" in the first 3 rows (columns A-I)
+    marks the header, and every following row contributes that column.
+    (Random access with sheet.cell() re-scans the sheet XML in read-only
+    mode, so it is avoided.)
+
+    Workbooks whose sheets are all skipped (e.g. only "Summary") are
+    recognized from the sheet list in xl/workbook.xml (see
+    read_workbook_sheet_names) and never loaded with openpyxl.
+
     Args:
         file_path: Path to Excel file
 
@@ -48,38 +149,41 @@ def extract_drugs_from_excel(file_path):
         list: Drug names found
     """
     drugs = []
+    try:
+        sheet_names = read_workbook_sheet_names(file_path)
+    except Exception:
+        sheet_names = None  # Not a readable package: let openpyxl report it
+    if sheet_names is not None and EXCEL_SKIPPED_SHEETS.issuperset(sheet_names):
+        return drugs
+
     try:
         wb = load_workbook(file_path, read_only=True, data_only=True)
 
         # Check each sheet
         for sheet_name in wb.sheetnames:
-            if sheet_name in ["Index", "High-Yield & Pearls", "Summary"]:
+            if sheet_name in EXCEL_SKIPPED_SHEETS:
                 continue  # Skip non-drug-list sheets
 
-            sheet = wb[sheet_name]
-
-            # Look for "Drug Name" header in first 3 rows
             drug_col_idx = None
-            for row_idx in range(1, min(4, sheet.max_row + 1)):
-                for col_idx in range(1, min(10, sheet.max_column + 1)):
-                    cell_value = sheet.cell(row_idx, col_idx).value
-                    if cell_value and "drug" in str(cell_value).lower():
-                        drug_col_idx = col_idx
-                        header_row = row_idx
-                        break
-                if drug_col_idx:
-                    break
-
-            # Extract drugs from that column
-            if drug_col_idx:
-                for row_idx in range(header_row + 1, sheet.max_row + 1):
-                    cell_value = sheet.cell(row_idx, drug_col_idx).value
-                    if cell_value:
-                        drug_name = str(cell_value).strip()
-                        # Remove (Brand Name) suffix if present
-                        drug_name = re.sub(r'\s*\([^)]+\)\s*$', '', drug_name)
-                        if drug_name and len(drug_name) > 1:
-                            drugs.append(drug_name)
+            for row_idx, row in enumerate(wb[sheet_name].iter_rows(values_only=True), start=1):
+                if drug_col_idx is None:
+                    if row_idx > EXCEL_HEADER_ROWS:
+                        break  # No header: not a drug list
+
+                    # Look for "Drug Name" header
+                    for col_idx, cell_value in enumerate(row[:EXCEL_HEADER_COLUMNS]):
+                        if cell_value and "drug" in str(cell_value).lower():
+                            drug_col_idx = col_idx
+                            break
+                    continue
+
+                # Extract drugs from that column
+                if drug_col_idx < len(row) and row[drug_col_idx]:
+                    drug_name = str(row[drug_col_idx]).strip()
+                    # Remove (Brand Name) suffix if present
+                    drug_name = BRAND_SUFFIX_PATTERN.sub('', drug_name)
+                    if drug_name and len(drug_name) > 1:
+                        drugs.append(drug_name)
 
         wb.close()
     except Exception as e:
@@ -88,92 +192,652 @@ def extract_drugs_from_excel(file_path):
     return drugs
 
 
+def read_workbook_sheet_names(file_path):
+    """
+    Sheet names of an .xlsx file, read from its xl/workbook.xml manifest.
+
+    Only that one zip member is inflated (located through the zip central
+    directory), so this costs a fraction of a workbook load, which also
+    reads styles and the shared string table.
+
+    Args:
+        file_path: Path to Excel file
+
+    Returns:
+        list: Sheet names in workbook order
+    """
+    with zipfile.ZipFile(file_path) as package:
+        workbook_path = read_part_relationships(package, "").get(OFFICE_DOCUMENT_REL,
+                                                                 "xl/workbook.xml")
+        with package.open(workbook_path) as workbook_xml:
+            return [sheet.get("name") for _, sheet
+                    in etree.iterparse(workbook_xml, tag=SPREADSHEET_NS + "sheet")]
+
+
+def read_part_relationships(package, part_path):
+    """
+    Relationships of one package part, with targets resolved to zip member names.
+
+    Args:
+        package: Open zipfile.ZipFile
+        part_path: Part name ("" for the package itself)
+
+    Returns:
+        dict: {relationship type: part path} (first relationship of each type)
+    """
+    part_dir, part_name = posixpath.split(part_path)
+    try:
+        rels_xml = package.read(posixpath.join(part_dir, "_rels", part_name + ".rels"))
+    except KeyError:
+        return {}
+
+    relationships = {}
+    for rel in etree.fromstring(rels_xml).iter(PACKAGE_RELS_NS + "Relationship"):
+        if rel.get("TargetMode") == "External":
+            continue
+        target = rel.get("Target", "")
+        if target.startswith("/"):
+            target_path = target.lstrip("/")
+        else:
+            target_path = posixpath.normpath(posixpath.join(part_dir, target))
+        relationships.setdefault(rel.get("Type"), target_path)
+    return relationships
+
+
+def load_heading_styles(package, styles_path):
+    """
+    Which paragraph styles count as Heading 2/3.
+
+    Paragraphs without a known paragraph style use the default paragraph
+    style, as in Word (and python-docx), so its heading flag is returned too.
+
+    Returns:
+        tuple: ({style id: is Heading 2/3}, default style is Heading 2/3)
+    """
+    if styles_path is None:
+        return {}, False
+
+    heading_styles = {}
+    default_is_heading = False
+    with package.open(styles_path) as styles_xml:
+        for style in etree.parse(styles_xml).getroot().iter(WORD_NS + "style"):
+            style_id = style.get(WORD_NS + "styleId")
+            if style.get(WORD_NS + "type", "paragraph") != "paragraph":
+                heading_styles.setdefault(style_id, None)  # Not a paragraph style
+                continue
+            name = style.find(WORD_NS + "name")
+            is_heading = name is not None and name.get(WORD_NS + "val") in HEADING_STYLE_NAMES
+            heading_styles.setdefault(style_id, is_heading)
+            if style.get(WORD_NS + "default") in ("1", "true", "on"):
+                default_is_heading = is_heading  # Last default wins
+
+    return heading_styles, default_is_heading
+
+
+def get_paragraph_text(paragraph):
+    """Text of a w:p element: its runs and hyperlink runs (same rules as python-docx)."""
+    parts = []
+    for node in PARAGRAPH_TEXT_NODES(paragraph):
+        if isinstance(node, str):
+            parts.append(node)
+        elif node.tag == WORD_NS + "br":
+            # Page and column breaks have no text
+            if node.get(WORD_NS + "type", "textWrapping") == "textWrapping":
+                parts.append("\n")
+        else:
+            parts.append(RUN_TEXT_CHARACTERS[node.tag])
+    return "".join(parts)
+
+
+def get_cell_text(cell):
+    """Text of a w:tc element: its paragraphs joined by newlines."""
+    return "\n".join(get_paragraph_text(p) for p in cell.iterchildren(WORD_NS + "p"))
+
+
+def get_table_rows(table):
+    """
+    Cell text of every row of a w:tbl element.
+
+    Like python-docx's row.cells, a cell spanning several grid columns is
+    repeated once per column, and a vertically merged continuation cell
+    repeats the text of the cell above it.
+
+    Returns:
+        list: One list of cell texts per row
+    """
+    if not TABLE_HAS_MERGES(table):
+        return [[get_cell_text(cell) for cell in row.iterchildren(WORD_NS + "tc")]
+                for row in table.iterchildren(WORD_NS + "tr")]
+
+    rows = []
+    texts_above = {}  # Grid column → cell text in the previous row
+    for row in table.iterchildren(WORD_NS + "tr"):
+        grid_before = row.find(f"{WORD_NS}trPr/{WORD_NS}gridBefore")
+        grid_offset = int(grid_before.get(WORD_NS + "val", 0)) if grid_before is not None else 0
+
+        cell_texts = []
+        texts_by_column = {}
+        for cell in row.iterchildren(WORD_NS + "tc"):
+            grid_span = cell.find(f"{WORD_NS}tcPr/{WORD_NS}gridSpan")
+            span = int(grid_span.get(WORD_NS + "val", 1)) if grid_span is not None else 1
+            v_merge = cell.find(f"{WORD_NS}tcPr/{WORD_NS}vMerge")
+
+            if v_merge is not None and v_merge.get(WORD_NS + "val", "continue") == "continue":
+                text = texts_above.get(grid_offset, "")
+            else:
+                text = get_cell_text(cell)
+
+            for column in range(grid_offset, grid_offset + span):
+                texts_by_column[column] = text
+            cell_texts.extend([text] * span)
+            grid_offset += span
+
+        rows.append(cell_texts)
+        texts_above = texts_by_column
+    return rows
+
+
+def iter_word_blocks(file_path, paragraphs=False):
+    """
+    Stream the tables and Heading 2/3 paragraphs of a .docx body.
+
+    word/document.xml is read with iterparse straight from the zip (lxml,
+    already required by python-docx), and each top-level block is discarded
+    once handled, so memory stays bounded by the largest single table rather
+    than the whole document.
+
+    The styles list is read first: when it defines no Heading 2/3 style, no
+    paragraph can be a heading, so (unless paragraphs=True) only tables are
+    handled and paragraphs are skipped unread.
+
+    Args:
+        file_path: Path to Word file
+        paragraphs: Also yield the other body paragraphs
+
+    Yields:
+        tuple: ("table", rows) with rows as lists of cell text,
+               ("heading", text) for a Heading 2/3 paragraph, or
+               ("paragraph", text) for any other paragraph (paragraphs=True)
+    """
+    with zipfile.ZipFile(file_path) as package:
+        document_path = read_part_relationships(package, "")[OFFICE_DOCUMENT_REL]
+        styles_path = read_part_relationships(package, document_path).get(STYLES_REL)
+        heading_styles, default_is_heading = load_heading_styles(package, styles_path)
+
+        block_tags = (WORD_NS + "tbl", WORD_NS + "p")
+        if not paragraphs and not default_is_heading and not any(heading_styles.values()):
+            block_tags = WORD_NS + "tbl"  # Tables are the only source of entities
+
+        with package.open(document_path) as document_xml:
+            for _, element in etree.iterparse(document_xml, tag=block_tags):
+                body = element.getparent()
+                if body is None or body.tag != WORD_NS + "body":
+                    continue  # Paragraph or table inside a table cell
+
+                if element.tag == WORD_NS + "tbl":
+                    yield "table", get_table_rows(element)
+                else:
+                    style = element.find(f"{WORD_NS}pPr/{WORD_NS}pStyle")
+                    is_heading = heading_styles.get(style.get(WORD_NS + "val")) if style is not None else None
+                    if is_heading is None:
+                        is_heading = default_is_heading
+                    if is_heading:
+                        yield "heading", get_paragraph_text(element)
+                    elif paragraphs:
+                        yield "paragraph", get_paragraph_text(element)
+
+                # Drop this block and everything before it
+                element.clear()
+                while element.getprevious() is not None:
+                    del body[0]
+
+
+def collect_word_drugs(tables, headings):
+    """
+    Drug/condition names from a Word guide's tables and headings.
+
+    Args:
+        tables: Iterable of tables, each a list of rows of cell text
+        headings: Iterable of Heading 2/3 paragraph texts
+
+    Returns:
+        list: Table entries first, then headings (document order within each)
+    """
+    drugs = []
+
+    # Extract from tables
+    for rows in tables:
+        if not rows:
+            continue
+
+        # Check first row for "Drug" or "Condition" column
+        drug_col_idx = None
+        for idx, cell_text in enumerate(rows[0]):
+            cell_text = cell_text.lower()
+            if "drug" in cell_text or "condition" in cell_text or "name" in cell_text:
+                drug_col_idx = idx
+                break
+
+        # Extract from that column
+        if drug_col_idx is not None:
+            for row in rows[1:]:  # Skip header
+                if drug_col_idx < len(row):
+                    cell_text = row[drug_col_idx].strip()
+                    # Remove (Brand Name) suffix if present
+                    cell_text = BRAND_SUFFIX_PATTERN.sub('', cell_text)
+                    if cell_text and len(cell_text) > 1:
+                        drugs.append(cell_text)
+
+    # Extract from headings (Level 2 and 3)
+    for heading_text in headings:
+        # Remove common prefixes
+        heading_text = HEADING_PREFIX_PATTERN.sub('', heading_text.strip())
+        if heading_text and len(heading_text) > 1 and len(heading_text) < 100:
+            drugs.append(heading_text)
+
+    return drugs
+
+
 def extract_drugs_from_word(file_path):
     """
     Extract drug/condition names from Word study guide.
     Looks for drug names in tables and headings.
 
+    Reads the .docx with the streaming OOXML reader (iter_word_blocks);
+    files it cannot handle fall back to python-docx.
+
     Args:
         file_path: Path to Word file
 
     Returns:
         list: Drug/condition names found
     """
-    drugs = []
+    tables = []
+    headings = []
     try:
-        doc = Document(file_path)
+        for block_kind, content in iter_word_blocks(file_path):
+            (tables if block_kind == "table" else headings).append(content)
+    except Exception:
+        return extract_drugs_from_word_document(file_path)
 
-        # Extract from tables
-        for table in doc.tables:
-            # Check first row for "Drug" or "Condition" column
-            header_row = table.rows[0]
-            drug_col_idx = None
+    return collect_word_drugs(tables, headings)
 
-            for idx, cell in enumerate(header_row.cells):
-                cell_text = cell.text.lower()
-                if "drug" in cell_text or "condition" in cell_text or "name" in cell_text:
-                    drug_col_idx = idx
-                    break
 
-            # Extract from that column
-            if drug_col_idx is not None:
-                for row in table.rows[1:]:  # Skip header
-                    if drug_col_idx < len(row.cells):
-                        cell_text = row.cells[drug_col_idx].text.strip()
-                        # Remove (Brand Name) suffix if present
-                        cell_text = re.sub(r'\s*\([^)]+\)\s*$', '', cell_text)
-                        if cell_text and len(cell_text) > 1:
-                            drugs.append(cell_text)
-
-        # Extract from headings (Level 2 and 3)
-        for para in doc.paragraphs:
-            if para.style.name in ['Heading 2', 'Heading 3']:
-                heading_text = para.text.strip()
-                # Remove common prefixes
-                heading_text = re.sub(r'^(Drug|Condition|Learning Objective \d+):\s*', '', heading_text)
-                if heading_text and len(heading_text) > 1 and len(heading_text) < 100:
-                    drugs.append(heading_text)
+def extract_drugs_from_word_document(file_path):
+    """
+    Extract drug/condition names from Word study guide via python-docx.
+
+    Builds the full Document object model; used when the streaming reader
+    cannot read a file, and as the baseline in Benchmark_Quick_Access_Extract.py.
 
+    Args:
+        file_path: Path to Word file
+
+    Returns:
+        list: Drug/condition names found
+    """
+    try:
+        doc = Document(file_path)
+        tables = [[[cell.text for cell in row.cells] for row in table.rows]
+                  for table in doc.tables]
+        headings = [para.text for para in doc.paragraphs
+                    if para.style.name in ['Heading 2', 'Heading 3']]
     except Exception as e:
         print(f"  ⚠️  Could not extract from {os.path.basename(file_path)}: {e}")
+        return []
+
+    return collect_word_drugs(tables, headings)
 
-    return drugs
 
+class EntityAutomaton:
+    """
+    Aho-Corasick automaton that finds every known entity name in a text in one pass.
+
+    Matching is case-insensitive and whole-word: a match must not continue
+    a word on either side ("ACE" is not found in "replace"). Run time is
+    linear in the text length however many names the vocabulary holds.
+
+    Example:
+        automaton = EntityAutomaton(["Tenofovir", "Tenofovir DF", "Abacavir"])
+        automaton.find_entities("Is tenofovir DF safe with abacavir?")
+        → ["Tenofovir", "Tenofovir DF", "Abacavir"]
+    """
 
-def extract_drugs_from_anki_csv(file_path):
+    def __init__(self, entities):
+        self.transitions = [{}]  # State → {character: next state}
+        self.fallbacks = [0]     # State → longest proper suffix state
+        self.matches = [()]      # State → ((name length, entity), ...) ending here
+
+        for entity in entities:
+            name = entity.casefold()
+            if not name.strip():
+                continue
+            state = 0
+            for char in name:
+                next_state = self.transitions[state].get(char)
+                if next_state is None:
+                    next_state = len(self.transitions)
+                    self.transitions[state][char] = next_state
+                    self.transitions.append({})
+                    self.fallbacks.append(0)
+                    self.matches.append(())
+                state = next_state
+            self.matches[state] += ((len(name), entity),)
+
+        # Breadth-first, so each fallback state is finished before it is used
+        queue = deque(self.transitions[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self.transitions[state].items():
+                queue.append(next_state)
+                fallback = self.fallbacks[state]
+                while fallback and char not in self.transitions[fallback]:
+                    fallback = self.fallbacks[fallback]
+                if state:
+                    self.fallbacks[next_state] = self.transitions[fallback].get(char, 0)
+                self.matches[next_state] += self.matches[self.fallbacks[next_state]]
+
+    def iter_entities(self, text):
+        """Yield every whole-word entity occurrence in text (repeats included)."""
+        text = text.casefold()
+        transitions, fallbacks, matches = self.transitions, self.fallbacks, self.matches
+
+        state = 0
+        end = 0
+        for char in text:
+            end += 1
+            next_state = transitions[state].get(char)
+            while next_state is None and state:
+                state = fallbacks[state]
+                next_state = transitions[state].get(char)
+            state = next_state or 0
+
+            if matches[state]:
+                for length, entity in matches[state]:
+                    start = end - length
+                    if ((start == 0 or not text[start - 1].isalnum() or not text[start].isalnum())
+                            and (end == len(text) or not text[end].isalnum()
+                                 or not text[end - 1].isalnum())):
+                        yield entity
+
+    def find_entities(self, text):
+        """Distinct entities occurring in text, in order of first appearance."""
+        return list(dict.fromkeys(self.iter_entities(text)))
+
+
+@lru_cache(maxsize=1)
+def get_entity_automaton(vocabulary):
+    """EntityAutomaton for a vocabulary tuple (built once per process)."""
+    return EntityAutomaton(vocabulary)
+
+
+def extract_drugs_from_anki_csv(file_path, vocabulary=()):
     """
     Extract drug names from Anki CSV file.
-    Looks for drug names in questions.
+    Looks for known entities in questions and answers.
+
+    The file is streamed with the csv module, so quoted fields spanning
+    several lines stay whole, and every field is scanned in one pass by
+    an EntityAutomaton of the vocabulary (the names extracted from the
+    Excel charts). Without a vocabulary, questions are matched against
+    ANKI_QUESTION_PATTERN instead.
 
     Args:
         file_path: Path to CSV file
+        vocabulary: Known entity names (tuple)
 
     Returns:
-        list: Drug names found
+        list: Drug names found, in order of first appearance
     """
-    drugs = set()
+    found = {}
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            for line in f:
-                # Look for patterns like "What is the mechanism of [Drug]?"
-                matches = re.findall(r'(?:mechanism|class|use|effect).*?(?:of|for)\s+([A-Z][a-z]+(?:[a-z]+)?)', line)
-                drugs.update(matches)
+        automaton = get_entity_automaton(tuple(vocabulary)) if vocabulary else None
+        with open(file_path, 'r', encoding='utf-8', newline='') as f:
+            for record in csv.reader(f):
+                for field in record:
+                    if automaton is not None:
+                        matches = automaton.iter_entities(field)
+                    else:
+                        # Look for patterns like "What is the mechanism of [Drug]?"
+                        matches = ANKI_QUESTION_PATTERN.findall(field)
+                    for match in matches:
+                        found.setdefault(match, None)
 
     except Exception as e:
         print(f"  ⚠️  Could not extract from {os.path.basename(file_path)}: {e}")
 
-    return list(drugs)
+    return list(found)
+
+
+# =============================================================================
+# EXTRACTION CACHE
+# =============================================================================
+
+CACHE_FILENAME = "QUICK_ACCESS.cache.json"
+
+# Bump when an extractor's output changes so cached entity lists are rebuilt
+EXTRACTOR_VERSION = 3
+
+
+def get_file_digest(path):
+    """SHA-1 of a file's bytes."""
+    hasher = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
 
+def load_extraction_cache(directory):
+    """
+    Load cached entity lists for a study guides directory.
+
+    Returns:
+        dict: {relative path: {'size', 'mtime_ns', 'sha1', 'entities'}}
+              (empty if missing, unreadable or from another extractor version)
+    """
+    cache_path = os.path.join(directory, CACHE_FILENAME)
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+    if cache.get("extractor_version") != EXTRACTOR_VERSION:
+        return {}
+    return cache.get("files", {})
+
+
+def save_extraction_cache(directory, file_entries):
+    """
+    Write the extraction cache (temporary file, then rename).
+
+    Args:
+        directory: Study guides directory
+        file_entries: dict {relative path: {'size', 'mtime_ns', 'sha1', 'entities'}}
+    """
+    cache_path = os.path.join(directory, CACHE_FILENAME)
+    tmp_path = cache_path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({"extractor_version": EXTRACTOR_VERSION, "files": file_entries},
+                  f, ensure_ascii=False, indent=1)
+    os.replace(tmp_path, cache_path)
+
+
+def get_vocabulary_digest(vocabulary):
+    """SHA-1 of an entity vocabulary (order-independent)."""
+    return hashlib.sha1("\n".join(sorted(vocabulary)).encode("utf-8")).hexdigest()
+
+
+def get_cached_entities(cache_entry, path, vocabulary_digest=None):
+    """
+    Return a file's cached entities if the file is unchanged, else None.
+
+    Unchanged means same size and either the same modification time or,
+    if only the time changed (e.g. copied or touched), the same SHA-1.
+    The entry's mtime is refreshed in that case so the next run skips
+    the hash. Flashcard entries also require the same vocabulary digest,
+    since their entities depend on the Excel vocabulary.
+    """
+    if cache_entry is None or cache_entry.get("vocabulary") != vocabulary_digest:
+        return None
+
+    stat = path.stat()
+    if cache_entry["size"] != stat.st_size:
+        return None
+    if cache_entry["mtime_ns"] != stat.st_mtime_ns:
+        if cache_entry["sha1"] != get_file_digest(path):
+            return None
+        cache_entry["mtime_ns"] = stat.st_mtime_ns
+    return cache_entry["entities"]
+
+
+def make_cache_entry(path, entities, vocabulary_digest=None):
+    """Build the cache entry for a freshly parsed file."""
+    stat = path.stat()
+    cache_entry = {
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "sha1": get_file_digest(path),
+        "entities": entities,
+    }
+    if vocabulary_digest is not None:
+        cache_entry["vocabulary"] = vocabulary_digest
+    return cache_entry
+
+
+# =============================================================================
+# DIRECTORY SCAN
+# =============================================================================
+
+# File kinds in processing order: (kind, glob pattern, progress icon)
+STUDY_FILE_KINDS = [
+    ("excel", "*.xlsx", "📊"),
+    ("word", "*.docx", "📝"),
+    ("csv", "*Flashcards.csv", "🃏"),
+]
+
+# Office writes "~$Name.xlsx" lock files next to open documents
+LOCK_FILE_PREFIX = "~$"
+
+
+def matches_any_pattern(relative_path, patterns):
+    """True if a glob pattern matches the relative path or its last component."""
+    name = posixpath.basename(relative_path)
+    return any(fnmatch.fnmatch(relative_path, pattern) or fnmatch.fnmatch(name, pattern)
+               for pattern in patterns)
+
+
+def find_study_files(directory, recursive=False, include=None, exclude=None):
+    """
+    List study guide files in a directory using os.scandir.
+
+    Patterns are shell globs matched against the path relative to directory
+    (with "/" separators) or against the bare name, so both "Archive" and
+    "Exam 1/*" work. Symlinked directories are not followed.
+
+    Args:
+        directory: Study guides directory
+        recursive: Also scan subdirectories
+        include: Glob patterns; if given, a file must match one of them
+        exclude: Glob patterns for files and directories to skip
+                 (an excluded directory is not descended into)
+
+    Returns:
+        list: (file_kind, relative path) in STUDY_FILE_KINDS order, sorted by
+              relative path within each kind
+    """
+    files_by_kind = {file_kind: [] for file_kind, _, _ in STUDY_FILE_KINDS}
+    pending_dirs = [""]
+    while pending_dirs:
+        relative_dir = pending_dirs.pop()
+        try:
+            with os.scandir(os.path.join(directory, relative_dir)) as entries:
+                entries = list(entries)
+        except OSError as e:
+            print(f"  ⚠️  Could not scan {relative_dir}: {e}")
+            continue
+
+        for entry in entries:
+            relative_path = posixpath.join(relative_dir, entry.name) if relative_dir else entry.name
+            if exclude and matches_any_pattern(relative_path, exclude):
+                continue
+
+            if entry.is_dir(follow_symlinks=False):
+                if recursive:
+                    pending_dirs.append(relative_path)
+                continue
+
+            if entry.name.startswith(LOCK_FILE_PREFIX) or not entry.is_file():
+                continue
+            if include and not matches_any_pattern(relative_path, include):
+                continue
+
+            for file_kind, pattern, _ in STUDY_FILE_KINDS:
+                if fnmatch.fnmatch(entry.name, pattern):
+                    files_by_kind[file_kind].append(relative_path)
+                    break
+
+    return [(file_kind, relative_path)
+            for file_kind, _, _ in STUDY_FILE_KINDS
+            for relative_path in sorted(files_by_kind[file_kind])]
 
-def scan_study_guides_directory(directory):
+
+def extract_entities_from_file(file_kind, file_path, vocabulary=()):
+    """
+    Run the extractor for one study guide file (process pool worker).
+
+    Args:
+        file_kind: "excel", "word" or "csv"
+        file_path: Path to file
+        vocabulary: Known entity names matched in flashcards (csv only)
+
+    Returns:
+        list: Entity names found
+    """
+    if file_kind == "csv":
+        return extract_drugs_from_anki_csv(file_path, vocabulary)
+
+    extractors = {
+        "excel": extract_drugs_from_excel,
+        "word": extract_drugs_from_word,
+    }
+    return extractors[file_kind](file_path)
+
+
+def scan_study_guides_directory(directory, workers=None, use_cache=True,
+                                recursive=False, include=None, exclude=None):
     """
     Scan directory for all study guide files and extract entities.
 
+    Files are found with find_study_files and identified by their path
+    relative to directory (just the file name at the top level).
+
+    Files are parsed in parallel worker processes, but results are merged
+    in a fixed order (Excel, Word, then CSV; by relative path within each),
+    so the map is the same whatever order the workers finish in. A file
+    that fails to parse is reported and skipped.
+
+    Flashcards are matched against the vocabulary of Excel entities (see
+    extract_drugs_from_anki_csv), so they are parsed once every Excel file
+    has been merged, while Word files may still be parsing.
+
+    Entity lists are cached in QUICK_ACCESS.cache.json (see
+    get_cached_entities): only new or changed files are parsed, and files
+    that no longer exist are dropped from the cache. Flashcard entries are
+    also reparsed when the Excel vocabulary changes.
+
     Args:
         directory: Path to directory containing study guides
+        workers: Number of worker processes (default: CPU count);
+                 1 parses in this process
+        use_cache: Reuse cached entity lists for unchanged files
+        recursive: Also scan subdirectories
+        include: Glob patterns a file must match (see find_study_files)
+        exclude: Glob patterns for files and directories to skip
 
     Returns:
-        dict: {entity_name: [list of files containing it]}
+        dict: {entity_name: [relative paths of files containing it]}
     """
     entity_files_map = {}
 
@@ -181,49 +845,110 @@ def scan_study_guides_directory(directory):
     print("")
 
     # Find all study guide files
-    excel_files = list(Path(directory).glob("*.xlsx"))
-    word_files = list(Path(directory).glob("*.docx"))
-    csv_files = list(Path(directory).glob("*Flashcards.csv"))
-
-    total_files = len(excel_files) + len(word_files) + len(csv_files)
-    print(f"Found {total_files} study guide files:")
-    print(f"  - Excel: {len(excel_files)}")
-    print(f"  - Word: {len(word_files)}")
-    print(f"  - Anki CSV: {len(csv_files)}")
+    study_files = find_study_files(directory, recursive=recursive,
+                                   include=include, exclude=exclude)
+    file_counts = {file_kind: 0 for file_kind, _, _ in STUDY_FILE_KINDS}
+    for file_kind, _ in study_files:
+        file_counts[file_kind] += 1
+
+    print(f"Found {len(study_files)} study guide files:")
+    print(f"  - Excel: {file_counts['excel']}")
+    print(f"  - Word: {file_counts['word']}")
+    print(f"  - Anki CSV: {file_counts['csv']}")
     print("")
 
-    # Process Excel files
-    for excel_file in excel_files:
-        print(f"📊 Processing: {excel_file.name}")
-        drugs = extract_drugs_from_excel(str(excel_file))
-        print(f"  ✓ Found {len(drugs)} entities")
-
-        for drug in drugs:
-            if drug not in entity_files_map:
-                entity_files_map[drug] = []
-            entity_files_map[drug].append(excel_file.name)
-
-    # Process Word files
-    for word_file in word_files:
-        print(f"📝 Processing: {word_file.name}")
-        drugs = extract_drugs_from_word(str(word_file))
-        print(f"  ✓ Found {len(drugs)} entities")
-
-        for drug in drugs:
-            if drug not in entity_files_map:
-                entity_files_map[drug] = []
-            entity_files_map[drug].append(word_file.name)
-
-    # Process CSV files
-    for csv_file in csv_files:
-        print(f"🃏 Processing: {csv_file.name}")
-        drugs = extract_drugs_from_anki_csv(str(csv_file))
-        print(f"  ✓ Found {len(drugs)} entities")
-
-        for drug in drugs:
-            if drug not in entity_files_map:
-                entity_files_map[drug] = []
-            entity_files_map[drug].append(csv_file.name)
+    cache = load_extraction_cache(directory) if use_cache else {}
+    cache_entries = {}
+    cached_entities = {}
+
+    def find_files_to_parse(files, vocabulary_digest=None):
+        """Take cache hits among files; return the files that must be parsed."""
+        to_parse = []
+        for file_kind, relative_path in files:
+            entities = get_cached_entities(cache.get(relative_path), Path(directory, relative_path),
+                                           vocabulary_digest)
+            if entities is None:
+                to_parse.append((file_kind, relative_path))
+            else:
+                cached_entities[relative_path] = entities
+                cache_entries[relative_path] = cache[relative_path]
+        return to_parse
+
+    flashcard_files = [(file_kind, relative_path) for file_kind, relative_path in study_files
+                       if file_kind == "csv"]
+    to_parse = find_files_to_parse([(file_kind, relative_path)
+                                    for file_kind, relative_path in study_files
+                                    if file_kind != "csv"])
+    print(f"♻️  {len(cached_entities)} files from cache, {len(to_parse)} to parse"
+          + (" (flashcards after Excel)" if flashcard_files else ""))
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = max(1, min(workers, len(to_parse) + len(flashcard_files)))
+
+    pending = {}
+    executor = None
+    if workers > 1:
+        print(f"⚙️  Parsing with {workers} workers")
+        executor = ProcessPoolExecutor(max_workers=workers)
+
+    def start_parsing(files, vocabulary=()):
+        """Submit files to the worker pool (no-op when parsing in this process)."""
+        if executor is not None:
+            for file_kind, relative_path in files:
+                pending[relative_path] = executor.submit(
+                    extract_entities_from_file, file_kind,
+                    os.path.join(directory, relative_path), vocabulary)
+
+    icons = {file_kind: icon for file_kind, _, icon in STUDY_FILE_KINDS}
+    vocabulary = None
+    vocabulary_digest = None
+    try:
+        start_parsing(to_parse)
+        for file_kind, relative_path in study_files:
+            if file_kind != "excel" and vocabulary is None:
+                # Every Excel file is merged: its entities are the flashcard vocabulary
+                vocabulary = tuple(entity_files_map)
+                vocabulary_digest = get_vocabulary_digest(vocabulary)
+                flashcards_to_parse = find_files_to_parse(flashcard_files, vocabulary_digest)
+                if flashcard_files:
+                    print(f"🔤 Flashcard vocabulary: {len(vocabulary)} Excel entities "
+                          f"({len(flashcard_files) - len(flashcards_to_parse)} flashcard files "
+                          f"from cache, {len(flashcards_to_parse)} to parse)")
+                start_parsing(flashcards_to_parse, vocabulary)
+
+            if relative_path in cached_entities:
+                drugs = cached_entities[relative_path]
+                print(f"{icons[file_kind]} Cached: {relative_path} ({len(drugs)} entities)")
+            else:
+                print(f"{icons[file_kind]} Processing: {relative_path}")
+                file_vocabulary = vocabulary if file_kind == "csv" else ()
+                try:
+                    if executor is not None:
+                        drugs = pending[relative_path].result()
+                    else:
+                        drugs = extract_entities_from_file(file_kind,
+                                                           os.path.join(directory, relative_path),
+                                                           file_vocabulary)
+                except Exception as e:
+                    # Extractors catch their own errors; this covers a crashed worker
+                    print(f"  ⚠️  Could not extract from {relative_path}: {e}")
+                    continue
+                print(f"  ✓ Found {len(drugs)} entities")
+                cache_entries[relative_path] = make_cache_entry(
+                    Path(directory, relative_path), drugs,
+                    vocabulary_digest if file_kind == "csv" else None)
+
+            for drug in drugs:
+                if drug not in entity_files_map:
+                    entity_files_map[drug] = []
+                entity_files_map[drug].append(relative_path)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    # Only files seen in this scan are kept, so deleted files drop out
+    save_extraction_cache(directory, cache_entries)
 
     print("")
     print(f"✓ Extracted {len(entity_files_map)} unique entities total")
@@ -232,91 +957,425 @@ def scan_study_guides_directory(directory):
     return entity_files_map
 
 
-def generate_quick_access_md(entity_files_map, output_path):
+# =============================================================================
+# OUTPUTS
+# =============================================================================
+
+SECTION_STATE_FILENAME = "QUICK_ACCESS.sections.json"
+
+# Bump when a rendered section format changes so every section is re-rendered
+OUTPUT_FORMAT_VERSION = 1
+
+# Most search results the HTML page lists at once
+HTML_SEARCH_LIMIT = 100
+
+HTML_STYLE = """
+body { font-family: -apple-system, "Segoe UI", Calibri, sans-serif; margin: 2em auto; max-width: 60em; color: #222; }
+h1 { color: #1F4E79; }
+h2 { border-bottom: 2px solid #1F4E79; color: #1F4E79; }
+#search { font-size: 1.2em; padding: 0.4em; width: 100%; box-sizing: border-box; }
+nav a { margin-right: 0.4em; }
+li { margin: 0.2em 0; }
+""".strip()
+
+HTML_SCRIPT = """
+const input = document.getElementById("search");
+const results = document.getElementById("results");
+const sections = document.getElementById("sections");
+
+function addResult(name, files) {
+  const item = document.createElement("li");
+  const label = document.createElement("b");
+  label.textContent = name;
+  item.append(label, " \\u2192 ");
+  files.forEach((file, index) => {
+    const link = document.createElement("a");
+    link.href = encodeURI(file);
+    link.textContent = file;
+    item.append(index ? ", " : "", link);
+  });
+  results.append(item);
+}
+
+input.addEventListener("input", () => {
+  const query = input.value.trim().toLowerCase();
+  results.replaceChildren();
+  results.hidden = !query;
+  sections.hidden = Boolean(query);
+  if (!query) return;
+
+  // Entries are sorted by key; buckets give each 2-letter prefix's range
+  const section = SECTIONS[query[0].toUpperCase()];
+  if (!section) return;
+  const range = query.length > 1 ? section.buckets[query.slice(0, 2)] : [0, section.entries.length];
+  if (!range) return;
+  for (let i = range[0]; i < range[1] && results.childElementCount < SEARCH_LIMIT; i++) {
+    const [key, name, files] = section.entries[i];
+    if (key.startsWith(query)) addResult(name, files);
+  }
+});
+""".strip()
+
+
+def group_entities_by_letter(entity_files_map):
+    """
+    Group entities into alphabetical letter sections.
+
+    Returns:
+        dict: {letter: [(entity, files), ...]} in alphabetical order
+    """
+    sections = {}
+    for entity in sorted(entity_files_map.keys(), key=str.lower):
+        sections.setdefault(entity[0].upper(), []).append((entity, entity_files_map[entity]))
+    return sections
+
+
+def render_section(letter, items):
+    """
+    Render one letter section in every output format.
+
+    Args:
+        letter: Section letter
+        items: [(entity, files), ...] in alphabetical order
+
+    Returns:
+        dict: {'md', 'json', 'html', 'js'} fragments
+    """
+    # Format: - **Entity** → file1.xlsx, file2.docx
+    md_lines = [f"## {letter}", ""]
+    md_lines.extend(f"- **{entity}** → {', '.join(files)}" for entity, files in items)
+
+    html_lines = [f'<section id="letter-{html.escape(letter, quote=True)}">',
+                  f"<h2>{html.escape(letter)}</h2>", "<ul>"]
+    for entity, files in items:
+        links = ", ".join(f'<a href="{html.escape(quote(file), quote=True)}">{html.escape(file)}</a>'
+                          for file in files)
+        html_lines.append(f"<li><b>{html.escape(entity)}</b> → {links}</li>")
+    html_lines.extend(["</ul>", "</section>"])
+
+    # Client-side prefix index: entries sorted by lowercase key, plus the
+    # [start, end) range of every 2-letter prefix
+    entries = sorted(([entity.lower(), entity, files] for entity, files in items),
+                     key=lambda entry: entry[0])
+    buckets = {}
+    for position, (key, _, _) in enumerate(entries):
+        bucket = buckets.setdefault(key[:2], [position, position])
+        bucket[1] = position + 1
+    search_data = json.dumps({"entries": entries, "buckets": buckets}, ensure_ascii=False,
+                             separators=(",", ":"))
+
+    return {
+        "md": "\n".join(md_lines),
+        "json": f"{json.dumps(letter, ensure_ascii=False)}: "
+                f"{json.dumps(dict(items), ensure_ascii=False)}",
+        "html": "\n".join(html_lines),
+        "js": f"{json.dumps(letter, ensure_ascii=False)}:{search_data}".replace("</", "<\\/"),
+    }
+
+
+def load_section_state(directory):
+    """
+    Load the rendered sections and output layouts of the previous run.
+
+    Returns:
+        tuple: ({letter: {'digest', 'md', 'json', 'html', 'js'}},
+                {output format: layout (see write_output_segments)})
+               (both empty if missing, unreadable or from another format version)
+    """
+    state_path = os.path.join(directory, SECTION_STATE_FILENAME)
+    try:
+        with open(state_path, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return {}, {}
+
+    if state.get("format_version") != OUTPUT_FORMAT_VERSION:
+        return {}, {}
+    return state.get("sections", {}), state.get("layouts", {})
+
+
+def write_text_atomic(path, text):
+    """Write a text file via a temporary file and rename."""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+
+def join_section_segments(sections, output_format, separator):
+    """Section segments of one output format: (letter, fragment), separator before all but the first."""
+    return [(f"section:{letter}", (separator if index else "") + section[output_format])
+            for index, (letter, section) in enumerate(sections.items())]
+
+
+def build_quick_access_md(sections, total_entities, updated):
+    """
+    Segments of QUICK_ACCESS.md.
+
+    Returns:
+        list: [(segment id, text)] that concatenate to the file
+    """
+    header = "\n".join([
+        "# Quick Access Index - Pharmacology Study Guides",
+        "",
+        "**Purpose:** Fast lookup of which study guide contains which drug/condition",
+        "",
+        "**Last Updated:** " + updated,
+        "",
+        "---",
+        "",
+        "",
+    ])
+    footer = "\n".join([
+        "",
+        "",
+        "---",
+        "",
+        "**Total Entities:** " + str(total_entities),
+        "",
+        "**How to use:**",
+        "1. Use Ctrl+F (Cmd+F on Mac) to search for drug/condition name",
+        "2. See which file(s) contain that entity",
+        "3. Open the file to access detailed information",
+        "",
+    ])
+    return ([("header", header)]
+            + join_section_segments(sections, "md", "\n\n")
+            + [("footer", footer)])
+
+
+def build_quick_access_json(sections, total_entities, updated):
+    """
+    Segments of QUICK_ACCESS.json ({'updated', 'total_entities', 'sections': {letter: {entity: files}}}).
+
+    Returns:
+        list: [(segment id, text)] that concatenate to the file
+    """
+    header = ("{\n"
+              f'"updated": {json.dumps(updated)},\n'
+              f'"total_entities": {total_entities},\n'
+              '"sections": {\n')
+    return ([("header", header)]
+            + join_section_segments(sections, "json", ",\n")
+            + [("footer", "\n}\n}\n")])
+
+
+def build_quick_access_html(sections, total_entities, updated):
+    """
+    Segments of the self-contained QUICK_ACCESS.html search page.
+
+    Returns:
+        list: [(segment id, text)] that concatenate to the file
+    """
+    letter_links = " ".join(f'<a href="#letter-{html.escape(letter, quote=True)}">{html.escape(letter)}</a>'
+                            for letter in sections)
+    header = "\n".join([
+        "<!DOCTYPE html>",
+        '<html lang="en">',
+        "<head>",
+        '<meta charset="utf-8">',
+        "<title>Quick Access Index</title>",
+        f"<style>\n{HTML_STYLE}\n</style>",
+        "</head>",
+        "<body>",
+        "<h1>Quick Access Index - Pharmacology Study Guides</h1>",
+        f"<p>Last Updated: {html.escape(updated)} · {total_entities} entities</p>",
+        '<input id="search" type="search" placeholder="Type a drug or condition…" autofocus>',
+        '<ul id="results" hidden></ul>',
+        f"<nav>{letter_links}</nav>",
+        '<div id="sections">',
+        "",
+    ])
+    script_start = "\n".join([
+        "",
+        "</div>",
+        "<script>",
+        f"const SEARCH_LIMIT = {HTML_SEARCH_LIMIT};",
+        "const SECTIONS = {",
+    ])
+    footer = "\n".join([
+        "};",
+        HTML_SCRIPT,
+        "</script>",
+        "</body>",
+        "</html>",
+        "",
+    ])
+    return ([("header", header)]
+            + join_section_segments(sections, "html", "\n")
+            + [("script", script_start)]
+            + [(f"data:{segment_id}", text)
+               for segment_id, text in join_section_segments(sections, "js", ",\n")]
+            + [("footer", footer)])
+
+
+def write_output_segments(path, segments, previous_layout):
+    """
+    Write an output file made of segments, patching the previous file in place.
+
+    The previous run's layout (digest and byte length of every segment)
+    locates each segment in the existing file. Unchanged segments are not
+    touched, and a changed segment of the same byte length (e.g. the
+    fixed-width "Last Updated" header) is overwritten where it is. Once a
+    segment's length differs, everything after it has shifted, so the file
+    is rewritten from that point on. Without a layout matching the file on
+    disk (first run, or the file was edited), it is written in full.
+
+    Args:
+        path: Output file path
+        segments: [(segment id, text)] that concatenate to the file
+        previous_layout: Layout returned for this file by the previous run, or None
+
+    Returns:
+        tuple: (layout {'mtime_ns', 'segments': [[id, digest, bytes], ...]},
+                bytes written)
+    """
+    encoded = [(segment_id, text.encode("utf-8")) for segment_id, text in segments]
+    layout_segments = [[segment_id, hashlib.sha1(data).hexdigest(), len(data)]
+                       for segment_id, data in encoded]
+
+    previous_segments = (previous_layout or {}).get("segments")
+    try:
+        stat = os.stat(path)
+        layout_matches = (previous_segments is not None
+                          and stat.st_mtime_ns == previous_layout.get("mtime_ns")
+                          and stat.st_size == sum(length for _, _, length in previous_segments))
+    except OSError:
+        layout_matches = False
+
+    if not layout_matches:
+        content = b"".join(data for _, data in encoded)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+        written = len(content)
+    else:
+        written = 0
+        offset = 0
+        with open(path, 'r+b') as f:
+            for index, (_, data) in enumerate(encoded):
+                previous = previous_segments[index] if index < len(previous_segments) else None
+                if previous is not None and previous[1:] == layout_segments[index][1:]:
+                    offset += len(data)  # Unchanged
+                elif previous is not None and previous[2] == len(data):
+                    f.seek(offset)  # Same length: overwrite in place
+                    f.write(data)
+                    written += len(data)
+                    offset += len(data)
+                else:
+                    # Everything from here on has moved: rewrite the rest
+                    tail = b"".join(data for _, data in encoded[index:])
+                    f.seek(offset)
+                    f.write(tail)
+                    f.truncate()
+                    written += len(tail)
+                    break
+            else:
+                f.truncate(offset)
+
+    return {"mtime_ns": os.stat(path).st_mtime_ns, "segments": layout_segments}, written
+
+
+def generate_quick_access_outputs(entity_files_map, directory):
     """
-    Generate QUICK_ACCESS.md file with alphabetical index.
+    Write QUICK_ACCESS.md, QUICK_ACCESS.json and QUICK_ACCESS.html.
+
+    Each letter section is rendered once and kept in QUICK_ACCESS.sections.json
+    with a digest of its entities; later runs re-render only the sections
+    whose entities or files changed and reuse the rest as they are. If no
+    section changed, the existing outputs are left untouched.
+
+    The outputs are patched rather than rewritten (see
+    write_output_segments): letter sections before the first changed one
+    are left alone on disk, and a change that keeps a section's byte length
+    rewrites only that section (plus the header's timestamp).
 
     Args:
         entity_files_map: dict {entity_name: [files]}
-        output_path: Path to save QUICK_ACCESS.md
+        directory: Study guides directory (outputs are written there)
 
     Returns:
-        str: Path to created file
-    """
-    print(f"📝 Generating QUICK_ACCESS.md...")
-
-    # Sort entities alphabetically
-    sorted_entities = sorted(entity_files_map.keys(), key=str.lower)
-
-    # Build markdown content
-    lines = []
-    lines.append("# Quick Access Index - Pharmacology Study Guides")
-    lines.append("")
-    lines.append("**Purpose:** Fast lookup of which study guide contains which drug/condition")
-    lines.append("")
-    lines.append("**Last Updated:** " + __import__('datetime').datetime.now().strftime("%Y-%m-%d %H:%M"))
-    lines.append("")
-    lines.append("---")
-    lines.append("")
-
-    # Group by first letter
-    current_letter = None
-    for entity in sorted_entities:
-        first_letter = entity[0].upper()
-
-        # Add letter section header
-        if first_letter != current_letter:
-            if current_letter is not None:
-                lines.append("")  # Blank line before new section
-
-            lines.append(f"## {first_letter}")
-            lines.append("")
-            current_letter = first_letter
-
-        # Add entity entry
-        files = entity_files_map[entity]
-
-        # Format: - **Entity** → file1.xlsx, file2.docx
-        if len(files) == 1:
-            lines.append(f"- **{entity}** → {files[0]}")
+        tuple: ({'md', 'json', 'html'} output paths, whether they were rewritten)
+    """
+    print("📝 Generating QUICK_ACCESS outputs...")
+
+    output_paths = {output_format: os.path.join(directory, f"QUICK_ACCESS.{output_format}")
+                    for output_format in ("md", "json", "html")}
+    builders = {
+        "md": build_quick_access_md,
+        "json": build_quick_access_json,
+        "html": build_quick_access_html,
+    }
+
+    previous_sections, previous_layouts = load_section_state(directory)
+    sections = {}
+    rerendered = 0
+    for letter, items in group_entities_by_letter(entity_files_map).items():
+        digest = hashlib.sha1(json.dumps(items, ensure_ascii=False).encode("utf-8")).hexdigest()
+        previous = previous_sections.get(letter)
+        if previous is not None and previous["digest"] == digest:
+            sections[letter] = previous
         else:
-            file_list = ", ".join(files)
-            lines.append(f"- **{entity}** → {file_list}")
-
-    # Footer
-    lines.append("")
-    lines.append("---")
-    lines.append("")
-    lines.append("**Total Entities:** " + str(len(entity_files_map)))
-    lines.append("")
-    lines.append("**How to use:**")
-    lines.append("1. Use Ctrl+F (Cmd+F on Mac) to search for drug/condition name")
-    lines.append("2. See which file(s) contain that entity")
-    lines.append("3. Open the file to access detailed information")
-    lines.append("")
-
-    # Write to file
-    with open(output_path, 'w', encoding='utf-8') as f:
-        f.write('\n'.join(lines))
-
-    print(f"✓ Created: {output_path}")
-    print(f"  - {len(entity_files_map)} entities indexed")
-    print(f"  - {len([l for l in lines if l.startswith('##')])} letter sections")
+            sections[letter] = {"digest": digest, **render_section(letter, items)}
+            rerendered += 1
+
+    unchanged = (rerendered == 0 and set(sections) == set(previous_sections)
+                 and all(os.path.exists(path) for path in output_paths.values()))
+    if unchanged:
+        print(f"✓ No changes: {len(sections)} letter sections, outputs left as they are")
+        print("")
+        return output_paths, False
+
+    updated = __import__('datetime').datetime.now().strftime("%Y-%m-%d %H:%M")
+    total_entities = len(entity_files_map)
+
+    # Layouts are only valid once every patch is done; drop the old state
+    # first so an interrupted run falls back to full rewrites
+    state_path = os.path.join(directory, SECTION_STATE_FILENAME)
+    if os.path.exists(state_path):
+        os.remove(state_path)
+
+    layouts = {}
+    for output_format, path in output_paths.items():
+        segments = builders[output_format](sections, total_entities, updated)
+        layouts[output_format], written = write_output_segments(
+            path, segments, previous_layouts.get(output_format))
+        total_bytes = sum(length for _, _, length in layouts[output_format]["segments"])
+        print(f"✓ Updated: {path} ({written:,} of {total_bytes:,} bytes written)")
+
+    write_text_atomic(state_path, json.dumps({"format_version": OUTPUT_FORMAT_VERSION,
+                                              "sections": sections, "layouts": layouts},
+                                             ensure_ascii=False))
+
+    print(f"  - {total_entities} entities indexed")
+    print(f"  - {len(sections)} letter sections ({rerendered} re-rendered)")
     print("")
 
-    return output_path
+    return output_paths, True
 
 
 def main():
     """Main entry point for script."""
-    if len(sys.argv) != 2:
-        print("Usage: python Generate_Quick_Access_Index.py <study_guides_directory>")
-        print("")
-        print("Example:")
-        print('  python Generate_Quick_Access_Index.py "Pharmacology/Exam 3/Claude Study Tools/"')
-        sys.exit(1)
-
-    directory = sys.argv[1]
+    parser = argparse.ArgumentParser(
+        description="Create an alphabetical QUICK_ACCESS.md index of study guide entities.",
+        epilog='Example: python Generate_Quick_Access_Index.py '
+               '"Pharmacology/Exam 3/Claude Study Tools/"'
+    )
+    parser.add_argument("study_guides_directory", help="Directory containing study guides")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Processes used to parse files (default: CPU count)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Reparse every file instead of reusing cached results")
+    parser.add_argument("--recursive", "-r", action="store_true",
+                        help="Also scan subdirectories")
+    parser.add_argument("--include", action="append", default=[], metavar="PATTERN",
+                        help="Only index files matching this glob (relative path or name); repeatable")
+    parser.add_argument("--exclude", action="append", default=[], metavar="PATTERN",
+                        help="Skip files and directories matching this glob; repeatable")
+    args = parser.parse_args()
+
+    directory = args.study_guides_directory
 
     if not os.path.exists(directory):
         print(f"❌ ERROR: Directory not found: {directory}")
@@ -332,21 +1391,34 @@ def main():
     print("")
 
     # Scan directory and extract entities
-    entity_files_map = scan_study_guides_directory(directory)
+    entity_files_map = scan_study_guides_directory(directory, workers=args.workers,
+                                                   use_cache=not args.no_cache,
+                                                   recursive=args.recursive,
+                                                   include=args.include, exclude=args.exclude)
 
     if not entity_files_map:
         print("⚠️  WARNING: No entities found in study guides")
         print("   Make sure directory contains .xlsx, .docx, or .csv files")
+        if not args.recursive:
+            print("   (use --recursive to include subdirectories)")
         sys.exit(1)
 
-    # Generate QUICK_ACCESS.md
-    output_path = os.path.join(directory, "QUICK_ACCESS.md")
-    generate_quick_access_md(entity_files_map, output_path)
+    # Generate QUICK_ACCESS.md, .json and .html
+    output_paths, rewritten = generate_quick_access_outputs(entity_files_map, directory)
+
+    # Trigram index for typo-tolerant lookups
+    fuzzy_index_path = get_fuzzy_index_path(directory)
+    if rewritten or not os.path.exists(fuzzy_index_path):
+        entity_count = build_fuzzy_index(entity_files_map, fuzzy_index_path)
+        print(f"🔤 Fuzzy lookup index: {entity_count} entities")
+        print("")
 
     print("═══════════════════════════════════════")
     print("  INDEX GENERATION COMPLETE")
     print("═══════════════════════════════════════")
-    print(f"Output: {output_path}")
+    print(f"Output: {output_paths['md']}")
+    print(f"        {output_paths['json']}")
+    print(f"        {output_paths['html']} (open in a browser to search)")
     print("")
     print("✅ QUICK_ACCESS.md created successfully!")
     print("   Use Ctrl+F to quickly find any drug/condition")
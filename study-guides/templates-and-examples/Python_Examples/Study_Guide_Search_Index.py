@@ -0,0 +1,373 @@
+#!/usr/bin/env python3
+"""
+STUDY GUIDE SEARCH INDEX
+Full-text search over every cell and paragraph of the study guides
+
+QUICK_ACCESS.md maps entity names to files; this finds any text, e.g.
+"HLA-B*5701" or "Fanconi", without opening the guides. A SQLite FTS5
+database next to QUICK_ACCESS.md stores one passage per:
+- Excel row (cells joined with " | "): sheet name and row number
+- Word paragraph or table row: section (last Heading 2/3) and table row
+- Flashcard CSV record: record number
+
+Files are found and read with the helpers in Generate_Quick_Access_Index.py
+(same file kinds, recursion and include/exclude patterns). Every search
+first brings the index up to date: only files whose size and modification
+time (or, failing that, SHA-1) changed are re-read, and deleted files are
+dropped, so searches stay in milliseconds once the index is built.
+
+Query syntax: words must all appear (any order); each word is matched as
+a phrase, so punctuation inside it is kept in order ("HLA-B*5701").
+End a word with * for a prefix match ("cephalo*").
+
+Usage:
+    python Study_Guide_Search_Index.py <study_guides_directory> [query]
+                                       [--limit N] [--no-update]
+                                       [--recursive] [--include PATTERN] [--exclude PATTERN]
+
+Example:
+    python Study_Guide_Search_Index.py "Pharmacology/Exam 3/Claude Study Tools/" "HLA-B*5701"
+    python Study_Guide_Search_Index.py "Pharmacology/" "fanconi" --recursive
+"""
+
+import argparse
+import csv
+import os
+import sqlite3
+import sys
+import time
+from openpyxl import load_workbook
+
+from Generate_Quick_Access_Index import find_study_files, get_file_digest, iter_word_blocks
+
+INDEX_FILENAME = "QUICK_ACCESS.search.sqlite"
+
+SCHEMA_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    sha1 TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS passages (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL,
+    location TEXT NOT NULL,
+    row INTEGER
+);
+CREATE INDEX IF NOT EXISTS passages_by_path ON passages (path);
+CREATE VIRTUAL TABLE IF NOT EXISTS passage_text USING fts5(
+    text, tokenize = 'unicode61 remove_diacritics 2'
+);
+"""
+
+# Passages inserted per executemany batch while indexing a file
+INSERT_BATCH_SIZE = 1000
+
+
+# =============================================================================
+# PASSAGE EXTRACTION
+# =============================================================================
+
+def iter_excel_passages(file_path):
+    """Yield (sheet name, row number, row text) for every non-empty worksheet row."""
+    wb = load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        for sheet in wb.worksheets:
+            for row_idx, row in enumerate(sheet.iter_rows(values_only=True), start=1):
+                cells = [str(value).strip() for value in row if value is not None]
+                text = " | ".join(cell for cell in cells if cell)
+                if text:
+                    yield sheet.title, row_idx, text
+    finally:
+        wb.close()
+
+
+def iter_word_passages(file_path):
+    """
+    Yield (section, table row number, text) for every paragraph and table row.
+
+    The section is the text of the last Heading 2/3 ("" before the first);
+    the row number is None for paragraphs.
+    """
+    section = ""
+    for block_kind, content in iter_word_blocks(file_path, paragraphs=True):
+        if block_kind == "table":
+            for row_idx, cells in enumerate(content, start=1):
+                # Merged cells repeat their text once per grid column
+                unique_cells = list(dict.fromkeys(cell.strip() for cell in cells))
+                text = " | ".join(cell for cell in unique_cells if cell)
+                if text:
+                    yield section, row_idx, text
+            continue
+
+        text = content.strip()
+        if block_kind == "heading":
+            section = text
+        if text:
+            yield section, None, text
+
+
+def iter_csv_passages(file_path):
+    """Yield ("", record number, record text) for every non-empty CSV record."""
+    with open(file_path, 'r', encoding='utf-8', newline='') as f:
+        for record_idx, record in enumerate(csv.reader(f), start=1):
+            text = " | ".join(field.strip() for field in record if field.strip())
+            if text:
+                yield "", record_idx, text
+
+
+PASSAGE_READERS = {
+    "excel": iter_excel_passages,
+    "word": iter_word_passages,
+    "csv": iter_csv_passages,
+}
+
+
+# =============================================================================
+# INDEX MAINTENANCE
+# =============================================================================
+
+def get_index_path(directory):
+    """Search index path for a study guides directory."""
+    return os.path.join(directory, INDEX_FILENAME)
+
+
+def open_search_index(index_path):
+    """Open (creating if needed) the search database; an outdated schema is rebuilt."""
+    conn = sqlite3.connect(index_path)
+    if conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+        conn.executescript("DROP TABLE IF EXISTS files; DROP TABLE IF EXISTS passages; "
+                           "DROP TABLE IF EXISTS passage_text;")
+        conn.executescript(SCHEMA)
+        conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        conn.commit()
+    return conn
+
+
+def delete_file_passages(conn, relative_path):
+    """Remove a file's passages from both the metadata and full-text tables."""
+    conn.execute("DELETE FROM passage_text WHERE rowid IN "
+                 "(SELECT id FROM passages WHERE path = ?)", (relative_path,))
+    conn.execute("DELETE FROM passages WHERE path = ?", (relative_path,))
+
+
+def index_file_passages(conn, file_kind, relative_path, file_path):
+    """
+    Insert a file's passages (its old passages must already be deleted).
+
+    Returns:
+        int: Number of passages indexed (0 if the file could not be read)
+    """
+    next_id = conn.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM passages").fetchone()[0]
+    passage_count = 0
+    batch = []
+
+    def flush():
+        conn.executemany("INSERT INTO passages (id, path, location, row) VALUES (?, ?, ?, ?)",
+                         [(passage_id, relative_path, location, row)
+                          for passage_id, location, row, _ in batch])
+        conn.executemany("INSERT INTO passage_text (rowid, text) VALUES (?, ?)",
+                         [(passage_id, text) for passage_id, _, _, text in batch])
+        batch.clear()
+
+    try:
+        for location, row, text in PASSAGE_READERS[file_kind](file_path):
+            batch.append((next_id + passage_count, location, row, text))
+            passage_count += 1
+            if len(batch) >= INSERT_BATCH_SIZE:
+                flush()
+    except Exception as e:
+        print(f"  ⚠️  Could not index {relative_path}: {e}")
+    flush()
+
+    return passage_count
+
+
+def update_search_index(directory, recursive=False, include=None, exclude=None, verbose=True):
+    """
+    Bring the search index in line with the study guides, re-reading changed files only.
+
+    A file is unchanged if its size and modification time match the index,
+    or if only the time changed and its SHA-1 still matches. Indexed files
+    no longer found by the scan are removed.
+
+    Args:
+        directory: Study guides directory
+        recursive: Also scan subdirectories
+        include: Glob patterns a file must match (see find_study_files)
+        exclude: Glob patterns for files and directories to skip
+        verbose: Print a line per re-indexed file
+
+    Returns:
+        dict: {'files', 'indexed', 'removed', 'passages'}
+    """
+    study_files = find_study_files(directory, recursive=recursive,
+                                   include=include, exclude=exclude)
+
+    conn = open_search_index(get_index_path(directory))
+    try:
+        with conn:
+            indexed_files = {path: (size, mtime_ns, sha1) for path, size, mtime_ns, sha1
+                             in conn.execute("SELECT path, size, mtime_ns, sha1 FROM files")}
+
+            indexed = 0
+            for file_kind, relative_path in study_files:
+                file_path = os.path.join(directory, relative_path)
+                stat = os.stat(file_path)
+                previous = indexed_files.pop(relative_path, None)
+
+                digest = None
+                if previous is not None and previous[0] == stat.st_size:
+                    if previous[1] == stat.st_mtime_ns:
+                        continue
+                    digest = get_file_digest(file_path)
+                    if previous[2] == digest:
+                        conn.execute("UPDATE files SET mtime_ns = ? WHERE path = ?",
+                                     (stat.st_mtime_ns, relative_path))
+                        continue
+
+                delete_file_passages(conn, relative_path)
+                passage_count = index_file_passages(conn, file_kind, relative_path, file_path)
+                conn.execute("INSERT OR REPLACE INTO files (path, size, mtime_ns, sha1) "
+                             "VALUES (?, ?, ?, ?)",
+                             (relative_path, stat.st_size, stat.st_mtime_ns,
+                              digest or get_file_digest(file_path)))
+                indexed += 1
+                if verbose:
+                    print(f"🔎 Indexed: {relative_path} ({passage_count} passages)")
+
+            # Whatever is left was deleted or is now outside the scan
+            for relative_path in indexed_files:
+                delete_file_passages(conn, relative_path)
+                conn.execute("DELETE FROM files WHERE path = ?", (relative_path,))
+
+            passage_total = conn.execute("SELECT COUNT(*) FROM passages").fetchone()[0]
+    finally:
+        conn.close()
+
+    return {
+        "files": len(study_files),
+        "indexed": indexed,
+        "removed": len(indexed_files),
+        "passages": passage_total,
+    }
+
+
+# =============================================================================
+# SEARCH
+# =============================================================================
+
+def build_match_query(query):
+    """
+    Turn user input into an FTS5 MATCH expression.
+
+    Example: 'HLA-B*5701 abaca*' → '"HLA-B*5701" "abaca"*'
+    """
+    terms = []
+    for word in query.split():
+        prefix = word.endswith("*") and len(word) > 1
+        word = word[:-1] if prefix else word
+        terms.append('"' + word.replace('"', '""') + '"' + ("*" if prefix else ""))
+    return " ".join(terms)
+
+
+def search_study_guides(directory, query, limit=20):
+    """
+    Find the passages best matching a query (BM25 ranking).
+
+    Args:
+        directory: Study guides directory
+        query: Search words (see module docstring for syntax)
+        limit: Maximum number of hits
+
+    Returns:
+        list: [{'path', 'location', 'row', 'snippet'}] best match first,
+              or {'error': message} if there is no index or the query is empty
+    """
+    index_path = get_index_path(directory)
+    if not os.path.exists(index_path):
+        return {"error": f"No search index in {directory}"}
+
+    match_query = build_match_query(query)
+    if not match_query:
+        return {"error": "Empty query"}
+
+    conn = sqlite3.connect(index_path)
+    try:
+        rows = conn.execute(
+            "SELECT passages.path, passages.location, passages.row, "
+            "snippet(passage_text, 0, '[', ']', '…', 12) "
+            "FROM passage_text JOIN passages ON passages.id = passage_text.rowid "
+            "WHERE passage_text MATCH ? ORDER BY passage_text.rank LIMIT ?",
+            (match_query, limit))
+        return [{"path": path, "location": location, "row": row, "snippet": snippet}
+                for path, location, row, snippet in rows]
+    finally:
+        conn.close()
+
+
+def main():
+    """Main entry point for script."""
+    parser = argparse.ArgumentParser(
+        description="Full-text search over every cell and paragraph of the study guides.",
+        epilog='Example: python Study_Guide_Search_Index.py '
+               '"Pharmacology/Exam 3/Claude Study Tools/" "HLA-B*5701"'
+    )
+    parser.add_argument("study_guides_directory", help="Directory containing study guides")
+    parser.add_argument("query", nargs="?",
+                        help="Words to find (omit to only update the index)")
+    parser.add_argument("--limit", type=int, default=20, help="Maximum hits (default: 20)")
+    parser.add_argument("--no-update", action="store_true",
+                        help="Search the index as it is, without checking for changed files")
+    parser.add_argument("--recursive", "-r", action="store_true",
+                        help="Also scan subdirectories")
+    parser.add_argument("--include", action="append", default=[], metavar="PATTERN",
+                        help="Only index files matching this glob (relative path or name); repeatable")
+    parser.add_argument("--exclude", action="append", default=[], metavar="PATTERN",
+                        help="Skip files and directories matching this glob; repeatable")
+    args = parser.parse_args()
+
+    directory = args.study_guides_directory
+    if not os.path.isdir(directory):
+        print(f"❌ ERROR: Directory not found: {directory}")
+        sys.exit(1)
+
+    if not args.no_update:
+        start_time = time.perf_counter()
+        stats = update_search_index(directory, recursive=args.recursive,
+                                    include=args.include, exclude=args.exclude)
+        elapsed_ms = (time.perf_counter() - start_time) * 1000
+        if stats["indexed"] or stats["removed"] or not args.query:
+            print(f"✓ Index: {stats['files']} files, {stats['passages']} passages "
+                  f"({stats['indexed']} re-indexed, {stats['removed']} removed, {elapsed_ms:.0f} ms)")
+            print("")
+
+    if not args.query:
+        return
+
+    start_time = time.perf_counter()
+    result = search_study_guides(directory, args.query, limit=args.limit)
+    elapsed_ms = (time.perf_counter() - start_time) * 1000
+
+    if isinstance(result, dict):
+        print(f"❌ ERROR: {result['error']}")
+        sys.exit(1)
+
+    if not result:
+        print(f"No matches for '{args.query}' ({elapsed_ms:.1f} ms)")
+        sys.exit(1)
+
+    for hit in result:
+        place = hit["location"]
+        if hit["row"]:
+            place = f"{place} › row {hit['row']}" if place else f"row {hit['row']}"
+        print(f"{hit['path']}  ({place})" if place else hit["path"])
+        print(f"    {hit['snippet']}")
+    print(f"\n{len(result)} hit(s) in {elapsed_ms:.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,476 @@
+#!/usr/bin/env python3
+"""
+TESTS - ANKICONNECT CLIENTS IN Anki_APKG_Example.py
+
+Runs the AnkiConnect helpers against a local fake AnkiConnect server
+(http.server speaking HTTP/1.1 keep-alive), so no Anki install is needed.
+
+Usage:
+    python Test_Anki_Connect.py
+    python -m pytest -q Test_Anki_Connect.py
+"""
+
+import asyncio
+import contextlib
+import csv
+import io
+import json
+import os
+import socket
+import tempfile
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import Anki_APKG_Example as anki
+
+
+# =============================================================================
+# FAKE ANKICONNECT SERVER
+# =============================================================================
+
+class FakeAnkiConnect:
+    """
+    Minimal AnkiConnect stand-in that records every request it receives.
+
+    Actions are answered by `handle(action, params)`, which returns the
+    result or raises ValueError to report an AnkiConnect error. "multi"
+    runs each inner action through it, like AnkiConnect does.
+
+    Attributes:
+        requests: Top-level actions received, in order
+        multi_actions: Inner actions of each "multi" request
+        connections: TCP connections accepted
+        max_in_flight: Most requests being answered at the same time
+    """
+
+    def __init__(self, handle=None, port=0):
+        self.handle = handle or (lambda action, params: True)
+        self.requests = []
+        self.multi_actions = []
+        self.connections = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+        self.server = ThreadingHTTPServer(("127.0.0.1", port), self.make_handler())
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_port}"
+        self.thread = threading.Thread(target=self.server.serve_forever,
+                                       kwargs={"poll_interval": 0.05}, daemon=True)
+
+    def make_handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self):
+                super().setup()
+                with fake.lock:
+                    fake.connections += 1
+
+            def do_POST(self):
+                request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                body = json.dumps(fake.respond(request)).encode("utf-8")
+                try:
+                    self.send_response(200)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                except (BrokenPipeError, ConnectionResetError):
+                    self.close_connection = True  # Client gave up (timeout)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def run_action(self, action, params):
+        """AnkiConnect response object for one action."""
+        try:
+            return {"result": self.handle(action, params), "error": None}
+        except ValueError as e:
+            return {"result": None, "error": str(e)}
+
+    def respond(self, request):
+        action = request["action"]
+        params = request.get("params", {})
+        with self.lock:
+            self.requests.append(action)
+            if action == "multi":
+                self.multi_actions.append([inner["action"] for inner in params["actions"]])
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            if action == "multi":
+                return {"result": [self.run_action(inner["action"], inner.get("params", {}))
+                                   for inner in params["actions"]],
+                        "error": None}
+            return self.run_action(action, params)
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def get_free_port():
+    """A local port with nothing listening on it (connections are refused)."""
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        return probe.getsockname()[1]
+
+
+def quietly(func, *args, **kwargs):
+    """Call func with its progress output suppressed."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return func(*args, **kwargs)
+
+
+# =============================================================================
+# SYNCHRONOUS CLIENT
+# =============================================================================
+
+class TestAnkiConnectSession(unittest.TestCase):
+
+    def setUp(self):
+        # Each test talks to its own server on a fresh session
+        anki.get_ankiconnect_session.cache_clear()
+        self.addCleanup(anki.get_ankiconnect_session.cache_clear)
+        self.default_url = anki.ANKICONNECT_URL
+        self.addCleanup(setattr, anki, "ANKICONNECT_URL", self.default_url)
+
+    def start_fake(self, handle=None):
+        fake = FakeAnkiConnect(handle).__enter__()
+        self.addCleanup(fake.__exit__, None, None, None)
+        anki.ANKICONNECT_URL = fake.url
+        return fake
+
+    def test_batch_import_sends_one_multi_request(self):
+        fake = self.start_fake()
+        paths = [f"deck{i}.apkg" for i in range(5)]
+
+        results = quietly(anki.batch_import_to_anki, paths)
+
+        self.assertEqual(fake.requests, ["multi"])
+        self.assertEqual(fake.multi_actions, [["importPackage"] * len(paths)])
+        self.assertEqual(results, {"success": paths, "failed": []})
+
+    def test_action_error_fails_only_that_deck(self):
+        def handle(action, params):
+            if "broken" in params["path"]:
+                raise ValueError("file not found")
+            return True
+
+        self.start_fake(handle)
+        paths = ["a.apkg", "broken.apkg", "c.apkg"]
+
+        results = quietly(anki.batch_import_to_anki, paths)
+
+        self.assertEqual(results["success"], ["a.apkg", "c.apkg"])
+        self.assertEqual(results["failed"], [("broken.apkg", "file not found")])
+
+    def test_calls_reuse_one_connection(self):
+        fake = self.start_fake(lambda action, params: 6)
+
+        for _ in range(5):
+            self.assertEqual(anki.invoke_ankiconnect("version"), 6)
+
+        self.assertEqual(len(fake.requests), 5)
+        self.assertEqual(fake.connections, 1)
+
+    def test_unreachable_server_imports_nothing(self):
+        with FakeAnkiConnect() as fake:
+            url = fake.url
+        anki.ANKICONNECT_URL = url  # Server closed: connection refused
+
+        results = quietly(anki.batch_import_to_anki, ["a.apkg"])
+
+        self.assertEqual(results, {"success": [], "failed": []})
+
+
+# =============================================================================
+# DELTA SYNC
+# =============================================================================
+
+class FakeCollection:
+    """
+    In-memory Anki collection answering the actions sync_notes_to_anki uses.
+
+    Pass as the FakeAnkiConnect handler; `fail` maps an action name to
+    the error it should report. Like AnkiConnect, a note whose first field
+    is already in the collection is refused as a duplicate, and addNotes
+    then fails as a whole.
+    """
+
+    def __init__(self):
+        self.notes = {}  # Note ID → {'fields': {...}, 'tags': [...]}
+        self.models = []
+        self.fail = {}
+
+    def add(self, fields, tags=()):
+        note_id = len(self.notes) + 1
+        self.notes[note_id] = {"fields": dict(fields), "tags": list(tags)}
+        return note_id
+
+    def check_duplicate(self, note):
+        first_value = next(iter(note["fields"].values()))
+        if any(next(iter(existing["fields"].values())) == first_value
+               for existing in self.notes.values()):
+            raise ValueError("cannot create note because it is a duplicate")
+
+    def __call__(self, action, params):
+        if action in self.fail:
+            raise ValueError(self.fail[action])
+        if action == "createDeck":
+            return 1
+        if action == "modelNames":
+            return list(self.models)
+        if action == "createModel":
+            self.models.append(params["modelName"])
+            return {}
+        if action == "findNotes":
+            return list(self.notes)
+        if action == "notesInfo":
+            return [{"noteId": note_id, "tags": self.notes[note_id]["tags"],
+                     "fields": {name: {"value": value, "order": order}
+                                for order, (name, value)
+                                in enumerate(self.notes[note_id]["fields"].items())}}
+                    for note_id in params["notes"]]
+        if action == "addNotes":
+            for note in params["notes"]:
+                self.check_duplicate(note)
+            return [self.add(note["fields"], note.get("tags", [])) for note in params["notes"]]
+        if action == "addNote":
+            self.check_duplicate(params["note"])
+            return self.add(params["note"]["fields"], params["note"].get("tags", []))
+        if action == "updateNoteFields":
+            self.notes[params["note"]["id"]]["fields"].update(params["note"]["fields"])
+            return None
+        if action == "addTags":
+            for note_id in params["notes"]:
+                self.notes[note_id]["tags"].append(params["tags"])
+            return None
+        if action == "deleteNotes":
+            for note_id in params["notes"]:
+                del self.notes[note_id]
+            return None
+        raise ValueError(f"unsupported action {action}")
+
+
+class TestDeltaSync(unittest.TestCase):
+
+    def setUp(self):
+        anki.get_ankiconnect_session.cache_clear()
+        self.addCleanup(anki.get_ankiconnect_session.cache_clear)
+        self.addCleanup(setattr, anki, "ANKICONNECT_URL", anki.ANKICONNECT_URL)
+        self.collection = FakeCollection()
+        fake = FakeAnkiConnect(self.collection).__enter__()
+        self.addCleanup(fake.__exit__, None, None, None)
+        anki.ANKICONNECT_URL = fake.url
+        self.model = anki.create_basic_model()
+
+    def make_notes(self, rows):
+        """Notes for (question, answer, id) rows keyed on the ID column."""
+        return [anki.create_note(self.model, question, answer, guid_key=key, deck_name="Deck")
+                for question, answer, key in rows]
+
+    def sync(self, rows):
+        return anki.sync_notes_to_anki("Deck", self.model, self.make_notes(rows))
+
+    def test_reworded_question_keeps_note_with_id_key(self):
+        self.sync([("Q1", "A1", "id-1"), ("Q2", "A2", "id-2")])
+        note_ids = set(self.collection.notes)
+
+        summary = self.sync([("Q1 reworded", "A1", "id-1"), ("Q2", "A2", "id-2")])
+
+        self.assertEqual((summary["added"], summary["updated"], summary["deleted"]), (0, 1, 0))
+        self.assertEqual(set(self.collection.notes), note_ids)
+
+    def test_untagged_notes_matched_by_question_then_tagged(self):
+        note_id = self.collection.add({"Question": "Q1", "Answer": "old"})
+
+        summary = self.sync([("Q1", "new", "id-1")])
+
+        self.assertEqual((summary["added"], summary["updated"]), (0, 1))
+        tags = self.collection.notes[note_id]["tags"]
+        self.assertEqual(len(tags), 1)
+        self.assertTrue(tags[0].startswith(anki.SYNC_KEY_TAG_PREFIX))
+
+    def test_removed_rows_are_deleted(self):
+        self.sync([("Q1", "A1", "id-1"), ("Q2", "A2", "id-2")])
+
+        summary = self.sync([("Q2", "A2", "id-2")])
+
+        self.assertEqual((summary["deleted"], summary["unchanged"]), (1, 1))
+        self.assertEqual(len(self.collection.notes), 1)
+
+    def test_duplicate_question_fails_only_that_note(self):
+        summary = self.sync([("Q1", "A1", "id-1"), ("Q1", "A1 again", "id-2"),
+                             ("Q2", "A2", "id-3")])
+
+        self.assertEqual(summary["added"], 2)
+        self.assertEqual(summary["failed"],
+                         [("Q1", "cannot create note because it is a duplicate")])
+        self.assertEqual(sorted(note["fields"]["Question"]
+                                for note in self.collection.notes.values()), ["Q1", "Q2"])
+
+    def test_create_errors_stop_the_sync(self):
+        for action in ("createDeck", "createModel", "notesInfo"):
+            with self.subTest(action=action):
+                self.collection.fail = {action: "collection is not available"}
+                if action == "notesInfo":
+                    self.collection.add({"Question": "Q0", "Answer": "A0"})
+
+                summary = self.sync([("Q1", "A1", "id-1")])
+
+                self.assertIn(action, summary["error"])
+                self.assertFalse(any(note["fields"]["Question"] == "Q1"
+                                     for note in self.collection.notes.values()))
+
+
+# =============================================================================
+# ASYNC CLIENT
+# =============================================================================
+
+def run_client(coroutine_func, **client_options):
+    """Run coroutine_func(client) on a fresh AsyncAnkiConnectClient."""
+    async def run():
+        async with anki.AsyncAnkiConnectClient(**client_options) as client:
+            return await coroutine_func(client)
+    return asyncio.run(run())
+
+
+def import_all(paths):
+    """Coroutine function importing every path concurrently."""
+    async def run(client):
+        return await asyncio.gather(*(client.import_package(path) for path in paths))
+    return run
+
+
+class TestAsyncAnkiConnectClient(unittest.TestCase):
+
+    def start_fake(self, handle=None, port=0):
+        fake = FakeAnkiConnect(handle, port).__enter__()
+        self.addCleanup(fake.__exit__, None, None, None)
+        return fake
+
+    def test_concurrency_is_bounded(self):
+        def slow_import(action, params):
+            time.sleep(0.1)
+            return True
+
+        fake = self.start_fake(slow_import)
+        paths = [f"deck{i}.apkg" for i in range(12)]
+
+        results = run_client(import_all(paths), url=fake.url, concurrency=3)
+
+        self.assertTrue(all(result["ok"] for result in results))
+        self.assertEqual(len(fake.requests), len(paths))
+        self.assertEqual(fake.max_in_flight, 3)
+
+    def test_timeouts_do_not_exceed_concurrency(self):
+        def hanging_import(action, params):
+            time.sleep(0.5)
+            return True
+
+        fake = self.start_fake(hanging_import)
+        paths = [f"deck{i}.apkg" for i in range(6)]
+        lock = threading.Lock()
+        in_flight = [0, 0]  # Requests the client has open now, most at once
+
+        async def import_counted(client):
+            post = client._post
+
+            def counted_post(payload):
+                with lock:
+                    in_flight[0] += 1
+                    in_flight[1] = max(in_flight)
+                try:
+                    return post(payload)
+                finally:
+                    with lock:
+                        in_flight[0] -= 1
+
+            client._post = counted_post
+            return await import_all(paths)(client)
+
+        results = run_client(import_counted, url=fake.url, concurrency=2, timeout=0.1)
+
+        self.assertEqual({result["error_type"] for result in results}, {"timeout"})
+        self.assertEqual(in_flight[1], 2)
+
+    def test_late_server_is_retried_with_backoff(self):
+        port = get_free_port()
+        starter = threading.Timer(0.3, lambda: self.start_fake(port=port))
+        starter.start()
+        self.addCleanup(starter.cancel)
+
+        start_time = time.perf_counter()
+        results = run_client(import_all(["deck.apkg"]), url=f"http://127.0.0.1:{port}",
+                             retries=5, backoff=0.1)
+        elapsed = time.perf_counter() - start_time
+
+        # Refused at 0 s, 0.1 s and 0.3 s (backoff 0.1, 0.2), accepted at 0.7 s (backoff 0.4)
+        self.assertTrue(results[0]["ok"], results[0])
+        self.assertGreaterEqual(results[0]["attempts"], 3)
+        self.assertGreaterEqual(elapsed, 0.3)
+
+    def test_error_types_and_attempts(self):
+        def handle(action, params):
+            if "broken" in params.get("path", ""):
+                raise ValueError("collection is not available")
+            if "slow" in params.get("path", ""):
+                time.sleep(0.5)
+            return True
+
+        fake = self.start_fake(handle)
+        anki_error, timeout = run_client(import_all(["broken.apkg", "slow.apkg"]),
+                                         url=fake.url, timeout=0.2)
+        connection, = run_client(import_all(["deck.apkg"]),
+                                 url=f"http://127.0.0.1:{get_free_port()}", retries=2, backoff=0.01)
+
+        self.assertEqual((anki_error["ok"], anki_error["error_type"], anki_error["attempts"]),
+                         (False, "anki", 1))
+        self.assertEqual(anki_error["error"], "collection is not available")
+        self.assertEqual((timeout["error_type"], timeout["attempts"]), ("timeout", 1))
+        self.assertEqual((connection["error_type"], connection["attempts"]), ("connection", 3))
+
+    def test_create_decks_async_keeps_input_order(self):
+        fake = self.start_fake()
+        self.addCleanup(setattr, anki, "ANKICONNECT_URL", anki.ANKICONNECT_URL)
+        anki.ANKICONNECT_URL = fake.url
+
+        with tempfile.TemporaryDirectory() as work_dir:
+            decks = []
+            for deck_idx in range(4):
+                csv_path = os.path.join(work_dir, f"deck{deck_idx}.csv")
+                with open(csv_path, 'w', newline='', encoding='utf-8') as f:
+                    writer = csv.writer(f)
+                    writer.writerow(['Question', 'Answer'])
+                    # Later decks are smaller, so they finish building first
+                    writer.writerows((f"Q{deck_idx}-{row}", "A") for row in range(400 - deck_idx * 100))
+                decks.append((csv_path, f"Deck {deck_idx}", os.path.join(work_dir, f"deck{deck_idx}.apkg")))
+            decks.insert(2, (os.path.join(work_dir, "missing.csv"), "Missing",
+                             os.path.join(work_dir, "missing.apkg")))
+
+            results = quietly(anki.create_flashcard_decks_async, decks, concurrency=2)
+
+        self.assertEqual([result["deck"] for result in results], [deck[1] for deck in decks])
+        self.assertEqual([result["cards"] for result in results], [400, 300, 0, 200, 100])
+        self.assertEqual(results[2]["error_type"], "build")
+        self.assertFalse(results[2]["ok"])
+        self.assertTrue(all(result["ok"] for index, result in enumerate(results) if index != 2))
+        self.assertEqual(fake.requests, ["importPackage"] * 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+TESTS - SHARDED AND WATCH-MODE CONSOLIDATION IN Auto_Consolidate_Master_Charts.py
+
+Builds small master charts in a temporary Exam N/Extract/Claude Study Tools
+tree and consolidates them, so no real study materials are needed.
+
+Usage:
+    python Test_Auto_Consolidate_Master_Charts.py
+    python -m pytest -q Test_Auto_Consolidate_Master_Charts.py
+"""
+
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from openpyxl import Workbook, load_workbook
+
+import Auto_Consolidate_Master_Charts as consolidate
+from Drug_Inverted_Index import lookup_drug
+
+
+# =============================================================================
+# HELPERS
+# =============================================================================
+
+def write_master_chart(path, drugs):
+    """Write a one-sheet master chart with a header row and drugs in column B."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    wb = Workbook()
+    sheet = wb.active
+    sheet.title = "Master Chart"
+    sheet.append(["Class", "Drug", "Mechanism"])
+    for drug in drugs:
+        sheet.append(["Class", drug, "Mechanism"])
+    wb.save(path)
+    return path
+
+
+def quietly(func, *args, **kwargs):
+    """Call func with its progress prints suppressed."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return func(*args, **kwargs)
+
+
+class ChartTreeTestCase(unittest.TestCase):
+    """Temporary directory holding the study tree and the reference."""
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = tmp.name
+        self.reference_path = os.path.join(self.root, "Pharmacology_Master_Reference.xlsx")
+
+    def chart_path(self, exam, topic):
+        """Path of a topic's chart in the nested Exam N/Extract/Claude Study Tools layout."""
+        return os.path.join(self.root, exam, "Extract", "Claude Study Tools",
+                            f"{topic}_Master_Chart.xlsx")
+
+
+# =============================================================================
+# SHARDED REFERENCE
+# =============================================================================
+
+class TestShardedReference(ChartTreeTestCase):
+
+    def consolidate_sharded(self, paths, **options):
+        return quietly(consolidate.consolidate_master_charts_sharded, paths,
+                       self.reference_path, workers=1, **options)
+
+    def test_exam_key_comes_from_nested_exam_folder(self):
+        exam_1 = self.chart_path("Exam 1", "HIV")
+        exam_2 = self.chart_path("Exam 2", "Antibiotics")
+        self.assertEqual(consolidate.get_shard_key(exam_1, "exam"), "Exam 1")
+        self.assertEqual(consolidate.get_shard_key(exam_2, "exam"), "Exam 2")
+        self.assertEqual(consolidate.get_shard_key(
+            os.path.join(self.root, "charts", "HIV_Master_Chart.xlsx"), "exam"), "charts")
+
+    def test_each_exam_gets_its_own_shard(self):
+        paths = [write_master_chart(self.chart_path("Exam 1", "HIV"), ["Tenofovir (Viread)"]),
+                 write_master_chart(self.chart_path("Exam 1", "Hepatitis"), ["Entecavir"]),
+                 write_master_chart(self.chart_path("Exam 2", "Antibiotics"), ["Ceftriaxone"])]
+        result = self.consolidate_sharded(paths, shard_by="exam")
+
+        self.assertNotIn("error", result)
+        shards = consolidate.load_shard_map(self.reference_path)["shards"]
+        self.assertEqual({name: shard["topics"] for name, shard in shards.items()},
+                         {"Exam 1": ["HIV", "Hepatitis"], "Exam 2": ["Antibiotics"]})
+
+    def test_lookup_searches_every_shard(self):
+        paths = [write_master_chart(self.chart_path("Exam 1", "HIV"), ["Tenofovir (Viread)"]),
+                 write_master_chart(self.chart_path("Exam 2", "Hepatitis B"), ["Tenofovir"])]
+        self.consolidate_sharded(paths, shard_by="exam")
+
+        result = lookup_drug(self.reference_path, "tenofovir")
+        self.assertEqual([(occurrence["workbook"], occurrence["sheet"]) for occurrence in result],
+                         [(os.path.join("Pharmacology_Master_Reference_Shards",
+                                        "Pharmacology_Master_Reference_Exam 1.xlsx"), "HIV"),
+                          (os.path.join("Pharmacology_Master_Reference_Shards",
+                                        "Pharmacology_Master_Reference_Exam 2.xlsx"), "Hepatitis B")])
+
+    def test_failed_chart_is_not_routed(self):
+        hiv_path = write_master_chart(self.chart_path("Exam 1", "HIV"), ["Tenofovir"])
+        self.consolidate_sharded([hiv_path], shard_by="exam")
+
+        broken_path = self.chart_path("Exam 1", "Hepatitis")
+        with open(broken_path, 'w') as f:
+            f.write("not a workbook")
+        herpes_path = write_master_chart(self.chart_path("Exam 1", "Herpes"), ["Acyclovir"])
+        result = self.consolidate_sharded([hiv_path, broken_path, herpes_path])
+
+        self.assertEqual([topic_result["topic"] for topic_result in result["topics"]], ["Herpes"])
+        self.assertEqual(len(result["errors"]), 1)
+        shards = consolidate.load_shard_map(self.reference_path)["shards"]
+        self.assertEqual(shards["Exam 1"]["topics"], ["HIV", "Herpes"])
+
+
+# =============================================================================
+# WATCH MODE
+# =============================================================================
+
+class TestWarmReference(ChartTreeTestCase):
+
+    def test_resaved_chart_digest_is_remembered(self):
+        hiv_path = write_master_chart(self.chart_path("Exam 1", "HIV"), ["Tenofovir"])
+        reference = quietly(consolidate.WarmReference, self.reference_path)
+        quietly(reference.consolidate, [hiv_path])
+
+        # Same cells, different file bytes
+        wb = load_workbook(hiv_path)
+        wb.properties.creator = "Someone else"
+        wb.save(hiv_path)
+        new_digest = consolidate.get_file_digest(hiv_path)
+
+        result = quietly(reference.consolidate, [hiv_path])
+        self.assertTrue(result["no_change"])
+        manifest_entries = consolidate.load_manifest(self.reference_path, verbose=False)
+        self.assertEqual(manifest_entries["HIV"]["source_digest"], new_digest)
+
+        reloaded = quietly(consolidate.WarmReference, self.reference_path)
+        with mock.patch.object(consolidate, "snapshot_master_chart") as snapshot:
+            quietly(reference.consolidate, [hiv_path])
+            quietly(reloaded.consolidate, [hiv_path])
+        snapshot.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()